@@ -0,0 +1,104 @@
+from typing import Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core.profiler import Profile, ProfilerBusyError, profiler
+from app.core.security.auth_context import AuthContext, get_auth_context
+
+admin_router = APIRouter()
+
+
+def _require_admin(auth: AuthContext) -> None:
+    if not (auth.is_authenticated and auth.user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Profiling allowed for logged in admin only.",
+        )
+
+
+def _profile_response(
+    profile: Profile, profile_format: str, name: str
+) -> Union[PlainTextResponse, JSONResponse]:
+    if profile_format == "speedscope":
+        return JSONResponse(content=profile.speedscope(name=name))
+    return PlainTextResponse(content=profile.collapsed())
+
+
+@admin_router.get(
+    "/admin/profile",
+    tags=["ADMIN"],
+    description="Sample current app worker for given time - admin permitted only. Log in needed.",
+)
+async def get_worker_profile(
+    seconds: float = Query(10.0, gt=0),
+    profile_format: str = Query(
+        "collapsed", alias="format", regex="^(collapsed|speedscope)$"
+    ),
+    auth: AuthContext = Depends(get_auth_context),
+) -> Union[PlainTextResponse, JSONResponse]:
+    """
+    \f Endpoint to profile worker handling the request (all its threads)
+    with sampling profiler. Worker keeps serving requests meanwhile.
+
+    Args:
+        seconds (float): sampling time, capped at PROFILER_MAX_SECONDS.
+        profile_format (str): "collapsed" (flamegraph stacks, default) or
+            "speedscope" (JSON).
+        auth (AuthContext): request auth data resolved from cookie JWT.
+
+    Raises:
+        HTTPException: 403 if not logged in admin, 409 if other profile
+            running
+
+    Returns:
+        Union[PlainTextResponse, JSONResponse]: worker profile
+    """
+    _require_admin(auth)
+    try:
+        profile = await profiler.profile(seconds=seconds)
+    except ProfilerBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Other profile running in this worker.",
+        )
+    return _profile_response(profile, profile_format, name="worker")
+
+
+@admin_router.get(
+    "/admin/profile/requests/{profile_id}",
+    tags=["ADMIN"],
+    description="Get profile of single request sent with profiling header - admin permitted only. Log in needed.",
+)
+async def get_request_profile(
+    profile_id: str,
+    profile_format: str = Query(
+        "collapsed", alias="format", regex="^(collapsed|speedscope)$"
+    ),
+    auth: AuthContext = Depends(get_auth_context),
+) -> Union[PlainTextResponse, JSONResponse]:
+    """
+    \f Endpoint to get request profile by id from "x-profile-id" response
+    header. Recent profiles kept only, by worker which handled the request.
+
+    Args:
+        profile_id (str): request profile id.
+        profile_format (str): "collapsed" (default) or "speedscope".
+        auth (AuthContext): request auth data resolved from cookie JWT.
+
+    Raises:
+        HTTPException: 403 if not logged in admin, 404 if profile unknown
+
+    Returns:
+        Union[PlainTextResponse, JSONResponse]: request profile
+    """
+    _require_admin(auth)
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found.",
+        )
+    return _profile_response(
+        profile, profile_format, name=f"request {profile_id}"
+    )
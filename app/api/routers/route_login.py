@@ -2,29 +2,65 @@ from typing import Dict, Union
 
 from app.api.forms.login_form import LoginForm
 from app.core.config import settings
+from app.core.model.user_model import UserModel
+from app.core.page_cache import page_cache
 from app.core.security.jwt_handler import (
-    create_access_token,
     blacklist_token,
+    issue_access_token,
 )
+from app.core.security.password_hasher import password_hasher
+from app.core.templating import templates
 from app.core.user_repo import UserRepo
-from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.templating import Jinja2Templates
 
-templates = Jinja2Templates(directory="app/web/templates/")
 login_router = APIRouter()
 
 
+async def authenticate(user: UserModel, password: str) -> bool:
+    """
+    Check password of user already fetched from database.
+    Password hashed with old parameters (or legacy encrypted) is rehashed
+    with current ones after successful check.
+
+    Args:
+        user (UserModel): user to be authenticated
+        password (str): plain password provided at login
+
+    Returns:
+        bool:
+            True if password matches
+            False if not
+    """
+    if not await password_hasher.verify(password, user.password):
+        return False
+    if password_hasher.needs_rehash(user.password):
+        await UserRepo.update_user_password(
+            username=user.username, new_password=password
+        )
+    return True
+
+
 @login_router.get(
     "/login",
     tags=["LOGIN"],
     response_class=HTMLResponse,
     description="Login page",
 )
-def get_login(request: Request) -> Jinja2Templates:
+async def get_login(request: Request) -> Jinja2Templates:
     """
     \f Endpoint to for login page.
+    Page differs for logged in user only (cookie present), both versions
+    served from page cache.
 
     Args:
         request (Request): to be used in templating.
@@ -32,8 +68,13 @@ def get_login(request: Request) -> Jinja2Templates:
     Returns:
         Jinja2Templates: rendered login page template
     """
-    return templates.TemplateResponse(
-        "login.html", {"request": request}
+    logged_in = request.cookies.get(settings.COOKIE_NAME) is not None
+    return await page_cache.respond(
+        request=request,
+        key=("login.html", logged_in),
+        render=lambda: templates.get_template("login.html").render(
+            request=request
+        ),
     )
 
 
@@ -65,13 +106,13 @@ async def login(
     if await form.is_valid():
         db_user = await UserRepo.get_by_username(username=form.username)
         if db_user is not None:
-            if db_user.password == form.password:
+            if await authenticate(user=db_user, password=form.password):
                 response = RedirectResponse(
                     url="/user", status_code=status.HTTP_302_FOUND
                 )
-                # Produce cookie with JWT calling token endpoint.
-                await get_access_token(
-                    response=response, form_data=form
+                # User already fetched - issue cookie with JWT directly.
+                issue_access_token(
+                    response=response, username=db_user.username
                 )
                 return response
             else:
@@ -98,18 +139,22 @@ async def get_access_token(
         form_data (OAuth2PasswordRequestForm, optional):
             username and password will be taken from login form.
 
+    Raises:
+        HTTPException: 401 if wrong username or password
+
     Returns:
         Dict[str, str]: cookie with token.
     """
     user = await UserRepo.get_by_username(username=form_data.username)
-    access_token = create_access_token(data={"username": user.username})
-    # HttpOnly - prevent JS from reading the cookie.
-    response.set_cookie(
-        key=settings.COOKIE_NAME,
-        value=f"Bearer {access_token}",
-        httponly=True,
-    )
-    return {settings.COOKIE_NAME: access_token, "token_type": "bearer"}
+    if user is None or not await authenticate(
+        user=user, password=form_data.password
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return issue_access_token(response=response, username=user.username)
 
 
 @login_router.get(
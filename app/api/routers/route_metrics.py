@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import registry
+
+metrics_router = APIRouter()
+# Prometheus text exposition format (charset added by response).
+MEDIA_TYPE = "text/plain; version=0.0.4"
+
+
+@metrics_router.get(
+    "/metrics",
+    tags=["GENERAL"],
+    response_class=PlainTextResponse,
+    description="App metrics in Prometheus text format.",
+)
+async def get_metrics() -> PlainTextResponse:
+    """
+    \f Metrics endpoint to be scraped by Prometheus.
+
+    Returns:
+        PlainTextResponse: request, database query, cache and pool metrics
+    """
+    return PlainTextResponse(
+        content=registry.render(), media_type=MEDIA_TYPE
+    )
@@ -2,7 +2,9 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
-templates = Jinja2Templates(directory="app/web/templates/")
+from app.core.page_cache import page_cache
+from app.core.templating import templates
+
 root_router = APIRouter()
 
 
@@ -14,7 +16,8 @@ root_router = APIRouter()
 )
 async def home(request: Request) -> Jinja2Templates:
     """
-    \f Homepage endpoint.
+    \f Homepage endpoint. Page is static - rendered once, then served
+    from page cache.
 
     Args:
         request (Request): to be used in templating.
@@ -22,6 +25,10 @@ async def home(request: Request) -> Jinja2Templates:
     Returns:
         Jinja2Templates: rendered homepage template.
     """
-    return templates.TemplateResponse(
-        name="home.html", context={"request": request}
+    return await page_cache.respond(
+        request=request,
+        key=("home.html",),
+        render=lambda: templates.get_template("home.html").render(
+            request=request
+        ),
     )
@@ -1,22 +1,26 @@
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse
+import csv
+import io
+import json
+from typing import AsyncIterator, Optional, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from app.api.forms.add_user_form import AddUserForm
 from app.api.forms.check_user_form import CheckUserForm
 from app.api.forms.update_user_pass_form import UpdateUserPassForm
 from app.core.config import settings
-from app.core.security.auth import OAuth2PasswordBearerWithCookie
-from app.core.security.jwt_handler import (
-    check_if_token_blacklisted,
-    get_current_user_from_cookie,
-)
-from app.core.user_repo import UserRepo
+from app.core.page_cache import page_cache
+from app.core.security.auth_context import AuthContext, get_auth_context
+from app.core.security.password_hasher import password_hasher
+from app.core.templating import templates
+from app.core.user_repo import EXPORT_COLUMNS, USERS_TAG, UserRepo
 
-templates = Jinja2Templates(directory="app/web/templates/")
 user_router = APIRouter()
-# API endpoint to get new token from.
-oauth2_scheme = OAuth2PasswordBearerWithCookie(tokenUrl="/token")
+# Rows serialized into single chunk of export stream.
+EXPORT_CHUNK_ROWS = 500
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
 
 @user_router.get(
@@ -27,7 +31,7 @@ oauth2_scheme = OAuth2PasswordBearerWithCookie(tokenUrl="/token")
 )
 async def get_user_operations(request: Request) -> Jinja2Templates:
     """
-    \f Endpoint to get user operations page.
+    \f Endpoint to get user operations page, served from page cache.
 
     Args:
         request (Request): to be used in templating.
@@ -35,8 +39,12 @@ async def get_user_operations(request: Request) -> Jinja2Templates:
     Returns:
         Jinja2Templates: user operations page.
     """
-    return templates.TemplateResponse(
-        name="user/user_operations.html", context={"request": request}
+    return await page_cache.respond(
+        request=request,
+        key=("user/user_operations.html",),
+        render=lambda: templates.get_template(
+            "user/user_operations.html"
+        ).render(request=request),
     )
 
 
@@ -44,22 +52,135 @@ async def get_user_operations(request: Request) -> Jinja2Templates:
     "/user/get/all",
     tags=["USER"],
     response_class=HTMLResponse,
-    description="List all users from database. No login needed.",
+    description="List all users from database in pages. No login needed.",
 )
-async def get_all_users(request: Request) -> Jinja2Templates:
+async def get_all_users(
+    request: Request,
+    limit: int = Query(settings.USER_PAGE_SIZE, ge=1),
+    after: int = Query(0, ge=0),
+) -> Jinja2Templates:
     """
     \f Endpoint to get all users from database page.
+    Users listed in pages ordered by id, next page starts after last id of
+    previous page. Rendered pages cached until users change (or TTL).
 
     Args:
         request (Request): to be used in templating.
+        limit (int): users per page, capped at USER_PAGE_MAX_SIZE.
+        after (int): id of last user from previous page.
 
     Returns:
         Jinja2Templates: all users in database page.
     """
-    users = await UserRepo.get_all()
-    return templates.TemplateResponse(
-        name="user/user_all.html",
-        context={"request": request, "users": users},
+    limit = min(limit, settings.USER_PAGE_MAX_SIZE)
+
+    async def render() -> str:
+        page = await UserRepo.iter_page(after=after, limit=limit)
+        return templates.get_template("user/user_all.html").render(
+            request=request,
+            users=page.users,
+            next_after=page.next_after,
+            after=after,
+            limit=limit,
+        )
+
+    return await page_cache.respond(
+        request=request,
+        key=("user/user_all.html", after, limit),
+        render=render,
+        tags=(USERS_TAG,),
+        ttl=settings.PAGE_CACHE_TTL_SECONDS,
+    )
+
+
+async def _export_chunks(
+    columns: Sequence[str], export_format: str
+) -> AsyncIterator[str]:
+    """
+    Serialize users streamed from database into NDJSON or CSV chunks.
+
+    Args:
+        columns (Sequence[str]): exported columns
+        export_format (str): "ndjson" or "csv"
+
+    Yields:
+        str: chunk of EXPORT_CHUNK_ROWS serialized users at most
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(columns)
+    rows = 0
+    users = UserRepo.iter_all(columns=columns)
+    try:
+        async for user in users:
+            if export_format == "csv":
+                writer.writerow(user[column] for column in columns)
+            else:
+                buffer.write(json.dumps(user, default=str))
+                buffer.write("\n")
+            rows += 1
+            if rows % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    finally:
+        # Client disconnect - stop reading users right away.
+        await users.aclose()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@user_router.get(
+    "/user/export",
+    tags=["USER"],
+    response_class=StreamingResponse,
+    description="Export all users as NDJSON or CSV stream - admin permitted only. Log in needed.",
+)
+async def export_users(
+    export_format: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    fields: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_auth_context),
+) -> StreamingResponse:
+    """
+    \f Endpoint to export all users (for audits).
+    Authorization and authentication in use (thru cookie JWT).
+
+    Users streamed from database in batches, so memory use is constant
+    whatever the number of users. Streaming stopped when client disconnects.
+
+    Args:
+        export_format (str): "ndjson" (default) or "csv".
+        fields (Optional[str]): comma separated columns to export, all
+            EXPORT_COLUMNS if not provided.
+        auth (AuthContext): request auth data resolved from cookie JWT.
+
+    Raises:
+        HTTPException: 403 if not logged in admin, 400 if unknown field
+
+    Returns:
+        StreamingResponse: users export file
+    """
+    if not (auth.is_authenticated and auth.user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Export allowed for logged in admin only.",
+        )
+    columns = EXPORT_COLUMNS
+    if fields:
+        columns = tuple(field.strip() for field in fields.split(","))
+        unknown = set(columns) - set(EXPORT_COLUMNS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+    return StreamingResponse(
+        _export_chunks(columns=columns, export_format=export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=users.{export_format}"
+        },
     )
 
 
@@ -85,7 +206,7 @@ async def get_user(request: Request) -> Jinja2Templates:
     form = CheckUserForm(request=request)
     await form.load_data()
     if await form.is_valid():
-        user = await UserRepo.get_by_username(username=form.username)
+        user = await UserRepo.get_view_by_username(username=form.username)
         if user is not None:
             response = templates.TemplateResponse(
                 name="user/user_info.html",
@@ -105,7 +226,9 @@ async def get_user(request: Request) -> Jinja2Templates:
     response_class=HTMLResponse,
     description="Update user password. Only admin or logged in user can change his own password. Login needed.",
 )
-async def update_user_password(request: Request) -> Jinja2Templates:
+async def update_user_password(
+    request: Request, auth: AuthContext = Depends(get_auth_context)
+) -> Jinja2Templates:
     """
     \f Endpoint to update secific user password.
 
@@ -117,6 +240,7 @@ async def update_user_password(request: Request) -> Jinja2Templates:
 
     Args:
         request (Request): to be used in templating.
+        auth (AuthContext): request auth data resolved from cookie JWT.
 
     Returns:
         Jinja2Templates: user oparations page.
@@ -124,15 +248,12 @@ async def update_user_password(request: Request) -> Jinja2Templates:
     form = UpdateUserPassForm(request=request)
     await form.load_data()
     if await form.is_valid():
-        cookie_user = await get_current_user_from_cookie(
-            request=request
-        )
-        token_blacklisted = await check_if_token_blacklisted(
-            request=request
-        )
+        cookie_user = auth.user
+        token_blacklisted = auth.token_blacklisted
         if cookie_user is None:
             form.errors.append("Update not allowed without log in!")
         else:
+            # Full user (with password) needed here to check old password.
             db_user = await UserRepo.get_by_username(
                 username=form.username
             )
@@ -145,7 +266,9 @@ async def update_user_password(request: Request) -> Jinja2Templates:
                         cookie_user.username == db_user.username
                         or cookie_user.is_admin
                     ):
-                        if db_user.password == form.old_password:
+                        if await password_hasher.verify(
+                            form.old_password, db_user.password
+                        ):
                             await UserRepo.update_user_password(
                                 username=form.username,
                                 new_password=form.new_password,
@@ -181,12 +304,13 @@ async def update_user_password(request: Request) -> Jinja2Templates:
 
 @user_router.post(
     "/user/add",
-    dependencies=[Depends(oauth2_scheme)],
     tags=["USER"],
     response_class=HTMLResponse,
     description="Add new user - admin permitted only. Log in needed.",
 )
-async def add_user(request: Request) -> Jinja2Templates:
+async def add_user(
+    request: Request, auth: AuthContext = Depends(get_auth_context)
+) -> Jinja2Templates:
     """
     \f Endpoint to add new user.
     Authorization and authentication in use (thru cookie JWT).
@@ -197,6 +321,7 @@ async def add_user(request: Request) -> Jinja2Templates:
 
     Args:
         request (Request): to be used in templating.
+        auth (AuthContext): request auth data resolved from cookie JWT.
 
     Returns:
         Jinja2Templates: user oparations page.
@@ -204,12 +329,8 @@ async def add_user(request: Request) -> Jinja2Templates:
     form = AddUserForm(request=request)
     await form.load_data()
     if await form.is_valid():
-        cookie_user = await get_current_user_from_cookie(
-            request=request
-        )
-        token_blacklisted = await check_if_token_blacklisted(
-            request=request
-        )
+        cookie_user = auth.user
+        token_blacklisted = auth.token_blacklisted
         if cookie_user is None:
             form.errors.append("Adding not allowed without log in!")
         else:
@@ -253,12 +374,13 @@ async def add_user(request: Request) -> Jinja2Templates:
 
 @user_router.post(
     "/user/delete",
-    dependencies=[Depends(oauth2_scheme)],
     tags=["USER"],
     response_class=HTMLResponse,
     description="Delete user - admin permitted only. Log in needed.",
 )
-async def delete_user(request: Request) -> Jinja2Templates:
+async def delete_user(
+    request: Request, auth: AuthContext = Depends(get_auth_context)
+) -> Jinja2Templates:
     """
     \f Endpoint to delete specific user.
     Authorization and authentication in use (thru cookie JWT).
@@ -269,6 +391,7 @@ async def delete_user(request: Request) -> Jinja2Templates:
 
     Args:
         request (Request): to be used in templating.
+        auth (AuthContext): request auth data resolved from cookie JWT.
 
     Returns:
         Jinja2Templates: user operations page.
@@ -276,12 +399,8 @@ async def delete_user(request: Request) -> Jinja2Templates:
     form = CheckUserForm(request=request)
     await form.load_data()
     if await form.is_valid():
-        cookie_user = await get_current_user_from_cookie(
-            request=request
-        )
-        token_blacklisted = await check_if_token_blacklisted(
-            request=request
-        )
+        cookie_user = auth.user
+        token_blacklisted = auth.token_blacklisted
         if cookie_user is None:
             form.errors.append("Delete not allowed without log in!")
         else:
@@ -0,0 +1,113 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    In-process cache bounded by number of entries (least recently used entry
+    evicted first) where every entry expires after its time to live.
+    Not thread safe - meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Cache initialization.
+
+        Args:
+            maxsize (int): max number of entries kept in cache
+            ttl (float): default entry time to live in seconds
+            timer (Callable[[], float], optional): clock used for expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get value from cache. Entry marked as most recently used.
+
+        Args:
+            key (Hashable): cache key
+            default (Any, optional): returned on miss
+
+        Returns:
+            Any: cached value or default if missing or expired
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        """
+        Put value into cache, evict least recently used entry if full.
+
+        Args:
+            key (Hashable): cache key
+            value (Any): value to be cached
+            ttl (Optional[float], optional): entry time to live in seconds,
+                cache default used if not provided
+        """
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (self._timer() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove entry from cache if present.
+
+        Args:
+            key (Hashable): cache key
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from cache. Counters are kept.
+        """
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache usage counters.
+
+        Returns:
+            Dict[str, int]: size, hits, misses, evictions and expirations
+        """
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 from pydantic import BaseSettings
@@ -14,11 +15,76 @@ class Settings(BaseSettings):
 
     DB_URL: str = os.getenv("DATABASE_URL")
     DB_SECRET: str = os.getenv("DB_SECRET")
+    # Postgres connection pool (asyncpg) - connections recycled after max
+    # lifetime (1 hour by default, 0 - never recycled).
+    DB_POOL_MIN_SIZE: int = 10
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_MAX_LIFETIME_SECONDS: float = 3600.0
+    DB_POOL_MAX_IDLE_SECONDS: float = 300.0
+    DB_STATEMENT_CACHE_SIZE: int = 100
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
     JWT_EXPIRE_MINUTES: int = 15
     JWT_ALGORITHM: str = "HS256"
+    # Optional JWT keyring (HS256/ ES256/ EdDSA keys selected by "kid"),
+    # reloaded to pick up rotated keys. Not set - JWT_SECRET_KEY only.
+    JWT_KEYRING_FILE: Optional[str] = os.getenv("JWT_KEYRING_FILE")
+    JWT_KEYRING_RELOAD_SECONDS: float = 60.0
+    # Verified JWT claims cache - entry never outlives token expiry.
+    JWT_CLAIMS_CACHE_MAXSIZE: int = 10000
+    JWT_CLAIMS_CACHE_TTL_SECONDS: float = 300.0
     COOKIE_NAME: str = "access_token"
+    # Jinja templates - auto reload for development only, bytecode cache in
+    # system temp directory if not set.
+    TEMPLATES_AUTO_RELOAD: bool = False
+    TEMPLATES_BYTECODE_CACHE_DIR: Optional[str] = None
+    # Static files up to this size kept in memory (with compressed variants).
+    STATIC_MEMORY_MAX_BYTES: int = 256 * 1024
+    # Rendered pages cache - data dependent pages expire after TTL too, as
+    # invalidation reaches current app worker only.
+    PAGE_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    PAGE_CACHE_TTL_SECONDS: float = 30.0
+    # Sampling profiler (admin only) - worker profile length limit, per
+    # request profiles (header triggered) disabled unless enabled here.
+    PROFILER_INTERVAL_SECONDS: float = 0.005
+    PROFILER_MAX_SECONDS: float = 60.0
+    PROFILER_REQUEST_ENABLED: bool = False
+    PROFILER_REQUEST_HEADER: str = "x-profile"
+    PROFILER_KEEP_REQUESTS: int = 20
+    # Event loop lag measured every interval (0 disables monitor), stack of
+    # callback blocking loop longer than threshold logged.
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.25
     ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD")
+    # Password hashing (scrypt) - changed parameters applied at next login.
+    PASSWORD_SCRYPT_N: int = 2**14
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    # User lookup cache - TTL bounds staleness between app workers.
+    USER_CACHE_MAXSIZE: int = 4096
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    # Users listing page size (default and max allowed).
+    USER_PAGE_SIZE: int = 50
+    USER_PAGE_MAX_SIZE: int = 500
+    # Expired blacklisted JWT removal, interval 0 disables reaper.
+    BLACKLIST_REAP_INTERVAL_SECONDS: int = 300
+    BLACKLIST_REAP_BATCH_SIZE: int = 1000
+    # Opt-in Bloom filter (sql revocation backend) skipping database for
+    # not blacklisted tokens. With many app workers token blacklisted by
+    # other worker is accepted until next sync (see README), database used
+    # again if filter not synced for max staleness.
+    BLACKLIST_FILTER_ENABLED: bool = False
+    BLACKLIST_FILTER_CAPACITY: int = 100000
+    BLACKLIST_FILTER_ERROR_RATE: float = 0.001
+    BLACKLIST_FILTER_SYNC_SECONDS: float = 2.0
+    BLACKLIST_FILTER_MAX_STALENESS_SECONDS: float = 5.0
+    # Revoked JWT storage: "sql" (default), "memory" (single worker only)
+    # or "redis" (any Redis protocol server shared by all workers).
+    REVOCATION_BACKEND: str = "sql"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_POOL_SIZE: int = 10
+    REDIS_KEY_PREFIX: str = "revoked_jwt:"
 
 
 settings = Settings()
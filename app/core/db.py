@@ -1,10 +1,32 @@
+import sqlite3
+
 import databases
 import sqlalchemy
 from app.core.config import settings
+from app.core.db_pool import InstrumentedPool
+from asyncpg import UniqueViolationError
 from ormar import ModelMeta
 
-database = databases.Database(settings.DB_URL)
+db_pool = InstrumentedPool(
+    acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT_SECONDS,
+    max_lifetime=settings.DB_POOL_MAX_LIFETIME_SECONDS,
+)
+# Pool options passed by databases to asyncpg.create_pool (Postgres only).
+pool_options = {
+    "min_size": settings.DB_POOL_MIN_SIZE,
+    "max_size": settings.DB_POOL_MAX_SIZE,
+    "max_inactive_connection_lifetime": settings.DB_POOL_MAX_IDLE_SECONDS,
+    "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    "init": db_pool.track_connection,
+}
+if databases.DatabaseURL(settings.DB_URL).dialect != "postgresql":
+    pool_options = {}
+database = databases.Database(settings.DB_URL, **pool_options)
 metadata = sqlalchemy.MetaData()
+# Single statement UPDATE/DELETE ... RETURNING used where backend supports it.
+SUPPORTS_RETURNING = database.url.dialect == "postgresql"
+# Unique constraint violation raised by database drivers (Postgres, SQLite).
+UNIQUE_VIOLATIONS = (UniqueViolationError, sqlite3.IntegrityError)
 
 
 class BaseMeta(ModelMeta):
@@ -16,6 +38,3 @@ class BaseMeta(ModelMeta):
     """
     metadata = metadata
     database = database
-
-
-engine = sqlalchemy.create_engine(settings.DB_URL)
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from weakref import WeakKeyDictionary
+
+from app.core.metrics import Histogram
+
+
+class InstrumentedPool:
+    """
+    Wrapper of asyncpg pool used by databases Postgres backend, installed
+    after database connect. Applies acquire timeout and connection max
+    lifetime (not available in asyncpg pool itself) and measures pool usage,
+    so pool starvation can be told apart from slow queries.
+
+    All other pool attributes (close, get_size etc.) passed to asyncpg pool.
+    """
+
+    def __init__(self, acquire_timeout: float, max_lifetime: float) -> None:
+        """
+        Wrapper initialization - pool attached by install().
+
+        Args:
+            acquire_timeout (float): max seconds to wait for free connection
+            max_lifetime (float): seconds after which connection is closed
+                at release (replaced by pool on demand), 0 disables
+        """
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.wait_seconds = Histogram()
+        self.in_use = 0
+        self.waiting = 0
+        self.timeouts = 0
+        self.retired = 0
+        self._pool: Any = None
+        self._opened_at: "WeakKeyDictionary[Any, float]" = WeakKeyDictionary()
+
+    def install(self, database) -> bool:
+        """
+        Put wrapper in place of pool of connected database.
+
+        Args:
+            database (databases.Database): connected database
+
+        Returns:
+            bool: True if installed, False if backend without asyncpg pool
+        """
+        # Other backends (SQLite) have pools of their own kind.
+        if database.url.dialect != "postgresql":
+            return False
+        backend = database._backend
+        pool = getattr(backend, "_pool", None)
+        if pool is None or pool is self:
+            return pool is self
+        self._pool = pool
+        backend._pool = self
+        return True
+
+    async def track_connection(self, connection) -> None:
+        """
+        asyncpg pool "init" callback - records connection open time.
+
+        Args:
+            connection (asyncpg.Connection): newly opened connection
+        """
+        self._opened_at[connection] = time.monotonic()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+    async def acquire(self, *, timeout: Optional[float] = None):
+        """
+        Acquire connection from pool within acquire timeout.
+
+        Args:
+            timeout (Optional[float], optional): overrides acquire timeout
+
+        Raises:
+            asyncio.TimeoutError: if no connection freed in time
+
+        Returns:
+            asyncpg pool connection proxy
+        """
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            connection = await self._pool.acquire(
+                timeout=self.acquire_timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            self.wait_seconds.observe(time.monotonic() - started)
+        self.in_use += 1
+        return connection
+
+    async def release(self, connection, *, timeout: Optional[float] = None):
+        """
+        Return connection to pool, close it if past max lifetime.
+
+        Args:
+            connection: pool connection proxy
+            timeout (Optional[float], optional): release timeout
+        """
+        self.in_use -= 1
+        opened_at = self._opened_at.get(connection._con)
+        if (
+            self.max_lifetime > 0
+            and opened_at is not None
+            and time.monotonic() - opened_at > self.max_lifetime
+        ):
+            # Same as asyncpg max_queries - closed connection leaves pool
+            # and is replaced by new one when needed.
+            self.retired += 1
+            await connection.close(timeout=timeout)
+            return
+        return await self._pool.release(connection, timeout=timeout)
+
+    def metrics(self) -> Dict:
+        """
+        Pool usage metrics.
+
+        Returns:
+            Dict: connections open, in use and idle, acquire waiters,
+                acquire timeouts, retired connections and acquire wait time
+                histogram (seconds)
+        """
+        open_connections = self._pool.get_size() if self._pool else 0
+        idle = self._pool.get_idle_size() if self._pool else 0
+        return {
+            "size": open_connections,
+            "in_use": self.in_use,
+            "idle": idle,
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "retired": self.retired,
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
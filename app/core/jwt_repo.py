@@ -1,29 +1,68 @@
-from typing import Union
+from datetime import datetime
+from typing import List, Tuple, Union
 
+import sqlalchemy
+
+from app.core.db import UNIQUE_VIOLATIONS
+from app.core.metrics import QueryTimer
 from app.core.model.jwt_model import JwtModel
+from app.core.prepared import USE_PREPARED, PreparedQuery
+from app.core.security.token_digest import token_digest
+
+_blacklist = JwtModel.Meta.table
+# Hot queries precompiled for asyncpg (see prepared.PreparedQuery).
+ADD_TOKEN = PreparedQuery(
+    _blacklist.insert().values(
+        token_digest=sqlalchemy.bindparam("token_digest"),
+        expires_at=sqlalchemy.bindparam("expires_at"),
+    )
+)
+GET_TOKEN = PreparedQuery(
+    sqlalchemy.select([_blacklist.c.id, _blacklist.c.token_digest]).where(
+        _blacklist.c.token_digest == sqlalchemy.bindparam("token_digest")
+    )
+)
 
 
 class JwtRepo:
     """
     JWT token repository connecting with JWT Model in Ormar for validation.
+    Tokens are stored and looked up by their digest only.
     """
 
     @classmethod
-    async def add_to_database(self, token: str) -> None:
+    @QueryTimer("jwt.add_to_database")
+    async def add_to_database(
+        self, token: str, expires_at: datetime
+    ) -> None:
         """
         Add token to database in order to black listing if token to be used for antoher login.
+        Token already blacklisted is ignored.
 
         Args:
             token (str): token to be black listed
+            expires_at (datetime): token expiry time (UTC)
         """
-        await JwtModel.objects.create(token=token)
+        try:
+            if USE_PREPARED:
+                await ADD_TOKEN.fetch_val(
+                    token_digest=token_digest(token), expires_at=expires_at
+                )
+            else:
+                await JwtModel.objects.create(
+                    token_digest=token_digest(token), expires_at=expires_at
+                )
+        except UNIQUE_VIOLATIONS:
+            pass
 
     @classmethod
+    @QueryTimer("jwt.get_from_database")
     async def get_from_database(
         self, token: str
     ) -> Union[JwtModel, None]:
         """
         Check if token is blacklisted (present in database).
+        Lookup done by unique token digest index.
 
         Args:
             token (str): to be checked against database
@@ -33,5 +72,47 @@ class JwtRepo:
                 JwtModel (token) if blacklisted
                 None if token not blacklisted
         """
-        db_token = await JwtModel.objects.get_or_none(token=token)
+        if USE_PREPARED:
+            row = await GET_TOKEN.fetch_one(token_digest=token_digest(token))
+            return JwtModel(**dict(row)) if row is not None else None
+        db_token = await JwtModel.objects.fields(
+            ["id", "token_digest"]
+        ).get_or_none(token_digest=token_digest(token))
         return db_token
+
+    @classmethod
+    @QueryTimer("jwt.delete_expired")
+    async def delete_expired(self, batch_size: int) -> int:
+        """
+        Delete blacklisted tokens which expired already.
+
+        Args:
+            batch_size (int): max number of rows to be deleted
+
+        Returns:
+            int: number of deleted rows (expired rows selected for deletion,
+                DELETE row count not reported by every backend)
+        """
+        expired_ids = await JwtModel.objects.filter(
+            expires_at__lt=datetime.utcnow()
+        ).fields(["id"]).limit(batch_size).values_list("id", flatten=True)
+        if not expired_ids:
+            return 0
+        await JwtModel.objects.filter(id__in=expired_ids).delete()
+        return len(expired_ids)
+
+    @classmethod
+    @QueryTimer("jwt.get_digests")
+    async def get_digests(self, after_id: int) -> List[Tuple[int, str]]:
+        """
+        Get ids and digests of blacklisted tokens.
+
+        Args:
+            after_id (int): only rows with greater id returned
+
+        Returns:
+            List[Tuple[int, str]]: (id, token digest) ordered by id
+        """
+        return await JwtModel.objects.filter(id__gt=after_id).fields(
+            ["id", "token_digest"]
+        ).order_by("id").values_list(["id", "token_digest"])
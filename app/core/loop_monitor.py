@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional, Sequence
+
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Event loop health monitor, started and stopped by app startup/ shutdown
+    hooks:
+    - task on the loop sleeping interval seconds, the extra time it takes
+      to wake up (lag - time other callbacks held the loop) recorded in
+      histogram
+    - watchdog thread checking that task keeps waking up - if not for
+      longer than block threshold, stack of blocking callback (what loop
+      thread runs at the moment) logged, once per block
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        block_threshold: float,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        """
+        Monitor initialization.
+
+        Args:
+            interval (float): seconds between lag measurements, 0 or less
+                disables monitor
+            block_threshold (float): seconds of blocked loop logged
+            buckets (Sequence[float], optional): lag histogram buckets
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.lag = Histogram(buckets)
+        self.blocked = 0
+        self._heartbeat = 0.0
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Start lag measurement on running event loop and watchdog thread.
+        No-op if disabled or running.
+        """
+        if self.interval <= 0 or self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        # New event every start - stopped watchdog may not have exited yet.
+        self._stopped = threading.Event()
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            args=(self._stopped,),
+            name="loop_watchdog",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Cancel lag measurement and signal watchdog thread to exit - not
+        joined, so shutdown never waits for it.
+        """
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._watchdog = None
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self.lag.observe(max(0.0, now - started - self.interval))
+            self._heartbeat = now
+
+    def _watch(self, stopped: threading.Event) -> None:
+        reported = None
+        while not stopped.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            blocked = time.perf_counter() - heartbeat - self.interval
+            if blocked < self.block_threshold or heartbeat == reported:
+                continue
+            reported = heartbeat
+            self.blocked += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            logger.warning(
+                "Event loop blocked for %.3f s, running:\n%s", blocked, stack
+            )
+
+    def metrics(self) -> Dict:
+        """
+        Monitor values for metrics registry.
+
+        Returns:
+            Dict: lag histogram snapshot and number of logged blocks
+        """
+        return {"lag_seconds": self.lag.snapshot(), "blocked": self.blocked}
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS,
+)
@@ -0,0 +1,272 @@
+import functools
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) - upper bounds, from 1 ms to 10 s.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Distribution of observed values in fixed buckets (cumulative counts,
+    same as Prometheus histogram) with total count and sum.
+    Not thread safe - meant to be used from the event loop only.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """
+        Histogram initialization.
+
+        Args:
+            buckets (Sequence[float], optional): bucket upper bounds,
+                +Inf bucket always added
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Record single value.
+
+        Args:
+            value (float): observed value
+        """
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict:
+        """
+        Current histogram state.
+
+        Returns:
+            Dict: "buckets" (upper bound as str: cumulative count, with
+                "+Inf"), "count" and "sum"
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets, self._counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+def _label_value(value: Any) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _labels(**labels: Any) -> str:
+    pairs = ",".join(
+        f'{name}="{_label_value(value)}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _histogram_lines(name: str, snapshot: Dict, labels: Dict) -> List[str]:
+    lines = [
+        f"{name}_bucket{_labels(**labels, le=bound)} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_labels(**labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_labels(**labels)} {snapshot['count']}")
+    return lines
+
+
+class MetricsRegistry:
+    """
+    App metrics exported in Prometheus text format (see render()):
+    HTTP requests by method and route template (count by status, latency
+    histogram, in flight gauge), database query latency by query name and
+    values of registered collectors (cache, pool and other usage counters).
+
+    Plain dicts and counters updated from the event loop only, so no locks
+    taken on the hot path.
+    """
+
+    def __init__(
+        self, prefix: str = "app", buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        """
+        Registry initialization.
+
+        Args:
+            prefix (str, optional): prefix of all metric names
+            buckets (Sequence[float], optional): latency histogram buckets
+        """
+        self.prefix = prefix
+        self.buckets = buckets
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.request_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight: Dict[Tuple[str, str], int] = {}
+        self.query_seconds: Dict[str, Histogram] = {}
+        self._collectors: Dict[str, Callable[[], Dict]] = {}
+
+    def request_started(self, method: str, route: str) -> None:
+        """
+        Record request start.
+
+        Args:
+            method (str): HTTP method
+            route (str): route template, e.g. "/user/get/all"
+        """
+        key = (method, route)
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def request_finished(
+        self, method: str, route: str, status_code: int, seconds: float
+    ) -> None:
+        """
+        Record request end.
+
+        Args:
+            method (str): HTTP method
+            route (str): route template
+            status_code (int): response status
+            seconds (float): request handling time
+        """
+        key = (method, route)
+        self.in_flight[key] -= 1
+        counted = (method, route, status_code)
+        self.requests[counted] = self.requests.get(counted, 0) + 1
+        histogram = self.request_seconds.get(key)
+        if histogram is None:
+            histogram = self.request_seconds[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def observe_query(self, name: str, seconds: float) -> None:
+        """
+        Record database query time.
+
+        Args:
+            name (str): query name, e.g. "user.get_by_username"
+            seconds (float): query time
+        """
+        histogram = self.query_seconds.get(name)
+        if histogram is None:
+            histogram = self.query_seconds[name] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def register_collector(self, name: str, collect: Callable[[], Dict]) -> None:
+        """
+        Register function returning usage values exported at every scrape
+        as "<prefix>_<name>_<key>" gauges. Histogram snapshot values
+        exported as histograms. Hit ratio added if hits and misses given.
+
+        Args:
+            name (str): collector name, e.g. "user_cache"
+            collect (Callable[[], Dict]): returns values by key, e.g.
+                UserRepo.cache_stats
+        """
+        self._collectors[name] = collect
+
+    def render(self) -> str:
+        """
+        All metrics in Prometheus text exposition format.
+
+        Returns:
+            str: metrics text
+        """
+        prefix = self.prefix
+        lines = [f"# TYPE {prefix}_http_requests_total counter"]
+        for (method, route, status_code), count in sorted(
+            self.requests.items()
+        ):
+            labels = _labels(method=method, route=route, status=status_code)
+            lines.append(f"{prefix}_http_requests_total{labels} {count}")
+        lines.append(f"# TYPE {prefix}_http_requests_in_flight gauge")
+        for (method, route), count in sorted(self.in_flight.items()):
+            labels = _labels(method=method, route=route)
+            lines.append(f"{prefix}_http_requests_in_flight{labels} {count}")
+        name = f"{prefix}_http_request_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for (method, route), histogram in sorted(self.request_seconds.items()):
+            lines.extend(
+                _histogram_lines(
+                    name, histogram.snapshot(), {"method": method, "route": route}
+                )
+            )
+        name = f"{prefix}_db_query_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for query, histogram in sorted(self.query_seconds.items()):
+            lines.extend(
+                _histogram_lines(name, histogram.snapshot(), {"query": query})
+            )
+        for collector, collect in self._collectors.items():
+            values = dict(collect())
+            if "hits" in values and "misses" in values:
+                lookups = values["hits"] + values["misses"]
+                values["hit_ratio"] = values["hits"] / lookups if lookups else 0
+            for key, value in values.items():
+                name = f"{prefix}_{collector}_{key}"
+                if isinstance(value, dict) and "buckets" in value:
+                    lines.append(f"# TYPE {name} histogram")
+                    lines.extend(_histogram_lines(name, value, {}))
+                elif isinstance(value, (int, float)):
+                    lines.append(f"# TYPE {name} gauge")
+                    lines.append(f"{name} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class QueryTimer:
+    """
+    Database query time measurement - as decorator of async repository
+    method or as context manager around awaited query:
+
+        @classmethod
+        @QueryTimer("user.get_all")
+        async def get_all(cls): ...
+
+        with QueryTimer("user.iter_all"):
+            rows = await database.fetch_all(query)
+    """
+
+    def __init__(
+        self, name: str, registry: Optional[MetricsRegistry] = None
+    ) -> None:
+        """
+        Timer initialization.
+
+        Args:
+            name (str): query name used as metric label
+            registry (Optional[MetricsRegistry], optional): registry to
+                record in, module registry if not provided
+        """
+        self.name = name
+        self.registry = registry
+        self._started = 0.0
+
+    def _observe(self, seconds: float) -> None:
+        (self.registry or registry).observe_query(self.name, seconds)
+
+    def __enter__(self) -> "QueryTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._observe(time.perf_counter() - self._started)
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._observe(time.perf_counter() - started)
+
+        return timed
+
+
+registry = MetricsRegistry()
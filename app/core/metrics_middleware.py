@@ -0,0 +1,85 @@
+import time
+from typing import Dict, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import MetricsRegistry, registry
+
+METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+# Label of requests not matching any route - raw path never used as label.
+UNMATCHED = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording every HTTP request in metrics registry by
+    method and route template (e.g. "/static" mount, not the file path),
+    so label count stays bounded whatever paths clients request.
+
+    Route template resolved by matching app routes once per method and
+    path - later requests take it from bounded dict.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        registry: MetricsRegistry = registry,
+        max_paths: int = 4096,
+    ) -> None:
+        """
+        Middleware initialization.
+
+        Args:
+            app (ASGIApp): wrapped app
+            registry (MetricsRegistry, optional): registry to record in
+            max_paths (int, optional): max resolved paths remembered
+        """
+        self.app = app
+        self.registry = registry
+        self.max_paths = max_paths
+        self._routes: Dict[Tuple[str, str], str] = {}
+
+    def _route(self, scope: Scope) -> str:
+        key = (scope["method"], scope["path"])
+        route = self._routes.get(key)
+        if route is None:
+            route = self._match(scope)
+            if len(self._routes) < self.max_paths:
+                self._routes[key] = route
+        return route
+
+    @staticmethod
+    def _match(scope: Scope) -> str:
+        # Same matching as router - method mismatch (405) is partial match.
+        partial = None
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or UNMATCHED
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"] if scope["method"] in METHODS else "OTHER"
+        route = self._route(scope)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.registry.request_started(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.request_finished(
+                method, route, status_code, time.perf_counter() - started
+            )
@@ -0,0 +1,242 @@
+"""
+Versioned database schema migrations - the only place where schema is
+changed. App itself only verifies schema version at startup.
+
+New database gets current schema created and is stamped with current
+version. Existing database gets migrations newer than its version applied
+in order, each in its own transaction. Database created by app versions
+before schema versioning treated as version 0.
+
+Run from project root (before app start, see docker-compose):
+    $ python -m app.core.migrate
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Tuple
+
+import sqlalchemy
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.core.config import settings
+from app.core.db import database, metadata
+from app.core.model.jwt_model import JwtModel
+from app.core.model.schema_version_model import SchemaVersionModel
+from app.core.model.user_model import UserModel
+from app.core.schema import SCHEMA_VERSION, get_schema_version
+from app.core.security.password_hasher import (
+    SCHEME,
+    decrypt_legacy_password,
+    password_hasher,
+)
+from app.core.security.token_digest import token_digest
+
+
+async def migrate_blacklist_digest() -> int:
+    """
+    Move blacklisted JWT from Fernet encrypted column to token digest column
+    with unique index. Safe to run more than once.
+
+    Returns:
+        int: number of migrated blacklist rows
+    """
+    table = JwtModel.Meta.table
+    await database.execute(
+        "ALTER TABLE blacklisted_jwt ADD COLUMN IF NOT EXISTS token_digest VARCHAR(64)"
+    )
+    await database.execute(
+        "ALTER TABLE blacklisted_jwt ALTER COLUMN token DROP NOT NULL"
+    )
+    # Token column type decrypts legacy values on fetch.
+    rows = await database.fetch_all(
+        sqlalchemy.select([table.c.id, table.c.token]).where(
+            table.c.token_digest.is_(None)
+        )
+    )
+    for row in rows:
+        await database.execute(
+            table.update()
+            .where(table.c.id == row[table.c.id])
+            .values(token_digest=token_digest(row[table.c.token]), token=None)
+        )
+    # Same token could be blacklisted more than once before - keep oldest.
+    await database.execute(
+        "DELETE FROM blacklisted_jwt a USING blacklisted_jwt b "
+        "WHERE a.id > b.id AND a.token_digest = b.token_digest"
+    )
+    await database.execute(
+        "ALTER TABLE blacklisted_jwt ALTER COLUMN token_digest SET NOT NULL"
+    )
+    await database.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_blacklisted_jwt_token_digest "
+        "ON blacklisted_jwt (token_digest)"
+    )
+    return len(rows)
+
+
+async def migrate_blacklist_expiry() -> int:
+    """
+    Add token expiry column used by blacklist reaper. Legacy rows get
+    latest possible expiry of any token issued before migration.
+    Safe to run more than once.
+
+    Returns:
+        int: number of blacklist rows given expiry time
+    """
+    table = JwtModel.Meta.table
+    await database.execute(
+        "ALTER TABLE blacklisted_jwt ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP"
+    )
+    await database.execute(
+        "CREATE INDEX IF NOT EXISTS ix_blacklisted_jwt_expires_at "
+        "ON blacklisted_jwt (expires_at)"
+    )
+    legacy = await database.fetch_val(
+        sqlalchemy.select([sqlalchemy.func.count()])
+        .select_from(table)
+        .where(table.c.expires_at.is_(None))
+    )
+    await database.execute(
+        table.update()
+        .where(table.c.expires_at.is_(None))
+        .values(
+            expires_at=datetime.utcnow()
+            + timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
+        )
+    )
+    return legacy
+
+
+async def migrate_password_hashes() -> int:
+    """
+    Replace Fernet encrypted passwords with salted scrypt hashes.
+    Safe to run more than once - already hashed passwords skipped.
+
+    Returns:
+        int: number of rehashed passwords
+    """
+    table = UserModel.Meta.table
+    await database.execute(
+        "ALTER TABLE users ALTER COLUMN password TYPE VARCHAR(255)"
+    )
+    rows = await database.fetch_all(
+        sqlalchemy.select([table.c.id, table.c.password]).where(
+            table.c.password.notlike(SCHEME + "$%")
+        )
+    )
+    migrated = 0
+    for row in rows:
+        password = decrypt_legacy_password(row[table.c.password])
+        if password is None:
+            print(f"User id {row[table.c.id]}: password not decryptable, skipped")
+            continue
+        await database.execute(
+            table.update()
+            .where(table.c.id == row[table.c.id])
+            .values(password=await password_hasher.hash(password))
+        )
+        migrated += 1
+    return migrated
+
+
+# (version, description, migration) - migration returns number of
+# migrated rows. Last version must match schema.SCHEMA_VERSION.
+MIGRATIONS: List[Tuple[int, str, Callable[[], Awaitable[int]]]] = [
+    (1, "Blacklisted tokens migrated to digest", migrate_blacklist_digest),
+    (2, "Blacklisted tokens given expiry time", migrate_blacklist_expiry),
+    (3, "User passwords rehashed", migrate_password_hashes),
+]
+
+
+async def table_exists(name: str) -> bool:
+    """
+    Check if table exists in database.
+
+    Args:
+        name (str): table name
+
+    Returns:
+        bool: True if table exists
+    """
+    try:
+        await database.fetch_val(f"SELECT 1 FROM {name} LIMIT 1")
+    # Missing table error type differs between database drivers.
+    except Exception:
+        return False
+    return True
+
+
+async def create_tables(tables: List[sqlalchemy.Table]) -> None:
+    """
+    Create tables (with their indexes) not existing yet.
+
+    Args:
+        tables (List[sqlalchemy.Table]): tables from models metadata
+    """
+    # DDL compiled here - databases does not compile DDL for all backends.
+    dialect = sqlalchemy.engine.make_url(str(database.url)).get_dialect()()
+    for table in tables:
+        statements = [CreateTable(table, if_not_exists=True)] + [
+            CreateIndex(index, if_not_exists=True) for index in table.indexes
+        ]
+        for statement in statements:
+            await database.execute(str(statement.compile(dialect=dialect)))
+
+
+async def set_schema_version(version: int) -> None:
+    """
+    Record schema version as applied.
+
+    Args:
+        version (int): applied version
+    """
+    await database.execute(
+        SchemaVersionModel.Meta.table.insert().values(
+            version=version, applied_at=datetime.utcnow()
+        )
+    )
+
+
+async def migrate() -> int:
+    """
+    Bring database schema to current version.
+
+    Returns:
+        int: schema version after migration
+    """
+    fresh = not await table_exists(UserModel.Meta.tablename)
+    async with database.transaction():
+        if fresh:
+            await create_tables(metadata.sorted_tables)
+        else:
+            # Other tables changed by migrations only.
+            await create_tables([SchemaVersionModel.Meta.table])
+        version = await get_schema_version()
+        if version is None:
+            version = SCHEMA_VERSION if fresh else 0
+            await set_schema_version(version)
+    for number, description, migration in MIGRATIONS:
+        if number <= version:
+            continue
+        async with database.transaction():
+            migrated = await migration()
+            await set_schema_version(number)
+        print(f"Migration {number}: {description}: {migrated}")
+        version = number
+    return version
+
+
+async def main() -> None:
+    """
+    Run all pending migrations.
+    """
+    await database.connect()
+    try:
+        version = await migrate()
+        print(f"Database schema version: {version}")
+    finally:
+        password_hasher.shutdown()
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
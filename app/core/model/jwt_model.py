@@ -1,4 +1,7 @@
-from ormar import EncryptBackends, Integer, Model, String
+from datetime import datetime
+from typing import Optional
+
+from ormar import DateTime, EncryptBackends, Integer, Model, String
 
 from app.core.config import settings
 from app.core.db import BaseMeta
@@ -8,15 +11,26 @@ class JwtModel(Model):
     """
     Model class for database operations to be checked against Pydantic by Ormar.
     Table used for storing blacklisted JWT tokens.
+
+    Tokens stored as keyed digest (see security.token_digest) with unique
+    index, so blacklist check is a single index lookup.
+    Token expiry (UTC) stored to remove rows no longer needed.
     """
     class Meta(BaseMeta):
         tablename = "blacklisted_jwt"
 
     id: int = Integer(primary_key=True)
-    token: str = String(
+    token_digest: str = String(
+        max_length=64,
+        unique=True,
+        nullable=False,
+    )
+    expires_at: Optional[datetime] = DateTime(nullable=True, index=True)
+    # Legacy Fernet encrypted token - not written anymore, kept only to
+    # migrate old rows to token_digest (see app.core.migrate).
+    token: Optional[str] = String(
         max_length=680,
         encrypt_secret=settings.DB_SECRET,
         encrypt_backend=EncryptBackends.FERNET,
-        unique=True,
-        nullable=False,
+        nullable=True,
     )
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from ormar import DateTime, Integer, Model
+
+from app.core.db import BaseMeta
+
+
+class SchemaVersionModel(Model):
+    """
+    Model class for database operations to be checked against Pydantic by Ormar.
+    Table used to record applied schema migrations (see app.core.migrate),
+    current schema version is the highest one.
+    """
+    class Meta(BaseMeta):
+        tablename = "schema_version"
+
+    id: int = Integer(primary_key=True)
+    version: int = Integer(nullable=False)
+    applied_at: datetime = DateTime(default=datetime.utcnow, nullable=False)
@@ -1,6 +1,5 @@
-from app.core.config import settings
 from app.core.db import BaseMeta
-from ormar import Boolean, EncryptBackends, Integer, Model, String
+from ormar import Boolean, Integer, Model, String
 
 
 class UserModel(Model):
@@ -16,10 +15,8 @@ class UserModel(Model):
         max_length=128, unique=True, nullable=False)
     email: str = String(
         max_length=40, unique=True, nullable=False)
-    password: str = String(min_length=5,
-                           max_length=100,
-                           encrypt_secret=settings.DB_SECRET,
-                           encrypt_backend=EncryptBackends.FERNET,
+    # Salted scrypt hash, see security.password_hasher.
+    password: str = String(max_length=255,
                            unique=False,
                            nullable=False)
     is_active: bool = Boolean(default=True, nullable=False)
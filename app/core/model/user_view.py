@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class UserView:
+    """
+    Lightweight read only user data, built straight from selected columns.
+    No Ormar model hydration and no password (so no decryption) - to be used
+    wherever password is not needed.
+    """
+
+    __slots__ = ("id", "username", "email", "is_active", "is_admin")
+
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    is_admin: bool
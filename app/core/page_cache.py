@@ -0,0 +1,232 @@
+import hashlib
+import inspect
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from fastapi import Request, Response, status
+from fastapi.responses import HTMLResponse
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    """
+    Rendered page kept in cache.
+
+    body - encoded page
+    etag - strong ETag of body
+    tags - data the page depends on, invalidated together
+    expires_at - monotonic expiry time, None if valid until invalidated
+    """
+
+    body: bytes
+    etag: str
+    tags: FrozenSet[str]
+    expires_at: Optional[float]
+
+
+class PageCache:
+    """
+    In-process cache of rendered HTML pages (or fragments) with explicit
+    keys and tags, bounded by total size of cached bodies - least recently
+    used pages evicted first. Pages served as ready bytes with ETag, so
+    conditional GET answered with 304 without rendering.
+
+    Not thread safe - meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Cache initialization.
+
+        Args:
+            max_bytes (int): max total size of cached pages
+            timer (Callable[[], float], optional): clock used for expiry
+        """
+        self.max_bytes = max_bytes
+        self._timer = timer
+        self._pages: "OrderedDict[Hashable, CachedPage]" = OrderedDict()
+        self._tagged: Dict[str, Set[Hashable]] = {}
+        self._tag_versions: Dict[str, int] = {}
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def get(self, key: Hashable) -> Optional[CachedPage]:
+        """
+        Get cached page, marked as most recently used.
+
+        Args:
+            key (Hashable): page key
+
+        Returns:
+            Optional[CachedPage]: page or None if missing or expired
+        """
+        page = self._pages.get(key)
+        if page is not None and (
+            page.expires_at is None or page.expires_at > self._timer()
+        ):
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+        if page is not None:
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def set(
+        self,
+        key: Hashable,
+        body: bytes,
+        tags: Sequence[str] = (),
+        ttl: Optional[float] = None,
+    ) -> CachedPage:
+        """
+        Put rendered page into cache, evict least recently used pages
+        if over size limit. Page bigger than whole cache not stored.
+
+        Args:
+            key (Hashable): page key
+            body (bytes): rendered page
+            tags (Sequence[str], optional): data tags page depends on
+            ttl (Optional[float], optional): seconds page is valid for,
+                valid until invalidated if not provided
+
+        Returns:
+            CachedPage: page (stored or not)
+        """
+        page = CachedPage(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            tags=frozenset(tags),
+            expires_at=None if ttl is None else self._timer() + ttl,
+        )
+        if key in self._pages:
+            self._remove(key)
+        if len(body) > self.max_bytes:
+            return page
+        self._pages[key] = page
+        self.size_bytes += len(body)
+        for tag in page.tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._pages)))
+            self.evictions += 1
+        return page
+
+    def invalidate_tag(self, tag: str) -> None:
+        """
+        Remove all pages depending on tagged data.
+
+        Args:
+            tag (str): data tag, e.g. "users"
+        """
+        self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+        for key in list(self._tagged.get(tag, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Remove all pages. Counters are kept.
+        """
+        self._pages.clear()
+        self._tagged.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        # Missing if never stored (bigger than cache).
+        page = self._pages.pop(key, None)
+        if page is None:
+            return
+        self.size_bytes -= len(page.body)
+        for tag in page.tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    async def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        render: Callable[[], Union[str, Awaitable[str]]],
+        tags: Sequence[str] = (),
+        ttl: Optional[float] = None,
+    ) -> Response:
+        """
+        Serve page from cache, rendered and cached on miss.
+        304 returned if client has current version (If-None-Match).
+
+        Args:
+            request (Request): current request
+            key (Hashable): page key - template name plus everything page
+                content depends on
+            render (Callable[[], Union[str, Awaitable[str]]]): page renderer
+            tags (Sequence[str], optional): data tags page depends on
+            ttl (Optional[float], optional): seconds page is valid for
+
+        Returns:
+            Response: HTML page or 304
+        """
+        page = self.get(key)
+        if page is None:
+            versions = [self._tag_versions.get(tag, 0) for tag in tags]
+            html = render()
+            if inspect.isawaitable(html):
+                html = await html
+            page = self.set(key, html.encode(), tags=tags, ttl=ttl)
+            # Data changed while rendering - page may be stale already.
+            if versions != [self._tag_versions.get(tag, 0) for tag in tags]:
+                self._remove(key)
+        # Revalidated every time - content changes without URL change.
+        headers = {"etag": page.etag, "cache-control": "no-cache"}
+        if_none_match = {
+            tag.strip()
+            for tag in request.headers.get("if-none-match", "").split(",")
+        }
+        if "*" in if_none_match or page.etag in if_none_match:
+            self.not_modified += 1
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        return HTMLResponse(content=page.body, headers=headers)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache usage counters.
+
+        Returns:
+            Dict[str, int]: pages, size in bytes, hits, misses, evictions
+                and 304 responses
+        """
+        return {
+            "size": len(self._pages),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "not_modified": self.not_modified,
+        }
+
+
+page_cache = PageCache(max_bytes=settings.PAGE_CACHE_MAX_BYTES)
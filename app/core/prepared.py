@@ -0,0 +1,98 @@
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import ClauseElement
+
+from app.core.db import database
+
+# Prepared path used with asyncpg only - other backends go thru the ORM.
+USE_PREPARED = database.url.dialect == "postgresql"
+
+_DIALECT = postgresql.dialect(paramstyle="format")
+_PLACEHOLDER = re.compile(r"%%|%s")
+
+
+@asynccontextmanager
+async def _raw_connection() -> AsyncIterator[Any]:
+    """
+    Raw asyncpg connection of current databases connection, used
+    exclusively.
+
+    databases shares one connection between a task and tasks it starts
+    and serializes their queries with connection query lock - it has to be
+    held here too, otherwise asyncpg fails with "another operation is in
+    progress". The lock is not public databases API, its presence is
+    checked by tests (tests/core/test_prepared.py).
+
+    Yields:
+        Any: asyncpg connection
+    """
+    async with database.connection() as connection:
+        async with connection._query_lock:
+            yield connection.raw_connection
+
+
+class PreparedQuery:
+    """
+    Hot query compiled once to asyncpg SQL ($1, $2... parameters) at import,
+    so no ORM query building and SQLAlchemy compilation per call.
+
+    Executed on raw asyncpg connection of current databases connection (same
+    one used by transactions). asyncpg statement cache (DB_STATEMENT_CACHE_SIZE)
+    keeps statement prepared per connection - it is parsed and planned
+    by Postgres once per connection, not per call.
+    """
+
+    def __init__(self, statement: ClauseElement) -> None:
+        """
+        Compile statement with named bind parameters.
+
+        Args:
+            statement (ClauseElement): SQLAlchemy core statement, values given
+                as sqlalchemy.bindparam(name)
+        """
+        compiled = statement.compile(dialect=_DIALECT)
+        self.params: Tuple[str, ...] = tuple(compiled.positiontup)
+        # Literal values of statement (not bindparam ones) bound at compile.
+        self.defaults = {
+            name: value
+            for name, value in compiled.params.items()
+            if value is not None
+        }
+        position = iter(range(1, len(self.params) + 1))
+        self.sql: str = _PLACEHOLDER.sub(
+            lambda match: "%" if match.group() == "%%" else f"${next(position)}",
+            compiled.string,
+        )
+
+    def args(self, **values: Any) -> Tuple[Any, ...]:
+        """
+        Order named values as statement parameters.
+
+        Returns:
+            Tuple[Any, ...]: positional parameters
+        """
+        values = {**self.defaults, **values}
+        return tuple(values[name] for name in self.params)
+
+    async def fetch_one(self, **values: Any) -> Optional[Any]:
+        """
+        Run query, return first row.
+
+        Returns:
+            Optional[Any]: asyncpg Record or None if no rows
+        """
+        async with _raw_connection() as connection:
+            return await connection.fetchrow(self.sql, *self.args(**values))
+
+    async def fetch_val(self, **values: Any) -> Any:
+        """
+        Run query, return first column of first row.
+
+        Returns:
+            Any: value or None if no rows
+        """
+        async with _raw_connection() as connection:
+            return await connection.fetchval(self.sql, *self.args(**values))
@@ -0,0 +1,292 @@
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class ProfilerBusyError(RuntimeError):
+    """
+    Worker profile requested while other one still running.
+    """
+
+
+@dataclass
+class Profile:
+    """
+    Result of sampling.
+
+    interval - seconds between samples
+    duration - seconds sampled
+    samples - number of samples by stack (thread name first, then frames
+        from outermost to innermost)
+    """
+
+    interval: float
+    duration: float = 0.0
+    samples: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """
+        Stacks in collapsed format ("frame;frame;frame count" lines) used
+        by flamegraph.pl, inferno, speedscope and others.
+
+        Returns:
+            str: collapsed stacks
+        """
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in self.samples.most_common()
+        )
+
+    def speedscope(self, name: str) -> Dict:
+        """
+        Profile in speedscope JSON format, one sampled profile per thread.
+
+        Args:
+            name (str): profile name
+
+        Returns:
+            Dict: speedscope file content
+        """
+        frames: List[Dict] = []
+        frame_index: Dict[str, int] = {}
+        threads: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        for stack, count in self.samples.items():
+            thread, *labels = stack
+            indexes = []
+            for label in labels:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indexes.append(frame_index[label])
+            stacks, weights = threads.setdefault(thread, ([], []))
+            stacks.append(indexes)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "FastAPI_APIs sampling profiler",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": stacks,
+                    "weights": weights,
+                }
+                for thread, (stacks, weights) in sorted(threads.items())
+            ],
+        }
+
+
+class StackSampler:
+    """
+    Statistical profiler: background thread reading stacks of all other
+    threads (sys._current_frames) every interval - profiled code is not
+    instrumented and not slowed down except for GIL taken by sampling.
+    Thread exists only between start() and stop().
+
+    If task given, only samples of event loop thread taken while that task
+    runs are kept - profile of single request.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        task: Optional[asyncio.Task] = None,
+    ) -> None:
+        """
+        Sampler initialization.
+
+        Args:
+            interval (float): seconds between samples
+            task (Optional[asyncio.Task], optional): only task to be sampled
+        """
+        self.interval = interval
+        self.task = task
+        self.profile = Profile(interval=interval)
+        self._loop_thread = threading.get_ident() if task else None
+        self._loop = task.get_loop() if task else None
+        self._labels: Dict[CodeType, str] = {}
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if path.startswith(os.getcwd()):
+                path = os.path.relpath(path)
+            label = f"{code.co_name} ({path}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _stack(self, thread: str, frame: Optional[FrameType]) -> Tuple[str, ...]:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread)
+        return tuple(reversed(labels))
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        frames = sys._current_frames()
+        if self.task is not None:
+            # Event loop thread busy with other task (or idle) - skipped.
+            if asyncio.current_task(self._loop) is not self.task:
+                return
+            frame = frames.get(self._loop_thread)
+            if frame is not None:
+                self.profile.samples[self._stack("request", frame)] += 1
+            return
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in frames.items():
+            if ident != own:
+                thread = names.get(ident, str(ident))
+                self.profile.samples[self._stack(thread, frame)] += 1
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        """
+        Start sampling thread.
+        """
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="stack_sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        """
+        Stop sampling thread.
+
+        Returns:
+            Profile: samples taken
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.profile.duration = time.perf_counter() - self._started
+        return self.profile
+
+
+class SamplingProfiler:
+    """
+    On demand profiler of current worker. Nothing runs (no thread, no hook)
+    unless profile requested: whole worker for given time (profile()) or
+    single request (request_sampler(), see RequestProfilerMiddleware).
+    Request profiles kept in memory for later download, most recent only.
+    """
+
+    def __init__(
+        self, interval: float, max_seconds: float, keep_requests: int
+    ) -> None:
+        """
+        Profiler initialization.
+
+        Args:
+            interval (float): seconds between samples
+            max_seconds (float): max duration of worker profile
+            keep_requests (int): number of request profiles kept
+        """
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.keep_requests = keep_requests
+        self._busy = False
+        self._ids = itertools.count(1)
+        self._requests: "OrderedDict[str, Profile]" = OrderedDict()
+
+    async def profile(self, seconds: float) -> Profile:
+        """
+        Sample all threads of current worker for given time. Event loop
+        keeps serving requests meanwhile.
+
+        Args:
+            seconds (float): sampling time, capped at max_seconds
+
+        Raises:
+            ProfilerBusyError: if other worker profile running
+
+        Returns:
+            Profile: samples taken
+        """
+        if self._busy:
+            raise ProfilerBusyError("Profile already running")
+        self._busy = True
+        sampler = StackSampler(interval=self.interval)
+        sampler.start()
+        try:
+            await asyncio.sleep(min(seconds, self.max_seconds))
+        finally:
+            profile = sampler.stop()
+            self._busy = False
+        return profile
+
+    def request_sampler(self) -> StackSampler:
+        """
+        Sampler of current task (request being handled).
+
+        Returns:
+            StackSampler: not started sampler
+        """
+        return StackSampler(
+            interval=self.interval, task=asyncio.current_task()
+        )
+
+    def reserve_id(self) -> str:
+        """
+        Id of request profile to be kept later - known before request
+        finishes, so it can be sent in response headers.
+
+        Returns:
+            str: profile id
+        """
+        return str(next(self._ids))
+
+    def keep(self, profile_id: str, profile: Profile) -> None:
+        """
+        Store request profile, oldest one dropped if over limit.
+
+        Args:
+            profile_id (str): id from reserve_id()
+            profile (Profile): request profile
+        """
+        self._requests[profile_id] = profile
+        while len(self._requests) > self.keep_requests:
+            self._requests.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        """
+        Get stored request profile.
+
+        Args:
+            profile_id (str): id from reserve_id()
+
+        Returns:
+            Optional[Profile]: profile or None if unknown or dropped
+        """
+        return self._requests.get(profile_id)
+
+
+profiler = SamplingProfiler(
+    interval=settings.PROFILER_INTERVAL_SECONDS,
+    max_seconds=settings.PROFILER_MAX_SECONDS,
+    keep_requests=settings.PROFILER_KEEP_REQUESTS,
+)
@@ -0,0 +1,72 @@
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiler import SamplingProfiler, profiler
+from app.core.security.auth import oauth2_scheme
+from app.core.security.auth_context import resolve_auth_context
+
+# Response header with id of request profile (see /admin/profile/requests).
+PROFILE_ID_HEADER = "x-profile-id"
+
+
+class RequestProfilerMiddleware:
+    """
+    ASGI middleware profiling single requests of logged in admin sent with
+    profiling header (PROFILER_REQUEST_HEADER). Other requests only checked
+    for header presence. Added to app only if PROFILER_REQUEST_ENABLED.
+
+    Request task sampled only - work done in thread pool (sync endpoints,
+    password hashing) not included.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler: SamplingProfiler = profiler,
+        header: str = settings.PROFILER_REQUEST_HEADER,
+    ) -> None:
+        """
+        Middleware initialization.
+
+        Args:
+            app (ASGIApp): wrapped app
+            profiler (SamplingProfiler, optional): profiler to keep
+                request profiles in
+            header (str, optional): request header triggering profiling
+        """
+        self.app = app
+        self.profiler = profiler
+        self.header = header.lower().encode("latin-1")
+
+    async def _is_admin(self, scope: Scope) -> bool:
+        request = Request(scope)
+        context = await resolve_auth_context(token=await oauth2_scheme(request))
+        # Reused by get_auth_context - resolved once per request anyway.
+        request.state.auth_context = context
+        return context.is_authenticated and context.user.is_admin
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not any(
+            name == self.header for name, _ in scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not await self._is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+        profile_id = self.profiler.reserve_id()
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        sampler = self.profiler.request_sampler()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            self.profiler.keep(profile_id, sampler.stop())
@@ -0,0 +1,140 @@
+import asyncio
+from typing import Any, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+
+class RespError(Exception):
+    """
+    Error reply returned by Redis protocol server.
+    """
+
+
+class RespClient:
+    """
+    Minimal asyncio client for Redis serialization protocol (RESP2).
+    Works with Redis and protocol compatible servers (KeyDB, Dragonfly,
+    Valkey etc.) without extra dependencies.
+
+    Connections opened lazily and reused, up to pool size at once.
+    """
+
+    def __init__(self, url: str, pool_size: int = 10) -> None:
+        """
+        Client initialization - no connection opened here.
+
+        Args:
+            url (str): redis://[:password@]host[:port][/db]
+            pool_size (int, optional): max number of open connections
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.pool_size = pool_size
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password is not None:
+            await self._call(reader, writer, ("AUTH", self.password))
+        if self.db:
+            await self._call(reader, writer, ("SELECT", self.db))
+        return reader, writer
+
+    async def execute(self, *args: Any) -> Any:
+        """
+        Run single command and return its reply.
+
+        Args:
+            args (Any): command name and arguments
+
+        Raises:
+            RespError: if server replied with error
+
+        Returns:
+            Any: decoded reply - str, int, bytes, list or None
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else await self._connect()
+            try:
+                reply = await self._call(*connection, args)
+            except RespError:
+                self._idle.append(connection)
+                raise
+            except BaseException:
+                connection[1].close()
+                raise
+            self._idle.append(connection)
+            return reply
+
+    async def close(self) -> None:
+        """
+        Close all idle connections.
+        """
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _call(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        args: Tuple[Any, ...],
+    ) -> Any:
+        writer.write(encode_command(*args))
+        await writer.drain()
+        return await read_reply(reader)
+
+
+def encode_command(*args: Any) -> bytes:
+    """
+    Encode command as RESP array of bulk strings.
+
+    Returns:
+        bytes: command ready to be sent
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read single RESP reply from stream.
+
+    Raises:
+        RespError: if server replied with error
+        ConnectionError: if connection closed by server
+
+    Returns:
+        Any: decoded reply
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length == -1:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length == -1:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RespError(f"Unknown reply type: {line!r}")
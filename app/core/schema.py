@@ -0,0 +1,51 @@
+from typing import Optional
+
+import sqlalchemy
+
+from app.core.db import database
+from app.core.model.schema_version_model import SchemaVersionModel
+
+# Schema version required by the app - bump together with new migration
+# added in app.core.migrate.
+SCHEMA_VERSION = 3
+
+
+class SchemaVersionError(RuntimeError):
+    """
+    Database schema missing or not matching app version.
+    """
+
+
+async def get_schema_version() -> Optional[int]:
+    """
+    Get version of current database schema.
+
+    Returns:
+        Optional[int]:
+            int: highest applied migration version
+            None: if schema not versioned yet (or no schema at all)
+    """
+    table = SchemaVersionModel.Meta.table
+    try:
+        return await database.fetch_val(
+            sqlalchemy.select([sqlalchemy.func.max(table.c.version)])
+        )
+    # Missing table error type differs between database drivers.
+    except Exception:
+        return None
+
+
+async def verify_schema_version() -> None:
+    """
+    Check at app startup that database schema was migrated to version
+    required by the app. Schema is never changed by the app itself.
+
+    Raises:
+        SchemaVersionError: if schema version different than required
+    """
+    version = await get_schema_version()
+    if version != SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema version {version}, app requires "
+            f"{SCHEMA_VERSION} - run: python -m app.core.migrate"
+        )
@@ -48,3 +48,7 @@ class OAuth2PasswordBearerWithCookie(OAuth2):
         if not authorization or scheme.lower() != "bearer":
             return None
         return param
+
+
+# API endpoint to get new token from.
+oauth2_scheme = OAuth2PasswordBearerWithCookie(tokenUrl="/token")
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import Depends, Request
+
+from app.core.model.user_view import UserView
+from app.core.security.auth import oauth2_scheme
+from app.core.security.jwt_handler import (
+    decode_access_token,
+    is_token_blacklisted,
+)
+from app.core.user_repo import UserRepo
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """
+    Immutable authentication data of a single request.
+    Resolved once from the authorization cookie and shared by all handlers
+    and dependencies of that request.
+    """
+
+    token: Optional[str] = None
+    claims: Optional[Dict] = None
+    user: Optional[UserView] = None
+    token_blacklisted: bool = False
+
+    @property
+    def is_authenticated(self) -> bool:
+        """
+        Check if request comes from logged in user with valid session.
+
+        Returns:
+            bool:
+                True if user resolved from cookie and token not blacklisted
+                False otherwise
+        """
+        return self.user is not None and not self.token_blacklisted
+
+
+async def resolve_auth_context(token: Optional[str]) -> AuthContext:
+    """
+    Build auth context from JWT taken from authorization cookie.
+    Token decoded once, user and blacklist verdict fetched from database only
+    when previous step succeeded.
+
+    Args:
+        token (Optional[str]): JWT without "Bearer" prefix
+
+    Returns:
+        AuthContext: resolved request auth data
+    """
+    if not token:
+        return AuthContext()
+    claims = await decode_access_token(token=token)
+    if claims is None:
+        return AuthContext(token=token)
+    user = await UserRepo.get_view_by_username(
+        username=claims.get("username")
+    )
+    if user is None:
+        return AuthContext(token=token, claims=claims)
+    blacklisted = await is_token_blacklisted(token=token)
+    return AuthContext(
+        token=token,
+        claims=claims,
+        user=user,
+        token_blacklisted=blacklisted,
+    )
+
+
+async def get_auth_context(
+    request: Request, token: Optional[str] = Depends(oauth2_scheme)
+) -> AuthContext:
+    """
+    FastAPI dependency providing auth context of the current request.
+    Result stored in request state so it is computed only once per request.
+
+    Args:
+        request (Request): current request
+        token (Optional[str]): JWT parsed from cookie by oauth2 scheme
+
+    Returns:
+        AuthContext: resolved request auth data
+    """
+    context = getattr(request.state, "auth_context", None)
+    if context is None:
+        context = await resolve_auth_context(token=token)
+        request.state.auth_context = context
+    return context
@@ -0,0 +1,27 @@
+import logging
+
+from app.core.config import settings
+from app.core.security.revocation_store import revocation_store
+from app.core.tasks import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+async def reap_expired_tokens() -> int:
+    """
+    Remove blacklisted tokens past their expiry time from revocation store -
+    such tokens are rejected by JWT validation anyway.
+
+    Returns:
+        int: number of tokens reclaimed in this run
+    """
+    reclaimed = await revocation_store.purge_expired()
+    logger.info("Blacklist reaper reclaimed %d expired tokens", reclaimed)
+    return reclaimed
+
+
+blacklist_reaper = PeriodicTask(
+    name="blacklist_reaper",
+    interval=settings.BLACKLIST_REAP_INTERVAL_SECONDS,
+    func=reap_expired_tokens,
+)
@@ -0,0 +1,73 @@
+import hashlib
+import math
+from typing import Iterator
+
+
+class BloomFilter:
+    """
+    Probabilistic set membership of strings.
+    Never gives false negative - item added is always reported as present,
+    item not added is reported as present with false positive rate only.
+    Items can't be removed - filter has to be rebuilt instead.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """
+        Filter sized for expected number of items and false positive rate.
+
+        Args:
+            capacity (int): expected max number of items
+            error_rate (float): false positive rate at full capacity
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bit_count = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.hash_count = max(
+            1, round(self.bit_count / capacity * math.log(2))
+        )
+        self.count = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing - k positions derived from two 64 bit hashes.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.bit_count
+
+    def add(self, item: str) -> None:
+        """
+        Add item to filter.
+
+        Args:
+            item (str): item to be added
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """
+        Estimated false positive rate for current number of items.
+
+        Returns:
+            float: probability of reporting not added item as present
+        """
+        return (
+            1 - math.exp(-self.hash_count * self.count / self.bit_count)
+        ) ** self.hash_count
@@ -1,18 +1,30 @@
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Union
 
-from fastapi import Request
-from jose import JWTError, jwt
+from fastapi import Request, Response
+from fastapi.security.utils import get_authorization_scheme_param
+from jose import JWTError
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.model.user_model import UserModel
+from app.core.model.user_view import UserView
+from app.core.security.keyring import keyring
 from app.core.user_repo import UserRepo
-from app.core.jwt_repo import JwtRepo
+from app.core.security.revocation_store import revocation_store
+from app.core.security.token_digest import token_digest
+
+# Claims of already verified tokens - keyed by token digest, so raw tokens
+# are not kept in memory.
+_claims_cache = TTLCache(
+    maxsize=settings.JWT_CLAIMS_CACHE_MAXSIZE,
+    ttl=settings.JWT_CLAIMS_CACHE_TTL_SECONDS,
+)
 
 
 def create_access_token(data: Dict) -> str:
     """
-    Create JWT token.
+    Create JWT token signed by active keyring key.
     Expiration time returned in token as timestamp.
 
     Args:
@@ -26,43 +38,90 @@ def create_access_token(data: Dict) -> str:
         minutes=settings.JWT_EXPIRE_MINUTES
     )
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM,
-    )
+    encoded_jwt = keyring.sign(to_encode)
     return encoded_jwt
 
 
+def issue_access_token(response: Response, username: str) -> Dict[str, str]:
+    """
+    Issue JWT for already authenticated user and place it in authorization
+    cookie with "Bearer" prefix. No database access here.
+
+    Args:
+        response (Response): response the cookie will be set on
+        username (str): authenticated user username
+
+    Returns:
+        Dict[str, str]: issued token and its type
+    """
+    access_token = create_access_token(data={"username": username})
+    # HttpOnly - prevent JS from reading the cookie.
+    response.set_cookie(
+        key=settings.COOKIE_NAME,
+        value=f"Bearer {access_token}",
+        httponly=True,
+    )
+    return {settings.COOKIE_NAME: access_token, "token_type": "bearer"}
+
+
+def _without_scheme(token: str) -> str:
+    # Accept both raw token and cookie value with "Bearer" prefix.
+    scheme, param = get_authorization_scheme_param(token)
+    return param if scheme.lower() == "bearer" else token
+
+
 async def decode_access_token(token: str) -> Union[Dict, None]:
     """
     Decode JWT extracted from authorization cookie.
     Validate JWT expiry time.
+    Claims of verified token cached until token expiry at the latest, so
+    repeated requests with the same cookie skip signature verification.
 
     Args:
-        token (str): to be decoded.
+        token (str): to be decoded, with or without "Bearer" prefix.
 
     Returns:
         Union[Dict, None]:
             return Dict of username and validation timestamp
             return None if JWT decoding error or JWT expired
     """
-    token = token.lstrip("Bearer").strip()
+    token = _without_scheme(token)
+    # Keyring version in key - cached claims dropped when keys reloaded.
+    digest = (keyring.version, token_digest(token))
+    payload = _claims_cache.get(digest)
+    if payload is not None:
+        # Cache TTL is monotonic - recheck expiry against wall clock.
+        if payload["exp"] > time.time():
+            return dict(payload)
+        _claims_cache.invalidate(digest)
+        return None
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+        payload = keyring.verify(token)
     except JWTError:
-        payload = None
-
+        return None
+    # Only verified tokens with expiry cached - garbage cookies can't flood
+    # the cache.
+    if "exp" not in payload:
+        return payload
+    ttl = min(_claims_cache.ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        _claims_cache.set(digest, dict(payload), ttl=ttl)
     return payload
 
 
+def claims_cache_stats() -> Dict[str, int]:
+    """
+    Verified JWT claims cache usage counters.
+
+    Returns:
+        Dict[str, int]: size, hits, misses, evictions and expirations
+    """
+    return _claims_cache.stats()
+
+
 async def get_current_user_from_cookie(
     request: Request,
-) -> Union[UserModel, None]:
+) -> Union[UserView, None]:
     """
     Get user from authorization cookie.
 
@@ -70,8 +129,8 @@ async def get_current_user_from_cookie(
         request (Request): to be used in templating.
 
     Returns:
-        Union[User, None]:
-            return User if authorization cookie present
+        Union[UserView, None]:
+            return UserView if authorization cookie present
             return None if authorization cookie not present
                         or no such user in databes
     """
@@ -79,7 +138,7 @@ async def get_current_user_from_cookie(
     try:
         payload = await decode_access_token(token=token)
         username = payload.get("username")
-        user = await UserRepo.get_by_username(username=username)
+        user = await UserRepo.get_view_by_username(username=username)
     except:
         user = None
 
@@ -98,25 +157,43 @@ async def check_if_token_blacklisted(request: Request) -> bool:
             True - if token was used before and is blacklisted
             False - if token is not blacklisted
     """
-    try:
-        cookie = request.cookies.get(settings.COOKIE_NAME)
-        token = cookie.lstrip("Bearer").strip()
-        blacklisted_token = await JwtRepo.get_from_database(token=token)
-    except AttributeError:
-        blacklisted_token = None
+    cookie = request.cookies.get(settings.COOKIE_NAME)
+    if not cookie:
+        return False
+    return await is_token_blacklisted(token=_without_scheme(cookie))
+
+
+async def is_token_blacklisted(token: str) -> bool:
+    """
+    Check if token is blacklisted in revocation store.
 
-    if blacklisted_token is not None:
-        return True
-    return False
+    Args:
+        token (str): JWT without "Bearer" prefix
+
+    Returns:
+        bool:
+            True - if token was used before and is blacklisted
+            False - if token is not blacklisted
+    """
+    return await revocation_store.is_revoked(token=token)
 
 
 async def blacklist_token(request: Request) -> None:
     """
-    Add token to blacklist in database to not be used again.
+    Add token to blacklist in revocation store to not be used again.
+    Token kept in blacklist until its expiry time only.
 
     Args:
         request (Request): used in templating.
     """
     cookie = request.cookies.get(settings.COOKIE_NAME)
-    token = cookie.lstrip("Bearer").strip()
-    await JwtRepo.add_to_database(token=token)
+    if not cookie:
+        return
+    token = _without_scheme(cookie)
+    payload = await decode_access_token(token=token)
+    # Invalid or expired token is rejected anyway - nothing to blacklist.
+    if payload is None:
+        return
+    await revocation_store.revoke(
+        token=token, expires_at=datetime.utcfromtimestamp(payload["exp"])
+    )
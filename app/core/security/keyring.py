@@ -0,0 +1,304 @@
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+from jose import JWTError, jwk, jwt
+from jose.exceptions import JWKError
+
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ALGORITHMS = ("HS256", "ES256", "EdDSA")
+
+
+class Ed25519Key(jwk.Key):
+    """
+    EdDSA (Ed25519) JWK key for python-jose, which has no EdDSA support
+    of its own. Registered in jose under "EdDSA" algorithm.
+    """
+
+    def __init__(self, key, algorithm) -> None:
+        """
+        Key initialization.
+
+        Args:
+            key: PEM encoded private or public key (str or bytes) or
+                cryptography Ed25519 key object
+            algorithm: "EdDSA" only
+
+        Raises:
+            JWKError: if other algorithm or not Ed25519 key
+        """
+        if algorithm != "EdDSA":
+            raise JWKError(f"Algorithm {algorithm} not supported by Ed25519Key")
+        if isinstance(key, str):
+            key = key.encode()
+        if isinstance(key, bytes):
+            if b"PRIVATE KEY" in key:
+                key = serialization.load_pem_private_key(key, password=None)
+            else:
+                key = serialization.load_pem_public_key(key)
+        if not isinstance(key, (Ed25519PrivateKey, Ed25519PublicKey)):
+            raise JWKError("Not an Ed25519 key")
+        self._algorithm = algorithm
+        self._private = key if isinstance(key, Ed25519PrivateKey) else None
+        self._public = key.public_key() if self._private else key
+
+    def is_public(self) -> bool:
+        return self._private is None
+
+    def sign(self, msg: bytes) -> bytes:
+        if self._private is None:
+            raise JWKError("Public key can't sign")
+        return self._private.sign(msg)
+
+    def verify(self, msg: bytes, sig: bytes) -> bool:
+        try:
+            self._public.verify(sig, msg)
+        except InvalidSignature:
+            return False
+        return True
+
+    def public_key(self) -> "Ed25519Key":
+        return Ed25519Key(self._public, self._algorithm)
+
+    def to_pem(self) -> bytes:
+        if self._private is not None:
+            return self._private.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+        return self._public.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+
+
+jwk.register_key("EdDSA", Ed25519Key)
+
+
+@dataclass(frozen=True)
+class KeyringKey:
+    """
+    Parsed key of the keyring.
+
+    kid - key id placed in token header
+    algorithm - one of SUPPORTED_ALGORITHMS
+    key - parsed jose key, reused for every signing
+    verify_key - parsed jose key (public part if asymmetric) for verifying
+    not_before - epoch seconds from which key is used for signing
+    can_sign - False for public (verify only) keys
+    """
+
+    kid: str
+    algorithm: str
+    key: jwk.Key
+    verify_key: jwk.Key
+    not_before: float
+    can_sign: bool
+
+
+def parse_key(entry: Dict) -> KeyringKey:
+    """
+    Parse single keyring file entry.
+
+    Args:
+        entry (Dict): {"kid": str, "alg": str, "key": secret (HS256) or
+            PEM private/ public key, "not_before": epoch seconds, optional}
+
+    Raises:
+        ValueError: if unsupported algorithm or invalid key
+
+    Returns:
+        KeyringKey: parsed key
+    """
+    algorithm = entry["alg"]
+    if algorithm not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"Unsupported key algorithm: {algorithm}")
+    try:
+        key = jwk.construct(entry["key"], algorithm)
+    except JWKError as error:
+        raise ValueError(f"Invalid key {entry['kid']}: {error}")
+    symmetric = algorithm == "HS256"
+    return KeyringKey(
+        kid=entry["kid"],
+        algorithm=algorithm,
+        key=key,
+        # Private EC key can't verify in jose - public part needed.
+        verify_key=key if symmetric else key.public_key(),
+        not_before=float(entry.get("not_before", 0)),
+        can_sign=symmetric or not key.is_public(),
+    )
+
+
+class Keyring:
+    """
+    JWT signing and verification keys selected by "kid" token header.
+
+    Keys read from JSON keyring file {"keys": [entry, ...]} (see parse_key)
+    and parsed once. New token signed by the newest signing key already
+    valid (not_before passed), so rotation is scheduled by adding key with
+    future not_before - file is reloaded periodically. Verify only nodes
+    hold public keys only. Old keys stay in file until tokens signed by
+    them expire - removed key id means rejected token.
+
+    Tokens without "kid" (issued before keyring) handled by default key
+    built from JWT_SECRET_KEY.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        default_secret: Optional[str],
+        default_algorithm: str = "HS256",
+    ) -> None:
+        """
+        Keyring initialization - keyring file loaded if provided.
+
+        Args:
+            path (Optional[str]): keyring JSON file path
+            default_secret (Optional[str]): secret of default key
+            default_algorithm (str, optional): algorithm of default key
+        """
+        self.path = path
+        self.default_algorithm = default_algorithm
+        self.default_key = (
+            jwk.construct(default_secret, default_algorithm)
+            if default_secret
+            else None
+        )
+        self.version = 0
+        self._keys: Dict[str, KeyringKey] = {}
+        self._signing: List[KeyringKey] = []
+        self._mtime: Optional[float] = None
+        self.load()
+
+    def load(self) -> bool:
+        """
+        (Re)load keyring file if changed since last load.
+
+        Raises:
+            ValueError: if invalid keyring file
+
+        Returns:
+            bool: True if keys reloaded
+        """
+        if not self.path:
+            return False
+        mtime = os.stat(self.path).st_mtime
+        if mtime == self._mtime:
+            return False
+        with open(self.path) as keyring_file:
+            entries = json.load(keyring_file)["keys"]
+        keys = {entry["kid"]: parse_key(entry) for entry in entries}
+        self._keys = keys
+        self._signing = sorted(
+            (key for key in keys.values() if key.can_sign),
+            key=lambda key: key.not_before,
+            reverse=True,
+        )
+        self._mtime = mtime
+        self.version += 1
+        logger.info("JWT keyring loaded: %s", ", ".join(keys))
+        return True
+
+    async def reload(self) -> bool:
+        """
+        Reload keyring file - used by periodic task.
+
+        Returns:
+            bool: True if keys reloaded
+        """
+        return self.load()
+
+    def active_key(self, now: Optional[float] = None) -> Optional[KeyringKey]:
+        """
+        Get key used for signing new tokens.
+
+        Args:
+            now (Optional[float], optional): epoch seconds, current time
+                if not provided
+
+        Returns:
+            Optional[KeyringKey]: newest valid signing key, None if none
+        """
+        now = time.time() if now is None else now
+        for key in self._signing:
+            if key.not_before <= now:
+                return key
+        return None
+
+    def sign(self, claims: Dict) -> str:
+        """
+        Sign claims with active key, default key if no keyring key active.
+
+        Args:
+            claims (Dict): JWT claims
+
+        Raises:
+            JWTError: if no key available for signing
+
+        Returns:
+            str: encoded JWT
+        """
+        key = self.active_key()
+        if key is not None:
+            return jwt.encode(
+                claims,
+                key.key,
+                algorithm=key.algorithm,
+                headers={"kid": key.kid},
+            )
+        if self.default_key is None:
+            raise JWTError("No JWT signing key available")
+        return jwt.encode(claims, self.default_key, algorithm=self.default_algorithm)
+
+    def verify(self, token: str) -> Dict:
+        """
+        Verify token signature with key selected by "kid" header and
+        validate its claims (expiry).
+
+        Args:
+            token (str): encoded JWT
+
+        Raises:
+            JWTError: if unknown key, invalid signature or expired token
+
+        Returns:
+            Dict: token claims
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self.default_key is None:
+                raise JWTError("Token without key id")
+            return jwt.decode(
+                token, self.default_key, algorithms=[self.default_algorithm]
+            )
+        key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown key id: {kid}")
+        return jwt.decode(token, key.verify_key, algorithms=[key.algorithm])
+
+
+keyring = Keyring(
+    path=settings.JWT_KEYRING_FILE,
+    default_secret=settings.JWT_SECRET_KEY,
+    default_algorithm=settings.JWT_ALGORITHM,
+)
+keyring_reloader = PeriodicTask(
+    name="jwt_keyring_reload",
+    interval=settings.JWT_KEYRING_RELOAD_SECONDS,
+    func=keyring.reload,
+)
@@ -0,0 +1,243 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from app.core.config import settings
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def hash_password(password: str, n: int, r: int, p: int) -> str:
+    """
+    Hash password with scrypt and random salt. CPU bound (tens of ms) -
+    not to be called on event loop, see PasswordHasher.
+
+    Args:
+        password (str): plain password
+        n (int): scrypt CPU/ memory cost, power of 2
+        r (int): scrypt block size
+        p (int): scrypt parallelization
+
+    Returns:
+        str: encoded hash "scrypt$n$r$p$salt$hash" with parameters included
+    """
+    salt = os.urandom(SALT_BYTES)
+    derived = hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * n * r * p,
+        dklen=HASH_BYTES,
+    )
+    return f"{SCHEME}${n}${r}${p}${_b64encode(salt)}${_b64encode(derived)}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """
+    Check password against encoded hash, with parameters taken from hash.
+    Passwords stored by older app versions (Fernet encrypted) supported too.
+    CPU bound - not to be called on event loop, see PasswordHasher.
+
+    Args:
+        password (str): plain password
+        encoded (str): stored password hash
+
+    Returns:
+        bool:
+            True if password matches
+            False if not
+    """
+    if not encoded.startswith(SCHEME + "$"):
+        return _verify_legacy(password=password, encrypted=encoded)
+    _, n, r, p, salt, expected = encoded.split("$")
+    n, r, p = int(n), int(r), int(p)
+    derived = hashlib.scrypt(
+        password.encode(),
+        salt=_b64decode(salt),
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * n * r * p,
+        dklen=HASH_BYTES,
+    )
+    return hmac.compare_digest(derived, _b64decode(expected))
+
+
+def decrypt_legacy_password(encrypted: str) -> Optional[str]:
+    """
+    Decrypt password stored by older app versions (Fernet encrypted field).
+
+    Args:
+        encrypted (str): stored encrypted password
+
+    Returns:
+        Optional[str]:
+            str: plain password
+            None: if not decryptable with current DB_SECRET
+    """
+    # Same key derivation as Ormar Fernet encrypted field used before.
+    key = base64.urlsafe_b64encode(
+        hashlib.sha256(settings.DB_SECRET.encode()).digest()
+    )
+    try:
+        return Fernet(key).decrypt(encrypted.encode()).decode()
+    except (InvalidToken, ValueError):
+        return None
+
+
+def _verify_legacy(password: str, encrypted: str) -> bool:
+    decrypted = decrypt_legacy_password(encrypted)
+    if decrypted is None:
+        return False
+    return hmac.compare_digest(decrypted.encode(), password.encode())
+
+
+class PasswordHasher:
+    """
+    Password hashing service running slow hash off the event loop.
+    Work done in bounded thread pool (scrypt releases GIL, so throughput
+    scales with cores), at most max_concurrency hashes at once - rest waits
+    in queue without blocking the loop.
+    """
+
+    def __init__(
+        self, n: int, r: int, p: int, max_concurrency: int
+    ) -> None:
+        """
+        Service initialization. Thread pool started lazily.
+
+        Args:
+            n (int): scrypt CPU/ memory cost for new hashes
+            r (int): scrypt block size for new hashes
+            p (int): scrypt parallelization for new hashes
+            max_concurrency (int): max hashes computed at once (pool size)
+        """
+        self.n = n
+        self.r = r
+        self.p = p
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="password_hasher",
+            )
+        if self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        started = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.wait_seconds += time.perf_counter() - started
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash password with current parameters.
+
+        Args:
+            password (str): plain password
+
+        Returns:
+            str: encoded hash to be stored
+        """
+        return await self._run(hash_password, password, self.n, self.r, self.p)
+
+    async def verify(self, password: str, encoded: str) -> bool:
+        """
+        Check password against stored hash.
+
+        Args:
+            password (str): plain password
+            encoded (str): stored password hash
+
+        Returns:
+            bool:
+                True if password matches
+                False if not
+        """
+        return await self._run(verify_password, password, encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """
+        Check if stored hash made with other than current parameters
+        (or legacy encrypted password) - to be rehashed at next login.
+
+        Args:
+            encoded (str): stored password hash
+
+        Returns:
+            bool: True if rehash needed
+        """
+        return not encoded.startswith(f"{SCHEME}${self.n}${self.r}${self.p}$")
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Service usage metrics.
+
+        Returns:
+            Dict[str, float]: hashes in flight, queue depth (current and max),
+                completed hashes and total time spent in queue
+        """
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "wait_seconds": self.wait_seconds,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stop thread pool at app shutdown.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    n=settings.PASSWORD_SCRYPT_N,
+    r=settings.PASSWORD_SCRYPT_R,
+    p=settings.PASSWORD_SCRYPT_P,
+    max_concurrency=settings.PASSWORD_HASH_WORKERS,
+)
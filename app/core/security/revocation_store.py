@@ -0,0 +1,237 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict
+
+from app.core.config import settings
+from app.core.jwt_repo import JwtRepo
+from app.core.redis_client import RespClient
+from app.core.security.revoked_filter import RevokedTokenFilter
+from app.core.security.token_digest import token_digest
+from app.core.tasks import PeriodicTask
+
+
+def _expiry_timestamp(expires_at: datetime) -> float:
+    # Token expiry kept as naive UTC datetime across the app.
+    return expires_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationStore(ABC):
+    """
+    Revoked (blacklisted) JWT storage abstract class to be inherited by all
+    backends. Token needs to be kept revoked until its expiry time only.
+
+    Args:
+        ABC: abstract helper class
+    """
+
+    async def startup(self) -> None:
+        """
+        Prepare backend at app startup.
+        """
+        pass
+
+    async def shutdown(self) -> None:
+        """
+        Release backend resources at app shutdown.
+        """
+        pass
+
+    @abstractmethod
+    async def revoke(self, token: str, expires_at: datetime) -> None:
+        """
+        Revoke token until its expiry time.
+
+        Args:
+            token (str): JWT without "Bearer" prefix
+            expires_at (datetime): token expiry time (UTC)
+        """
+        pass
+
+    @abstractmethod
+    async def is_revoked(self, token: str) -> bool:
+        """
+        Check if token is revoked.
+
+        Args:
+            token (str): JWT without "Bearer" prefix
+
+        Returns:
+            bool:
+                True if token revoked
+                False if not revoked
+        """
+        pass
+
+    async def purge_expired(self) -> int:
+        """
+        Remove revoked tokens past their expiry time.
+
+        Returns:
+            int: number of removed tokens
+        """
+        return 0
+
+
+class SqlRevocationStore(RevocationStore):
+    """
+    Revoked tokens kept in database table (JwtRepo), fronted by in-memory
+    Bloom filter so not revoked tokens are checked without database.
+    """
+
+    def __init__(self) -> None:
+        self.filter = RevokedTokenFilter(
+            capacity=settings.BLACKLIST_FILTER_CAPACITY,
+            error_rate=settings.BLACKLIST_FILTER_ERROR_RATE,
+            enabled=settings.BLACKLIST_FILTER_ENABLED,
+            max_staleness=settings.BLACKLIST_FILTER_MAX_STALENESS_SECONDS,
+        )
+        self._filter_sync = PeriodicTask(
+            name="revoked_filter_sync",
+            interval=settings.BLACKLIST_FILTER_SYNC_SECONDS,
+            func=self.filter.sync,
+        )
+
+    async def startup(self) -> None:
+        await self.filter.rebuild()
+        self._filter_sync.start()
+
+    async def shutdown(self) -> None:
+        await self._filter_sync.stop()
+        # Not synced anymore - database checked until rebuilt at startup.
+        self.filter.ready = False
+
+    async def revoke(self, token: str, expires_at: datetime) -> None:
+        await JwtRepo.add_to_database(token=token, expires_at=expires_at)
+        self.filter.add(token_digest(token))
+
+    async def is_revoked(self, token: str) -> bool:
+        if not self.filter.might_contain(token_digest(token)):
+            return False
+        return await JwtRepo.get_from_database(token=token) is not None
+
+    async def purge_expired(
+        self, batch_size: int = settings.BLACKLIST_REAP_BATCH_SIZE
+    ) -> int:
+        """
+        Delete expired rows in bounded batches to keep each statement (and
+        its locks) short.
+
+        Args:
+            batch_size (int, optional): max rows deleted by single statement
+
+        Returns:
+            int: number of deleted rows
+        """
+        reclaimed = 0
+        while True:
+            deleted = await JwtRepo.delete_expired(batch_size=batch_size)
+            reclaimed += deleted
+            if deleted < batch_size:
+                break
+            # Let other requests run between batches.
+            await asyncio.sleep(0)
+        # Bloom filter can't drop items - rebuild without reclaimed tokens.
+        if reclaimed:
+            await self.filter.rebuild()
+        return reclaimed
+
+
+class MemoryRevocationStore(RevocationStore):
+    """
+    Revoked tokens kept in process memory (dict with expiry time).
+    Not shared between app workers - for single worker deployments and tests.
+    """
+
+    def __init__(self) -> None:
+        self._revoked: Dict[str, float] = {}
+
+    async def revoke(self, token: str, expires_at: datetime) -> None:
+        self._revoked[token_digest(token)] = _expiry_timestamp(expires_at)
+
+    async def is_revoked(self, token: str) -> bool:
+        digest = token_digest(token)
+        expires_at = self._revoked.get(digest)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[digest]
+            return False
+        return True
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        expired = [
+            digest
+            for digest, expires_at in self._revoked.items()
+            if expires_at <= now
+        ]
+        for digest in expired:
+            del self._revoked[digest]
+        return len(expired)
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Revoked tokens kept in Redis protocol compatible server shared by all app
+    workers. Keys expire together with tokens, so no purge needed.
+    """
+
+    def __init__(self, client: RespClient, key_prefix: str) -> None:
+        """
+        Store initialization.
+
+        Args:
+            client (RespClient): Redis protocol client
+            key_prefix (str): prefix of revoked token keys
+        """
+        self.client = client
+        self.key_prefix = key_prefix
+
+    async def shutdown(self) -> None:
+        await self.client.close()
+
+    async def revoke(self, token: str, expires_at: datetime) -> None:
+        ttl_ms = int((_expiry_timestamp(expires_at) - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        await self.client.execute(
+            "SET", self.key_prefix + token_digest(token), 1, "PX", ttl_ms
+        )
+
+    async def is_revoked(self, token: str) -> bool:
+        exists = await self.client.execute(
+            "EXISTS", self.key_prefix + token_digest(token)
+        )
+        return exists == 1
+
+
+def create_revocation_store(backend: str) -> RevocationStore:
+    """
+    Create revocation store backend selected in settings.
+
+    Args:
+        backend (str): "sql", "memory" or "redis"
+
+    Raises:
+        ValueError: if unknown backend
+
+    Returns:
+        RevocationStore: store instance
+    """
+    if backend == "sql":
+        return SqlRevocationStore()
+    if backend == "memory":
+        return MemoryRevocationStore()
+    if backend == "redis":
+        return RedisRevocationStore(
+            client=RespClient(
+                url=settings.REDIS_URL, pool_size=settings.REDIS_POOL_SIZE
+            ),
+            key_prefix=settings.REDIS_KEY_PREFIX,
+        )
+    raise ValueError(f"Unknown revocation backend: {backend}")
+
+
+revocation_store = create_revocation_store(settings.REVOCATION_BACKEND)
@@ -0,0 +1,149 @@
+import time
+from typing import Callable, Dict, List
+
+from app.core.jwt_repo import JwtRepo
+from app.core.security.bloom_filter import BloomFilter
+
+# Ids re-read at every sync - rows committed out of id order are not missed.
+SYNC_LOOKBACK_IDS = 1000
+
+
+class RevokedTokenFilter:
+    """
+    In-memory Bloom filter of blacklisted token digests in front of database.
+    Negative answer means token surely not blacklisted (database skipped),
+    positive answer has to be confirmed by database.
+
+    Rows added by other app workers are picked up by periodic sync, until
+    then filter is not authoritative for them - see
+    BLACKLIST_FILTER_SYNC_SECONDS. Filter not synced for longer than
+    max_staleness (sync failing or stuck) is not used at all.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        enabled: bool,
+        max_staleness: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Filter initialization. Filter not ready (all answers positive)
+        until first rebuild.
+
+        Args:
+            capacity (int): min expected number of blacklisted tokens
+            error_rate (float): false positive rate at full capacity
+            enabled (bool): if False all answers positive (database always used)
+            max_staleness (float): seconds since last database read after
+                which all answers positive
+            timer (Callable[[], float], optional): monotonic clock
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.enabled = enabled
+        self.max_staleness = max_staleness
+        self.ready = False
+        self._timer = timer
+        self._synced_at = 0.0
+        self._filter = BloomFilter(capacity=capacity, error_rate=error_rate)
+        self._last_id = 0
+        # Digests added while rebuilds in progress (list per rebuild, as
+        # reaper and sync may rebuild at once), re-added to new filter.
+        self._added_in_rebuilds: List[List[str]] = []
+
+    def add(self, digest: str) -> None:
+        """
+        Add blacklisted token digest to filter.
+
+        Args:
+            digest (str): token digest
+        """
+        self._filter.add(digest)
+        for added in self._added_in_rebuilds:
+            added.append(digest)
+
+    def might_contain(self, digest: str) -> bool:
+        """
+        Check if token digest may be blacklisted.
+
+        Args:
+            digest (str): token digest
+
+        Returns:
+            bool:
+                True if token may be blacklisted - database check needed
+                False if token surely not blacklisted
+        """
+        if not (self.enabled and self.ready):
+            return True
+        if self._timer() - self._synced_at > self.max_staleness:
+            return True
+        return digest in self._filter
+
+    async def rebuild(self) -> None:
+        """
+        Build new filter from all blacklisted tokens in database, sized for
+        twice the current number of rows, and swap it in.
+        """
+        if not self.enabled:
+            return
+        added: List[str] = []
+        self._added_in_rebuilds.append(added)
+        read_at = self._timer()
+        try:
+            rows = await JwtRepo.get_digests(after_id=0)
+        finally:
+            self._added_in_rebuilds.remove(added)
+        bloom = BloomFilter(
+            capacity=max(self.capacity, 2 * len(rows)),
+            error_rate=self.error_rate,
+        )
+        last_id = 0
+        for row_id, digest in rows:
+            bloom.add(digest)
+            last_id = max(last_id, row_id)
+        for digest in added:
+            bloom.add(digest)
+        self._filter = bloom
+        self._last_id = last_id
+        self._synced_at = read_at
+        self.ready = True
+
+    async def sync(self) -> None:
+        """
+        Add tokens blacklisted since last sync (also by other app workers).
+        Filter rebuilt if grown past its capacity.
+        """
+        if not self.enabled:
+            return
+        if not self.ready:
+            await self.rebuild()
+            return
+        read_at = self._timer()
+        rows = await JwtRepo.get_digests(
+            after_id=max(0, self._last_id - SYNC_LOOKBACK_IDS)
+        )
+        for row_id, digest in rows:
+            if digest not in self._filter:
+                self._filter.add(digest)
+            self._last_id = max(self._last_id, row_id)
+        self._synced_at = read_at
+        if self._filter.count > self._filter.capacity:
+            await self.rebuild()
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Filter metrics.
+
+        Returns:
+            Dict[str, float]: items, size in bytes, hash count and estimated
+                false positive rate
+        """
+        return {
+            "items": self._filter.count,
+            "size_bytes": self._filter.size_bytes,
+            "hash_count": self._filter.hash_count,
+            "false_positive_rate": self._filter.false_positive_rate,
+        }
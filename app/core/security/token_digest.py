@@ -0,0 +1,21 @@
+import hashlib
+import hmac
+
+from app.core.config import settings
+
+
+def token_digest(token: str) -> str:
+    """
+    Deterministic keyed digest (HMAC-SHA256) of JWT.
+    Used as blacklist lookup key instead of the token itself, so the same
+    token always maps to the same indexed value and raw token is never stored.
+
+    Args:
+        token (str): JWT without "Bearer" prefix
+
+    Returns:
+        str: hex encoded digest of 64 chars
+    """
+    return hmac.new(
+        settings.DB_SECRET.encode(), token.encode(), hashlib.sha256
+    ).hexdigest()
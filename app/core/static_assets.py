@@ -0,0 +1,218 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import brotli
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Not fingerprinted URL may change content - browser revalidates by ETag.
+REVALIDATE = "no-cache"
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+
+@dataclass(frozen=True)
+class Asset:
+    """
+    Static file prepared at startup.
+
+    path - file path relative to static directory (as used in templates)
+    fingerprinted - path with content hash, e.g. css/main.1a2b3c4d5e6f7a8b.css
+    digest - content hash, base of ETags
+    media_type - content type
+    file - absolute file path
+    variants - in memory content by content encoding ("identity", "gzip",
+        "br"), empty for files too big to be kept in memory
+    """
+
+    path: str
+    fingerprinted: str
+    digest: str
+    media_type: str
+    file: str
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    def etag(self, encoding: str) -> str:
+        # Strong ETag - different for every encoded representation.
+        if encoding == "identity":
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+
+class StaticAssets:
+    """
+    ASGI app serving static files prepared once at startup.
+
+    Every file is fingerprinted (content hash in URL, see url()) and served
+    under that URL with long lived immutable cache headers. Small files kept
+    in memory together with precompressed gzip and brotli variants, so
+    requests don't touch the filesystem. Strong ETags with If-None-Match
+    (304) handling for both fingerprinted and plain URLs.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "/static",
+        memory_max_bytes: int = settings.STATIC_MEMORY_MAX_BYTES,
+    ) -> None:
+        """
+        Static assets initialization - files read by load().
+
+        Args:
+            directory (str): static files directory
+            prefix (str, optional): URL path the app is mounted at
+            memory_max_bytes (int, optional): max size of file kept in memory
+        """
+        self.directory = directory
+        self.prefix = prefix.rstrip("/")
+        self.memory_max_bytes = memory_max_bytes
+        self._assets: Dict[str, Asset] = {}
+        self._routes: Dict[str, Tuple[Asset, bool]] = {}
+
+    def load(self) -> None:
+        """
+        Read, fingerprint and compress all static files.
+        """
+        assets = {}
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+            for name in sorted(files):
+                if name.startswith("."):
+                    continue
+                file = os.path.join(root, name)
+                path = os.path.relpath(file, self.directory)
+                path = path.replace(os.sep, "/")
+                assets[path] = self._prepare(path=path, file=file)
+        self._assets = assets
+        # URL path -> (asset, fingerprinted)
+        self._routes = {path: (asset, False) for path, asset in assets.items()}
+        self._routes.update(
+            {asset.fingerprinted: (asset, True) for asset in assets.values()}
+        )
+
+    def _prepare(self, path: str, file: str) -> Asset:
+        with open(file, "rb") as static_file:
+            content = static_file.read()
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        stem, extension = os.path.splitext(path)
+        media_type = (
+            mimetypes.guess_type(path)[0] or "application/octet-stream"
+        )
+        variants = {}
+        if len(content) <= self.memory_max_bytes:
+            variants["identity"] = content
+            if media_type.startswith(COMPRESSIBLE_TYPES):
+                compressed = {
+                    "gzip": gzip.compress(content, 9, mtime=0),
+                    "br": brotli.compress(content),
+                }
+                for encoding, data in compressed.items():
+                    # Tiny files may grow when compressed.
+                    if len(data) < len(content):
+                        variants[encoding] = data
+        return Asset(
+            path=path,
+            fingerprinted=f"{stem}.{digest}{extension}",
+            digest=digest,
+            media_type=media_type,
+            file=os.path.abspath(file),
+            variants=variants,
+        )
+
+    def url(self, path: str) -> str:
+        """
+        Root relative URL of static file, fingerprinted if file known.
+        Used in templates as asset_url('css/main.css').
+
+        Args:
+            path (str): file path relative to static directory
+
+        Returns:
+            str: URL path
+        """
+        path = path.lstrip("/")
+        asset = self._assets.get(path)
+        if asset is not None:
+            path = asset.fingerprinted
+        return f"{self.prefix}/{path}"
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        response = self._response(scope)
+        await response(scope, receive, send)
+
+    def _response(self, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return PlainTextResponse("Method Not Allowed", status_code=405)
+        # Path relative to mount point - only prepared files ever served.
+        route = self._routes.get(scope["path"].lstrip("/"))
+        if route is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        asset, fingerprinted = route
+        request_headers = Headers(scope=scope)
+        encoding = self._encoding(
+            asset, request_headers.get("accept-encoding", "")
+        )
+        headers = {
+            "etag": asset.etag(encoding),
+            "cache-control": IMMUTABLE if fingerprinted else REVALIDATE,
+            "vary": "Accept-Encoding",
+        }
+        if_none_match = {
+            tag.strip()
+            for tag in request_headers.get("if-none-match", "").split(",")
+        }
+        if "*" in if_none_match or asset.etag(encoding) in if_none_match:
+            return Response(status_code=304, headers=headers)
+        if not asset.variants:
+            return FileResponse(
+                asset.file, media_type=asset.media_type, headers=headers
+            )
+        if encoding != "identity":
+            headers["content-encoding"] = encoding
+        return Response(
+            content=asset.variants[encoding],
+            media_type=asset.media_type,
+            headers=headers,
+        )
+
+    @staticmethod
+    def _encoding(asset: Asset, accept_encoding: str) -> str:
+        accepted = {
+            part.split(";")[0].strip()
+            for part in accept_encoding.lower().split(",")
+            if not part.strip().endswith(";q=0")
+        }
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in asset.variants:
+                return encoding
+        return "identity"
+
+    def get(self, path: str) -> Optional[Asset]:
+        """
+        Get prepared asset.
+
+        Args:
+            path (str): file path relative to static directory
+
+        Returns:
+            Optional[Asset]: asset or None if unknown
+        """
+        return self._assets.get(path)
+
+
+static_assets = StaticAssets(directory="app/web/static")
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Background task running coroutine function on the event loop every
+    interval seconds, started and stopped by app startup/ shutdown hooks.
+    Errors are logged and do not stop the task.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """
+        Task initialization.
+
+        Args:
+            name (str): task name used in logs
+            interval (float): seconds between runs, 0 or less disables task
+            func (Callable[[], Awaitable[Any]]): coroutine function to run
+        """
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.runs = 0
+        self.last_result: Any = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Schedule task on running event loop. No-op if disabled or running.
+        """
+        if self.interval <= 0 or self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Cancel task and wait for it to finish.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.last_result = await self.func()
+                self.runs += 1
+            except Exception:
+                logger.exception("Periodic task %s failed", self.name)
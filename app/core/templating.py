@@ -0,0 +1,62 @@
+import logging
+from typing import Optional
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+from app.core.config import settings
+from app.core.static_assets import static_assets
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = "app/web/templates/"
+
+
+def create_templates(
+    directory: str = TEMPLATES_DIR,
+    bytecode_cache_dir: Optional[str] = settings.TEMPLATES_BYTECODE_CACHE_DIR,
+    auto_reload: bool = settings.TEMPLATES_AUTO_RELOAD,
+) -> Jinja2Templates:
+    """
+    Create Jinja environment with bytecode cache shared by app workers
+    (compiled templates survive restarts) and asset_url() global.
+
+    Args:
+        directory (str, optional): templates directory
+        bytecode_cache_dir (Optional[str], optional): bytecode cache
+            directory, system temp directory if not provided
+        auto_reload (bool, optional): check templates for changes on
+            every render - development only
+
+    Returns:
+        Jinja2Templates: templates renderer
+    """
+    templates = Jinja2Templates(
+        directory=directory,
+        auto_reload=auto_reload,
+        bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir),
+    )
+    templates.env.globals["asset_url"] = static_assets.url
+    return templates
+
+
+def precompile_templates(templates: Jinja2Templates) -> int:
+    """
+    Compile (or load from bytecode cache) all templates at app startup,
+    so first requests don't pay for compilation.
+
+    Args:
+        templates (Jinja2Templates): templates renderer
+
+    Returns:
+        int: number of compiled templates
+    """
+    names = templates.env.list_templates()
+    for name in names:
+        templates.env.get_template(name)
+    logger.info("Templates precompiled: %d", len(names))
+    return len(names)
+
+
+# Single environment (and template cache) shared by all routers.
+templates = create_templates()
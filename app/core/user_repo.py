@@ -1,16 +1,100 @@
-from typing import List, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 
+import sqlalchemy
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.db import SUPPORTS_RETURNING, UNIQUE_VIOLATIONS, database
+from app.core.metrics import QueryTimer
 from app.core.model.user_model import UserModel
-from asyncpg import UniqueViolationError
-from ormar.exceptions import NoMatch
+from app.core.model.user_view import UserView
+from app.core.page_cache import page_cache
+from app.core.prepared import USE_PREPARED, PreparedQuery
+from app.core.security.password_hasher import password_hasher
+
+# Columns of UserView, also allowed in users export - password never exported.
+VIEW_COLUMNS = ("id", "username", "email", "is_active", "is_admin")
+EXPORT_COLUMNS = VIEW_COLUMNS
+# Page cache tag of pages listing users - password change doesn't affect them.
+USERS_TAG = "users"
+
+_users = UserModel.Meta.table
+# Hot queries precompiled for asyncpg (see prepared.PreparedQuery).
+GET_USER = PreparedQuery(
+    sqlalchemy.select([_users]).where(
+        _users.c.username == sqlalchemy.bindparam("username")
+    )
+)
+GET_USER_VIEW = PreparedQuery(
+    sqlalchemy.select([_users.c[name] for name in VIEW_COLUMNS]).where(
+        _users.c.username == sqlalchemy.bindparam("username")
+    )
+)
+UPDATE_PASSWORD = PreparedQuery(
+    _users.update()
+    .where(_users.c.username == sqlalchemy.bindparam("username"))
+    .values(password=sqlalchemy.bindparam("password"))
+    .returning(*_users.columns)
+)
+
+
+class UserPage(NamedTuple):
+    """
+    Single page of users ordered by id.
+    next_after is id to continue from, None if no more pages.
+    """
+
+    users: List[UserView]
+    next_after: Optional[int]
 
 
 class UserRepo:
     """
     User repository connecting with User Model in Ormar for validation.
+
+    Reads not needing password return UserView built from selected columns
+    only (no model hydration, no password decryption). User views fetched
+    by username are cached in process, cache entries are invalidated by
+    every user modification done thru the repository (together with cached
+    users listing pages).
     """
 
+    _cache = TTLCache(
+        maxsize=settings.USER_CACHE_MAXSIZE,
+        ttl=settings.USER_CACHE_TTL_SECONDS,
+    )
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """
+        Get user view cache usage counters.
+
+        Returns:
+            Dict[str, int]: size, hits, misses, evictions and expirations
+        """
+        return cls._cache.stats()
+
+    @classmethod
+    def _view_query(cls) -> sqlalchemy.sql.Select:
+        table = UserModel.Meta.table
+        return sqlalchemy.select([table.c[name] for name in VIEW_COLUMNS])
+
     @classmethod
+    def _to_view(cls, row: Any) -> UserView:
+        table = UserModel.Meta.table
+        return UserView(*(row[table.c[name]] for name in VIEW_COLUMNS))
+
+    @classmethod
+    @QueryTimer("user.get_all")
     async def get_all(cls) -> List[UserModel]:
         """
         Get all users from database.
@@ -22,11 +106,113 @@ class UserRepo:
         return users
 
     @classmethod
+    @QueryTimer("user.iter_page")
+    async def iter_page(
+        cls, after: int = 0, limit: int = settings.USER_PAGE_SIZE
+    ) -> UserPage:
+        """
+        Get page of users with id greater than given one (keyset pagination).
+        Cost does not depend on page position as primary key index used.
+
+        Args:
+            after (int, optional): id of last user from previous page
+            limit (int, optional): max number of users on page
+
+        Returns:
+            UserPage: users and id to get next page after
+        """
+        table = UserModel.Meta.table
+        rows = await database.fetch_all(
+            cls._view_query()
+            .where(table.c.id > after)
+            .order_by(table.c.id)
+            .limit(limit + 1)
+        )
+        users = [cls._to_view(row) for row in rows]
+        if len(users) > limit:
+            return UserPage(users=users[:limit], next_after=users[limit - 1].id)
+        return UserPage(users=users, next_after=None)
+
+    @classmethod
+    async def iter_all(
+        cls,
+        columns: Sequence[str] = EXPORT_COLUMNS,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all users ordered by id, selected columns only.
+        Users read in batches by primary key (keyset), so memory use does not
+        depend on number of users and no database connection or transaction
+        is held between batches - slow consumer does not block the pool.
+
+        Args:
+            columns (Sequence[str], optional): columns to be selected,
+                subset of EXPORT_COLUMNS
+            batch_size (int, optional): users read by single query
+
+        Yields:
+            Dict[str, Any]: user column values by column name
+        """
+        table = UserModel.Meta.table
+        selected = [table.c[name] for name in columns]
+        after = 0
+        while True:
+            with QueryTimer("user.iter_all"):
+                rows = await database.fetch_all(
+                    sqlalchemy.select(selected + [table.c.id.label("_after")])
+                    .where(table.c.id > after)
+                    .order_by(table.c.id)
+                    .limit(batch_size)
+                )
+            for row in rows:
+                yield {column.name: row[column] for column in selected}
+            if len(rows) < batch_size:
+                return
+            after = rows[-1]["_after"]
+
+    @classmethod
+    async def get_view_by_username(
+        cls, username: str
+    ) -> Union[UserView, None]:
+        """
+        Get user view by username from cache or database if not cached.
+
+        Args:
+            username (str): username to get user by
+
+        Returns:
+            Union[UserView, None]:
+                if user exist return UserView object
+                if not return None
+        """
+        user = cls._cache.get(username)
+        if user is not None:
+            return user
+        with QueryTimer("user.get_view_by_username"):
+            if USE_PREPARED:
+                row = await GET_USER_VIEW.fetch_one(username=username)
+                if row is None:
+                    return None
+                user = UserView(*row)
+            else:
+                table = UserModel.Meta.table
+                row = await database.fetch_one(
+                    cls._view_query().where(table.c.username == username)
+                )
+                if row is None:
+                    return None
+                user = cls._to_view(row)
+        cls._cache.set(username, user)
+        return user
+
+    @classmethod
+    @QueryTimer("user.get_by_username")
     async def get_by_username(
         cls, username: str
     ) -> Union[UserModel, None]:
         """
-        Get user from database by username.
+        Get full user (with password hash) from database by username.
+        To be used only where password is needed - login, password change.
 
         Args:
             username (str): username to get user by
@@ -36,6 +222,9 @@ class UserRepo:
                 if user exist return User object
                 if not return None
         """
+        if USE_PREPARED:
+            row = await GET_USER.fetch_one(username=username)
+            return UserModel(**dict(row)) if row is not None else None
         user = await UserModel.objects.filter(
             username=username
         ).get_or_none()
@@ -47,10 +236,12 @@ class UserRepo:
     ) -> Union[UserModel, None]:
         """
         Update user password if user exists in database.
+        Exact username match (unique index), single prepared UPDATE ...
+        RETURNING statement on Postgres, ORM update and read otherwise.
 
         Args:
             username (str): to get user from database
-            new_password (str): new pasword to be set
+            new_password (str): new pasword to be set (hashed before stored)
 
         Returns:
             Union[User, None]:
@@ -58,12 +249,24 @@ class UserRepo:
                 if not exists return None
         """
         try:
-            await UserModel.objects.filter(
-                username__contains=username
-            ).update(password=new_password)
-            updated_user = await UserModel.objects.filter(
-                username__contains=username
-            ).get()
+            new_password = await password_hasher.hash(new_password)
+            with QueryTimer("user.update_user_password"):
+                if USE_PREPARED:
+                    row = await UPDATE_PASSWORD.fetch_one(
+                        username=username, password=new_password
+                    )
+                    updated_user = (
+                        UserModel(**dict(row)) if row is not None else None
+                    )
+                else:
+                    # Updated row count not reported by every backend.
+                    await UserModel.objects.filter(
+                        username=username
+                    ).update(password=new_password)
+                    updated_user = await UserModel.objects.get_or_none(
+                        username=username
+                    )
+            cls._cache.invalidate(username)
             return updated_user
         except:
             return None
@@ -83,7 +286,7 @@ class UserRepo:
         Args:
             username (str): unique new user username
             email (str): unique new user email
-            password (str): password of min lenght of 5 chars
+            password (str): password of min lenght of 5 chars (hashed before stored)
             is_active (bool, optional): if new user is active (default True)
             is_admin (bool, optional): if new user is admin (default False)
 
@@ -95,38 +298,64 @@ class UserRepo:
         try:
             # Remove single quotes from .env file in admin pass case.
             password = password.replace("'", "")
-            user = await UserModel.objects.create(
-                username=username,
-                email=email,
-                password=password,
-                is_active=is_active,
-                is_admin=is_admin,
-            )
+            password = await password_hasher.hash(password)
+            with QueryTimer("user.add_user"):
+                user = await UserModel.objects.create(
+                    username=username,
+                    email=email,
+                    password=password,
+                    is_active=is_active,
+                    is_admin=is_admin,
+                )
+            cls._cache.invalidate(username)
+            page_cache.invalidate_tag(USERS_TAG)
             return user
-        except UniqueViolationError:
+        except UNIQUE_VIOLATIONS:
             return None
 
     @classmethod
+    @QueryTimer("user.delete_user")
     async def delete_user(cls, username: str) -> Union[bool, None]:
         """
-        Delete user from database if user exists.
+        Delete user from database if user exists and is not admin.
+        Exact username match (unique index), single DELETE ... RETURNING
+        statement where backend supports it - deleted row count not used,
+        as not every backend reports it.
 
         Args:
             username (str): to search by in database
 
         Returns:
             Union[bool, None]:
-                return User object if user existed in database and was deleted
+                return True if user existed in database and was deleted
+                return False if user is admin and wasn't deleted
                 return None if user was not found in database by username and wasn't deleted
         """
-        try:
-            user = await UserModel.objects.filter(
-                username__contains=username
-            ).first()
-            if not user.is_admin:
-                await user.delete()
-                return True
-            else:
+        table = UserModel.Meta.table
+        delete = table.delete().where(
+            sqlalchemy.and_(
+                table.c.username == username, table.c.is_admin.is_(False)
+            )
+        )
+        if SUPPORTS_RETURNING:
+            deleted = await database.fetch_one(delete.returning(table.c.id))
+            if deleted is None:
+                # Nothing deleted - either admin or no such user.
+                exists = await UserModel.objects.filter(
+                    username=username
+                ).exists()
+                return False if exists else None
+        else:
+            user = await database.fetch_one(
+                sqlalchemy.select([table.c.is_admin]).where(
+                    table.c.username == username
+                )
+            )
+            if user is None:
+                return None
+            if user["is_admin"]:
                 return False
-        except NoMatch:
-            return None
+            await database.execute(delete)
+        cls._cache.invalidate(username)
+        page_cache.invalidate_tag(USERS_TAG)
+        return True
@@ -0,0 +1,133 @@
+"""
+Load generator for running app instance.
+
+    $ python -m app.loadtest --url http://localhost:8008 --create-users \
+        --admin-password 'your_admin_user_password'
+    $ python -m app.loadtest --scenario mixed --rps 200 --duration 120 \
+        --ramp-up 30 --json report.json
+
+Load test users ("loadtest0", "loadtest1"... by default) have to exist -
+created by --create-users (logged in admin adds missing ones).
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import fields
+from typing import List, Optional
+
+import httpx
+
+from app.loadtest.runner import SCENARIOS, LoadTest, LoadTestConfig, format_report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = {item.name: item.default for item in fields(LoadTestConfig)}
+    parser = argparse.ArgumentParser(
+        prog="python -m app.loadtest",
+        description="Replay app cookie-JWT user flows at target request rate.",
+    )
+    parser.add_argument("--url", default=defaults["base_url"])
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), default=defaults["scenario"]
+    )
+    parser.add_argument(
+        "--rps", type=float, default=defaults["target_rps"],
+        help="target requests per second after ramp up",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=defaults["duration"],
+        help="seconds, ramp up included",
+    )
+    parser.add_argument(
+        "--ramp-up", type=float, default=defaults["ramp_up"],
+        help="seconds of linear rate increase",
+    )
+    parser.add_argument("--users", type=int, default=defaults["users"])
+    parser.add_argument("--user-prefix", default=defaults["user_prefix"])
+    parser.add_argument("--password", default=defaults["password"])
+    parser.add_argument(
+        "--max-in-flight", type=int, default=defaults["max_in_flight"]
+    )
+    parser.add_argument("--timeout", type=float, default=defaults["timeout"])
+    parser.add_argument("--cookie-name", default=defaults["cookie_name"])
+    parser.add_argument("--seed", type=int, default=defaults["seed"])
+    parser.add_argument("--json", help="write report to JSON file")
+    parser.add_argument(
+        "--create-users", action="store_true",
+        help="add missing load test users (admin login) and exit",
+    )
+    parser.add_argument("--admin-username", default="admin")
+    parser.add_argument("--admin-password")
+    return parser.parse_args(argv)
+
+
+async def create_users(args: argparse.Namespace) -> int:
+    """
+    Log in as admin and add load test users. Existing users left as they
+    are (app refuses to add them).
+
+    Args:
+        args (argparse.Namespace): parsed command line
+
+    Returns:
+        int: exit code
+    """
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=args.timeout
+    ) as client:
+        response = await client.post(
+            "/login",
+            data={
+                "username": args.admin_username,
+                "password": args.admin_password,
+            },
+        )
+        if args.cookie_name not in response.cookies:
+            print("Admin login failed", file=sys.stderr)
+            return 1
+        for number in range(args.users):
+            username = f"{args.user_prefix}{number}"
+            await client.post(
+                "/user/add",
+                data={
+                    "username": username,
+                    "email": f"{username}@localhost",
+                    "password": args.password,
+                },
+            )
+    print(f"Load test users ready: {args.users}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.create_users:
+        if not args.admin_password:
+            print("--admin-password required", file=sys.stderr)
+            return 2
+        return asyncio.run(create_users(args))
+    config = LoadTestConfig(
+        base_url=args.url,
+        scenario=args.scenario,
+        target_rps=args.rps,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        users=args.users,
+        user_prefix=args.user_prefix,
+        password=args.password,
+        max_in_flight=args.max_in_flight,
+        timeout=args.timeout,
+        cookie_name=args.cookie_name,
+        seed=args.seed,
+    )
+    report = asyncio.run(LoadTest(config).run())
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
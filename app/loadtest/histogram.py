@@ -0,0 +1,110 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+# Percentiles reported by default, same as HdrHistogram summary.
+REPORTED_PERCENTILES = (50.0, 75.0, 90.0, 99.0, 99.9, 99.99, 100.0)
+
+
+class LatencyHistogram:
+    """
+    HdrHistogram style latency histogram: values (microseconds) counted in
+    log-linear buckets - every power of 2 range split into same number of
+    sub-buckets, so relative error is bounded (1 / sub_buckets) whatever
+    the value, with memory depending on value range only, not on number of
+    recorded values.
+    """
+
+    def __init__(self, significant_bits: int = 7) -> None:
+        """
+        Histogram initialization.
+
+        Args:
+            significant_bits (int, optional): bits of value kept exactly,
+                7 - 128 sub-buckets, below 1% error
+        """
+        self.significant_bits = significant_bits
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.significant_bits)
+        return (shift << self.significant_bits) + (value >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        shift, sub_bucket = divmod(index, 1 << self.significant_bits)
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """
+        Record single latency.
+
+        Args:
+            seconds (float): latency
+        """
+        value = max(0, int(seconds * 1e6))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add values recorded by other histogram of same precision.
+
+        Args:
+            other (LatencyHistogram): histogram to be added
+        """
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Get value at percentile.
+
+        Args:
+            percentile (float): 0 - 100
+
+        Returns:
+            float: latency in seconds (highest value of its bucket, never
+                above recorded max), 0 if nothing recorded
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, round(percentile / 100 * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max) / 1e6
+        return self.max / 1e6
+
+    def percentiles(
+        self, percentiles: Iterable[float] = REPORTED_PERCENTILES
+    ) -> Tuple[Tuple[float, float], ...]:
+        """
+        Get values at several percentiles.
+
+        Args:
+            percentiles (Iterable[float], optional): 0 - 100 each
+
+        Returns:
+            Tuple[Tuple[float, float], ...]: (percentile, seconds) pairs
+        """
+        return tuple((p, self.percentile(p)) for p in percentiles)
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean latency in seconds, 0 if nothing recorded.
+        """
+        return self.total / self.count / 1e6 if self.count else 0.0
@@ -0,0 +1,375 @@
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.loadtest.histogram import LatencyHistogram
+
+# Share of requests by action in every scenario. Actions needing logged in
+# session log in first if no session available.
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "mixed": {"login": 10, "browse": 70, "update": 5, "logout": 15},
+    "login-burst": {"login": 100},
+    "browse": {"browse": 100},
+    "password-update": {"update": 100},
+    # Every logout blacklists its token - grows blacklisted_jwt table.
+    "logout-storm": {"logout": 100},
+}
+
+
+@dataclass(frozen=True)
+class LoadTestConfig:
+    """
+    Load test parameters.
+
+    base_url - URL of running app instance
+    scenario - one of SCENARIOS
+    target_rps - requests per second after ramp up
+    duration - seconds of sending requests (ramp up included)
+    ramp_up - seconds of linear increase from 0 to target_rps
+    users - number of existing users "<user_prefix><number>" to log in as
+    user_prefix - username prefix of load test users
+    password - password of all load test users
+    max_in_flight - max requests at once (max connections too)
+    timeout - request timeout in seconds
+    max_sessions - max logged in sessions kept for reuse
+    cookie_name - authorization cookie name (COOKIE_NAME app setting)
+    seed - random seed, same seed gives same sequence of requests
+    """
+
+    base_url: str = "http://localhost:8008"
+    scenario: str = "mixed"
+    target_rps: float = 50.0
+    duration: float = 60.0
+    ramp_up: float = 10.0
+    users: int = 100
+    user_prefix: str = "loadtest"
+    password: str = "loadtest"
+    max_in_flight: int = 100
+    timeout: float = 30.0
+    max_sessions: int = 1000
+    cookie_name: str = "access_token"
+    seed: int = 1
+
+
+def scheduled_offset(number: int, target_rps: float, ramp_up: float) -> float:
+    """
+    Start time of request with given number, relative to test start.
+    Rate grows linearly from 0 to target_rps during ramp up, then constant.
+
+    Args:
+        number (int): request number from 0
+        target_rps (float): requests per second after ramp up
+        ramp_up (float): ramp up seconds
+
+    Returns:
+        float: seconds since test start
+    """
+    ramp_requests = target_rps * ramp_up / 2
+    if number < ramp_requests:
+        return math.sqrt(2 * ramp_up * number / target_rps)
+    return ramp_up + (number - ramp_requests) / target_rps
+
+
+@dataclass
+class ActionStats:
+    """
+    Results of single action.
+
+    latency - from scheduled start, includes waiting for free slot (no
+        coordinated omission - slow server can't hide its queueing)
+    service - from actual send to response
+    """
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class Session:
+    username: str
+    cookie: str
+
+
+class LoadTest:
+    """
+    Open model load generator replaying app cookie-JWT flows: requests
+    started on schedule (see scheduled_offset) whatever the response time,
+    over pool of max_in_flight keep-alive connections. Logged in sessions (authorization
+    cookies) created by login action are reused by other actions.
+    """
+
+    def __init__(
+        self,
+        config: LoadTestConfig,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """
+        Load test initialization.
+
+        Args:
+            config (LoadTestConfig): test parameters
+            client (Optional[httpx.AsyncClient], optional): client to send
+                requests with, pooled client to config.base_url if not
+                provided
+
+        Raises:
+            ValueError: if unknown scenario
+        """
+        if config.scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {config.scenario}")
+        self.config = config
+        self.client = client
+        self.stats: Dict[str, ActionStats] = {}
+        self.sessions: List[Session] = []
+        self._random = random.Random(config.seed)
+        self._actions: Dict[
+            str, Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+        ] = {
+            "login": self.login,
+            "browse": self.browse,
+            "update": self.update,
+            "logout": self.logout,
+        }
+
+    def _username(self) -> str:
+        number = self._random.randrange(self.config.users)
+        return f"{self.config.user_prefix}{number}"
+
+    def _headers(self, session: Session) -> Dict[str, str]:
+        return {"cookie": f'{self.config.cookie_name}="{session.cookie}"'}
+
+    async def login(self, client: httpx.AsyncClient) -> httpx.Response:
+        username = self._username()
+        response = await client.post(
+            "/login",
+            data={"username": username, "password": self.config.password},
+        )
+        cookie = response.cookies.get(self.config.cookie_name)
+        if cookie is not None:
+            self.sessions.append(
+                Session(username=username, cookie=cookie.strip('"'))
+            )
+            if len(self.sessions) > self.config.max_sessions:
+                self.sessions.pop(0)
+        return response
+
+    async def browse(self, client: httpx.AsyncClient) -> httpx.Response:
+        headers = self._headers(self._random.choice(self.sessions))
+        page = self._random.randrange(4)
+        if page == 0:
+            return await client.get("/user", headers=headers)
+        if page == 1:
+            after = self._random.randrange(self.config.users)
+            return await client.get(
+                f"/user/get/all?after={after}", headers=headers
+            )
+        if page == 2:
+            return await client.post(
+                "/user/get/",
+                data={"username": self._username()},
+                headers=headers,
+            )
+        return await client.get("/login", headers=headers)
+
+    async def update(self, client: httpx.AsyncClient) -> httpx.Response:
+        session = self._random.choice(self.sessions)
+        # Same password set again - next runs log in with it as well.
+        return await client.post(
+            "/user/update",
+            data={
+                "username": session.username,
+                "old_password": self.config.password,
+                "new_password": self.config.password,
+            },
+            headers=self._headers(session),
+        )
+
+    async def logout(self, client: httpx.AsyncClient) -> httpx.Response:
+        session = self.sessions.pop(self._random.randrange(len(self.sessions)))
+        return await client.get("/logout", headers=self._headers(session))
+
+    def _choose(self) -> str:
+        weights = SCENARIOS[self.config.scenario]
+        action = self._random.choices(
+            list(weights), weights=list(weights.values())
+        )[0]
+        if action != "login" and not self.sessions:
+            return "login"
+        return action
+
+    async def _execute(
+        self, client: httpx.AsyncClient, scheduled: float
+    ) -> None:
+        action = self._choose()
+        stats = self.stats.setdefault(action, ActionStats())
+        started = time.perf_counter()
+        try:
+            response = await self._actions[action](client)
+        # Any failure counted - single request never stops the test.
+        except Exception as error:
+            stats.errors[type(error).__name__] += 1
+            return
+        finished = time.perf_counter()
+        stats.latency.record(finished - scheduled)
+        stats.service.record(finished - started)
+        stats.statuses[response.status_code] += 1
+
+    async def run(self) -> Dict:
+        """
+        Send requests on schedule for configured duration, then wait for
+        requests in flight.
+
+        Returns:
+            Dict: report (see report())
+        """
+        if self.client is not None:
+            return await self._run([self.client] * self.config.max_in_flight)
+        # Pool of single connection clients, each sending one request at
+        # a time - shared httpx pool (httpcore 0.16) breaks under concurrent
+        # request start and response close.
+        limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+        clients = [
+            httpx.AsyncClient(
+                base_url=self.config.base_url,
+                limits=limits,
+                timeout=self.config.timeout,
+            )
+            for _ in range(self.config.max_in_flight)
+        ]
+        try:
+            return await self._run(clients)
+        finally:
+            await asyncio.gather(*(client.aclose() for client in clients))
+
+    async def _run(self, clients: List[httpx.AsyncClient]) -> Dict:
+        # Connections opened on first use - as many as requests at once.
+        idle: "asyncio.Queue[httpx.AsyncClient]" = asyncio.Queue()
+        for client in clients:
+            idle.put_nowait(client)
+        tasks = set()
+        started = time.perf_counter()
+        number = 0
+        while True:
+            offset = scheduled_offset(
+                number, self.config.target_rps, self.config.ramp_up
+            )
+            if offset >= self.config.duration:
+                break
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            client = await idle.get()
+            task = asyncio.create_task(self._execute(client, started + offset))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            task.add_done_callback(
+                lambda _, client=client: idle.put_nowait(client)
+            )
+            number += 1
+        if tasks:
+            await asyncio.gather(*tasks)
+        return self.report(elapsed=time.perf_counter() - started)
+
+    def report(self, elapsed: float) -> Dict:
+        """
+        Test results.
+
+        Args:
+            elapsed (float): test duration in seconds
+
+        Returns:
+            Dict: config, requests sent, achieved rate and per action status
+                counts, errors (no response) and latency percentiles
+                (milliseconds) of answered requests
+        """
+
+        def summary(histogram: LatencyHistogram) -> Dict[str, float]:
+            result = {"mean": histogram.mean * 1000}
+            for percentile, seconds in histogram.percentiles():
+                result[f"p{percentile:g}"] = seconds * 1000
+            return result
+
+        total = LatencyHistogram()
+        actions = {}
+        requests = errors = 0
+        for name, stats in sorted(self.stats.items()):
+            total.merge(stats.latency)
+            failed = sum(stats.errors.values())
+            requests += stats.latency.count + failed
+            errors += failed
+            actions[name] = {
+                "requests": stats.latency.count + failed,
+                "statuses": {
+                    str(code): count for code, count in stats.statuses.items()
+                },
+                "errors": dict(stats.errors),
+                "latency_ms": summary(stats.latency),
+                "service_ms": summary(stats.service),
+            }
+        return {
+            "config": asdict(self.config),
+            "elapsed_seconds": elapsed,
+            "requests": requests,
+            "errors": errors,
+            "achieved_rps": requests / elapsed if elapsed else 0.0,
+            "latency_ms": summary(total),
+            "actions": actions,
+        }
+
+
+def format_report(report: Dict) -> str:
+    """
+    Report as text table.
+
+    Args:
+        report (Dict): LoadTest.run() result
+
+    Returns:
+        str: human readable report
+    """
+    config = report["config"]
+    lines = [
+        f"Scenario {config['scenario']}: {report['requests']} requests in "
+        f"{report['elapsed_seconds']:.1f} s, {report['achieved_rps']:.1f} "
+        f"req/s (target {config['target_rps']:g}), {report['errors']} errors",
+        "",
+    ]
+    columns: Tuple[str, ...] = tuple(report["latency_ms"])
+    lines.append(
+        f"{'action':<10}{'requests':>10}"
+        + "".join(f"{column:>10}" for column in columns)
+        + "  statuses"
+    )
+    rows = list(report["actions"].items())
+    rows.append(
+        (
+            "all",
+            {
+                "requests": report["requests"],
+                "latency_ms": report["latency_ms"],
+                "statuses": {},
+            },
+        )
+    )
+    for name, action in rows:
+        statuses = ", ".join(
+            f"{code}: {count}" for code, count in action["statuses"].items()
+        )
+        lines.append(
+            f"{name:<10}{action['requests']:>10}"
+            + "".join(
+                f"{action['latency_ms'][column]:>10.1f}" for column in columns
+            )
+            + f"  {statuses}"
+        )
+    lines.append("")
+    lines.append("Latency in ms from scheduled request start.")
+    return "\n".join(lines)
@@ -1,10 +1,24 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
+from app.api.routers.route_admin import admin_router
 from app.api.routers.route_login import login_router
+from app.api.routers.route_metrics import metrics_router
 from app.api.routers.route_root import root_router
 from app.api.routers.route_user import user_router
-from app.core.db import database, engine, metadata
+from app.core.db import database, db_pool
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import registry
+from app.core.metrics_middleware import MetricsMiddleware
+from app.core.page_cache import page_cache
+from app.core.profiler_middleware import RequestProfilerMiddleware
+from app.core.schema import verify_schema_version
+from app.core.static_assets import static_assets
+from app.core.templating import precompile_templates, templates
+from app.core.security.blacklist_reaper import blacklist_reaper
+from app.core.security.jwt_handler import claims_cache_stats
+from app.core.security.keyring import keyring_reloader
+from app.core.security.password_hasher import password_hasher
+from app.core.security.revocation_store import revocation_store
 from app.core.user_repo import UserRepo
 from app.core.config import settings
 
@@ -19,10 +33,8 @@ def include_description():
         The API returns Jinja generated templates in response.
         Authentication and authorization layers implemented thru JWT token returned inside cookies.
 
-        At first app run user can log into as admin (see users/get/all endpoint for log in details) to add more users and 
-        try out restrictions in user modification in regard to privilege level (admin/ non-admin user).
-
-        Passwords and login data shown intentionally to make log in/ user swap easier.
+        At first app run user can log into as admin (username "admin", password from ADMIN_PASSWORD in .env) to add more
+        users and try out restrictions in user modification in regard to privilege level (admin/ non-admin user).
         """
     return description
 
@@ -37,26 +49,61 @@ def include_router(app: FastAPI) -> None:
     app.include_router(router=user_router)
     app.include_router(router=root_router)
     app.include_router(router=login_router)
+    app.include_router(router=metrics_router)
+    app.include_router(router=admin_router)
 
 
 def configure_static(app: FastAPI) -> None:
     """
     Add static files folder as path to website.
+    Files fingerprinted and compressed once here, templates link them
+    with asset_url().
 
     Args:
         app (FastAPI): instance
     """
-    app.mount(
-        "/static",
-        StaticFiles(directory="app/web/static"),
-        name="static",
-    )
+    static_assets.load()
+    app.mount("/static", static_assets, name="static")
+
+
+def configure_metrics(app: FastAPI) -> None:
+    """
+    Record every request in metrics registry and register usage collectors
+    exported by /metrics.
+
+    Args:
+        app (FastAPI): instance
+    """
+    app.add_middleware(MetricsMiddleware)
+    registry.register_collector("user_cache", UserRepo.cache_stats)
+    registry.register_collector("jwt_claims_cache", claims_cache_stats)
+    registry.register_collector("page_cache", page_cache.stats)
+    registry.register_collector("password_hasher", password_hasher.metrics)
+    registry.register_collector("db_pool", db_pool.metrics)
+    registry.register_collector("event_loop", loop_monitor.metrics)
+    # Bloom filter used by sql revocation backend only.
+    revoked_filter = getattr(revocation_store, "filter", None)
+    if revoked_filter is not None:
+        registry.register_collector("revoked_filter", revoked_filter.metrics)
+
+
+def configure_profiler(app: FastAPI) -> None:
+    """
+    Add per request profiling if enabled - otherwise profiler costs nothing
+    until admin requests worker profile.
+
+    Args:
+        app (FastAPI): instance
+    """
+    if settings.PROFILER_REQUEST_ENABLED:
+        app.add_middleware(RequestProfilerMiddleware)
 
 
 def start_application() -> FastAPI:
     """
-    Start the app and include routers, static folder, created DB and instance of
-    FastAPI itself.
+    Start the app and include routers, static folder and instance of
+    FastAPI itself. No database access here - schema created by migrations
+    (app.core.migrate) and verified at startup.
 
     Returns:
         FastAPI: runnable instance
@@ -66,7 +113,8 @@ def start_application() -> FastAPI:
     )
     include_router(app)
     configure_static(app)
-    metadata.create_all(engine)
+    configure_profiler(app)
+    configure_metrics(app)
     return app
 
 
@@ -76,12 +124,16 @@ app = start_application()
 @app.on_event("startup")
 async def startup() -> None:
     """
-    Connect to database at app startup and add default admin user to satabse
-    if not exist.
+    Connect to database at app startup, verify schema version and add
+    default admin user to satabse if not exist. Background tasks started here.
+    Templates compiled before first request.
     """
+    precompile_templates(templates)
     if not database.is_connected:
         await database.connect()
-    admin_exist = await UserRepo.get_by_username(username="admin")
+        db_pool.install(database)
+    await verify_schema_version()
+    admin_exist = await UserRepo.get_view_by_username(username="admin")
     if admin_exist is None:
         await UserRepo.add_user(
             username="admin",
@@ -90,12 +142,22 @@ async def startup() -> None:
             is_active=True,
             is_admin=True,
         )
+    await revocation_store.startup()
+    blacklist_reaper.start()
+    keyring_reloader.start()
+    loop_monitor.start()
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
     """
     Close databse connection at app/ website closing.
+    Background tasks stopped before.
     """
+    await blacklist_reaper.stop()
+    await keyring_reloader.stop()
+    await loop_monitor.stop()
+    await revocation_store.shutdown()
+    password_hasher.shutdown()
     if database.is_connected:
         await database.disconnect()
@@ -0,0 +1,59 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.routers.route_admin as router
+from app.core.model.user_view import UserView
+from app.core.profiler import Profile, SamplingProfiler
+from app.core.security.auth_context import AuthContext, get_auth_context
+
+
+def as_user(is_admin: bool) -> AuthContext:
+    return AuthContext(
+        token="token",
+        user=UserView(
+            id=1,
+            username="tester",
+            email="tester@localhost",
+            is_active=True,
+            is_admin=is_admin,
+        ),
+    )
+
+
+@pytest.fixture
+def setup(setup_app: FastAPI, setup_client: TestClient, monkeypatch):
+    profiler = SamplingProfiler(interval=0.001, max_seconds=0.05, keep_requests=5)
+    monkeypatch.setattr(router, "profiler", profiler)
+    setup_app.include_router(router=router.admin_router)
+    setup_app.dependency_overrides[get_auth_context] = lambda: as_user(True)
+    yield setup_client
+
+
+def test_if_worker_profile_collapsed(setup: TestClient):
+    response = setup.get("/admin/profile?seconds=10")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    line = response.text.splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_if_worker_profile_speedscope(setup: TestClient):
+    response = setup.get("/admin/profile?format=speedscope")
+    assert response.status_code == 200
+    assert response.json()["profiles"][0]["type"] == "sampled"
+
+
+def test_if_profile_forbidden_for_non_admin(
+    setup: TestClient, setup_app: FastAPI
+):
+    setup_app.dependency_overrides[get_auth_context] = lambda: as_user(False)
+    assert setup.get("/admin/profile").status_code == 403
+    assert setup.get("/admin/profile/requests/1").status_code == 403
+
+
+def test_if_request_profile_returned(setup: TestClient):
+    profile_id = router.profiler.reserve_id()
+    router.profiler.keep(profile_id, Profile(interval=0.001))
+    assert setup.get(f"/admin/profile/requests/{profile_id}").status_code == 200
+    assert setup.get("/admin/profile/requests/missing").status_code == 404
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+import sqlalchemy
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.routers.route_login as router
+from app.core.config import settings
+from app.core.db import database, metadata
+from app.core.model.user_model import UserModel
+from app.core.security.password_hasher import hash_password, password_hasher
+
+
+@pytest.fixture
+def setup(setup_app: FastAPI, sqlite_db: str, monkeypatch):
+    engine = sqlalchemy.create_engine(str(database.url))
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    # Current hash parameters - no rehash (extra query) at login.
+    password = hash_password(
+        "password", n=password_hasher.n, r=password_hasher.r, p=password_hasher.p
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            UserModel.Meta.table.insert().values(
+                username="tester",
+                email="tester@localhost",
+                password=password,
+                is_active=True,
+                is_admin=False,
+            )
+        )
+    engine.dispose()
+    queries = []
+
+    def record(method):
+        async def recorded(query, *args, **kwargs):
+            queries.append(str(query))
+            return await method(query, *args, **kwargs)
+
+        return recorded
+
+    for name in ("execute", "fetch_one", "fetch_all", "fetch_val"):
+        monkeypatch.setattr(database, name, record(getattr(database, name)))
+    setup_app.add_event_handler("startup", database.connect)
+    setup_app.add_event_handler("shutdown", database.disconnect)
+    setup_app.include_router(router=router.login_router)
+    with TestClient(setup_app) as client:
+        yield client, queries
+    os.remove(sqlite_db)
+
+
+def test_if_login_queries_user_once(setup):
+    client, queries = setup
+    response = client.post(
+        "/login",
+        data={"username": "tester", "password": "password"},
+        allow_redirects=False,
+    )
+    assert response.status_code == 302
+    assert response.cookies[settings.COOKIE_NAME].startswith('"Bearer ')
+    # Token issued for already fetched user - before: 2 user queries.
+    assert len(queries) == 1
+    assert "FROM users" in queries[0]
+
+
+def test_if_token_issued_for_valid_password_only(setup):
+    client, queries = setup
+    response = client.post(
+        "/token", data={"username": "tester", "password": "password"}
+    )
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+    assert len(queries) == 1
+    response = client.post(
+        "/token", data={"username": "tester", "password": "wrong_password"}
+    )
+    assert response.status_code == 401
+    response = client.post(
+        "/token", data={"username": "nobody", "password": "password"}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,20 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.routers.route_metrics as router
+
+
+@pytest.fixture
+def setup(setup_app: FastAPI, setup_client: TestClient):
+    setup_app.include_router(router=router.metrics_router)
+    yield setup_client
+
+
+def test_if_metrics_returned_in_prometheus_format(setup: TestClient):
+    response = setup.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(
+        "text/plain; version=0.0.4"
+    )
+    assert "# TYPE app_http_requests_total counter" in response.text
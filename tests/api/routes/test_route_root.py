@@ -4,11 +4,14 @@ from fastapi.templating import Jinja2Templates
 from fastapi.testclient import TestClient
 
 import app.api.routers.route_root as router
+from app.core.page_cache import page_cache
 
 
 @pytest.fixture
 def setup(setup_app: FastAPI, setup_client: TestClient):
     router.templates = Jinja2Templates(directory="tests/api/templates/")
+    # Page rendered from other templates may be cached already.
+    page_cache.clear()
     setup_app.include_router(router=router.root_router)
     yield setup_client
 
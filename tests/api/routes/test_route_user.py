@@ -0,0 +1,71 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.routers.route_user as router
+from app.core.model.user_view import UserView
+from app.core.security.auth_context import AuthContext, get_auth_context
+
+USERS = [
+    {"id": i, "username": f"user{i}", "email": f"user{i}@localhost",
+     "is_active": True, "is_admin": False}
+    for i in range(1, 1201)
+]
+
+
+def as_user(is_admin: bool) -> AuthContext:
+    return AuthContext(
+        token="token",
+        user=UserView(
+            id=1,
+            username="tester",
+            email="tester@localhost",
+            is_active=True,
+            is_admin=is_admin,
+        ),
+    )
+
+
+@pytest.fixture
+def setup(setup_app: FastAPI, setup_client: TestClient, monkeypatch):
+    async def iter_all(columns):
+        for user in USERS:
+            yield {column: user[column] for column in columns}
+
+    monkeypatch.setattr(router.UserRepo, "iter_all", iter_all)
+    setup_app.include_router(router=router.user_router)
+    setup_app.dependency_overrides[get_auth_context] = lambda: as_user(True)
+    yield setup_client
+
+
+def test_if_export_streams_ndjson(setup: TestClient):
+    response = setup.get("/user/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == len(USERS)
+    assert lines[0] == (
+        '{"id": 1, "username": "user1", "email": "user1@localhost", '
+        '"is_active": true, "is_admin": false}'
+    )
+
+
+def test_if_export_streams_projected_csv(setup: TestClient):
+    response = setup.get("/user/export?format=csv&fields=id,email")
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[:2] == ["id,email", "1,user1@localhost"]
+    assert len(lines) == len(USERS) + 1
+
+
+def test_if_export_rejects_unknown_field(setup: TestClient):
+    response = setup.get("/user/export?fields=id,password")
+    assert response.status_code == 400
+
+
+def test_if_export_forbidden_for_non_admin(
+    setup: TestClient, setup_app: FastAPI
+):
+    setup_app.dependency_overrides[get_auth_context] = lambda: as_user(False)
+    response = setup.get("/user/export")
+    assert response.status_code == 403
@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+# Benchmarks take minutes - run on request only (RUN_BENCHMARKS=1).
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS") == "1"
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip = pytest.mark.skip(reason="benchmark - set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if "tests/benchmarks/" in item.nodeid:
+            item.add_marker(skip)
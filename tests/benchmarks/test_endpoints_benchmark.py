@@ -0,0 +1,238 @@
+"""
+End to end benchmark of auth and user endpoints.
+
+Real app (app.main.app) driven in process thru httpx ASGI transport against
+database seeded with BENCHMARK_USERS users and BENCHMARK_REVOKED revoked
+tokens. Throughput and latency percentiles of every scenario written to JSON
+(BENCHMARK_OUTPUT), together with commit and environment, so runs can be
+compared between commits:
+
+    RUN_BENCHMARKS=1 BENCHMARK_OUTPUT=bench-$(git rev-parse --short HEAD).json \
+        python -m pytest -s tests/benchmarks/test_endpoints_benchmark.py
+
+Database is the one from TEST_DATABASE_URL - SQLite file (default for tests)
+recreated, Postgres database must be empty.
+"""
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.core.config import settings
+from app.core.db import database, db_pool
+from app.core.migrate import migrate
+from app.core.model.jwt_model import JwtModel
+from app.core.model.user_model import UserModel
+from app.core.page_cache import page_cache
+from app.core.security.jwt_handler import create_access_token
+from app.core.security.password_hasher import hash_password, password_hasher
+from app.core.user_repo import UserRepo
+from app.main import app
+
+USERS = int(os.getenv("BENCHMARK_USERS", "200"))
+REVOKED = int(os.getenv("BENCHMARK_REVOKED", "1000"))
+REQUESTS = int(os.getenv("BENCHMARK_REQUESTS", "50"))
+CONCURRENCY = int(os.getenv("BENCHMARK_CONCURRENCY", "10"))
+OUTPUT = os.getenv("BENCHMARK_OUTPUT")
+SEED = 1234
+PASSWORD = "password"
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    ordered = sorted(latencies)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summary(latencies: List[float], seconds: float) -> Dict[str, float]:
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / seconds,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def cookie(username: str, number: int) -> Dict[str, str]:
+    # Number keeps tokens unique - same claims in same second give same JWT.
+    token = create_access_token(data={"username": username, "n": number})
+    return {"cookie": f'{settings.COOKIE_NAME}="Bearer {token}"'}
+
+
+async def seed() -> None:
+    """
+    Create schema and insert users (all with same password, hashed once
+    with current parameters) and not yet expired revoked tokens.
+    """
+    await migrate()
+    password = hash_password(
+        PASSWORD, n=password_hasher.n, r=password_hasher.r, p=password_hasher.p
+    )
+    await database.execute_many(
+        UserModel.Meta.table.insert(),
+        [
+            {
+                "username": f"user{number}",
+                "email": f"user{number}@localhost",
+                "password": password,
+                "is_active": True,
+                "is_admin": False,
+            }
+            for number in range(USERS)
+        ],
+    )
+    expires_at = datetime.utcnow() + timedelta(hours=1)
+    await database.execute_many(
+        JwtModel.Meta.table.insert(),
+        [
+            {"token_digest": f"{number:064x}", "expires_at": expires_at}
+            for number in range(REVOKED)
+        ],
+    )
+
+
+async def run_scenario(
+    request: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+    client: httpx.AsyncClient,
+    expected_status: int,
+) -> Dict[str, float]:
+    """
+    Send REQUESTS requests, CONCURRENCY at once.
+    """
+    slots = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def send(number: int) -> None:
+        async with slots:
+            started = time.perf_counter()
+            response = await request(client, number)
+            latencies.append(time.perf_counter() - started)
+        assert response.status_code == expected_status, response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send(number) for number in range(REQUESTS)))
+    return summary(latencies, time.perf_counter() - started)
+
+
+def scenarios() -> Dict:
+    users = random.Random(SEED)
+
+    def username() -> str:
+        return f"user{users.randrange(USERS)}"
+
+    async def login(client, number):
+        return await client.post(
+            "/login", data={"username": username(), "password": PASSWORD}
+        )
+
+    async def get_all(client, number):
+        after = users.randrange(USERS)
+        return await client.get(f"/user/get/all?after={after}&limit=50")
+
+    async def get_user(client, number):
+        return await client.post("/user/get/", data={"username": username()})
+
+    async def update(client, number):
+        name = username()
+        return await client.post(
+            "/user/update",
+            data={
+                "username": name,
+                "old_password": PASSWORD,
+                "new_password": PASSWORD,
+            },
+            headers=cookie(name, number),
+        )
+
+    async def logout(client, number):
+        return await client.get(
+            "/logout", headers=cookie(username(), number)
+        )
+
+    return {
+        "login": (login, 302),
+        "user_get_all": (get_all, 200),
+        "user_get": (get_user, 200),
+        "user_update": (update, 200),
+        "logout": (logout, 302),
+    }
+
+
+async def benchmark() -> Dict[str, Dict[str, float]]:
+    await database.connect()
+    db_pool.install(database)
+    await seed()
+    # Other tests may have filled in process caches from other data.
+    page_cache.clear()
+    UserRepo._cache.clear()
+    await app.router.startup()
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            for name, (request, status_code) in scenarios().items():
+                results[name] = await run_scenario(
+                    request=request, client=client, expected_status=status_code
+                )
+    finally:
+        await app.router.shutdown()
+    return results
+
+
+def test_auth_and_user_endpoints(tmp_path):
+    path = database.url.database
+    if database.url.dialect == "sqlite" and os.path.exists(path):
+        os.remove(path)
+    try:
+        results = asyncio.run(benchmark())
+    finally:
+        if database.url.dialect == "sqlite" and os.path.exists(path):
+            os.remove(path)
+    report = {
+        "commit": commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": database.url.dialect,
+        "users": USERS,
+        "revoked_tokens": REVOKED,
+        "requests": REQUESTS,
+        "concurrency": CONCURRENCY,
+        "scenarios": results,
+    }
+    output = OUTPUT or str(tmp_path / "benchmark.json")
+    with open(output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print()
+    for name, result in results.items():
+        print(
+            f"{name}: {result['throughput_rps']:.0f} req/s, "
+            f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+        )
+    print(f"Results: {output}")
+    assert set(results) == set(scenarios())
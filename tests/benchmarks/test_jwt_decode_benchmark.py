@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+from app.core.security import jwt_handler
+
+ROUNDS = 2000
+
+
+def decode_many(token: str, cached: bool) -> float:
+    async def decode_all():
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            if not cached:
+                jwt_handler._claims_cache.clear()
+            assert await jwt_handler.decode_access_token(token) is not None
+        return time.perf_counter() - started
+
+    return asyncio.run(decode_all())
+
+
+def test_jwt_decode_cost_with_and_without_cache():
+    token = jwt_handler.create_access_token(data={"username": "tester"})
+    uncached = decode_many(token, cached=False)
+    cached = decode_many(token, cached=True)
+    print(
+        f"\nJWT decode x{ROUNDS}: "
+        f"uncached {uncached / ROUNDS * 1e6:.1f} us/op, "
+        f"cached {cached / ROUNDS * 1e6:.1f} us/op, "
+        f"speedup {uncached / cached:.1f}x"
+    )
+    assert cached < uncached
@@ -0,0 +1,46 @@
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from jose import jwk
+
+from app.core.security.keyring import Keyring, parse_key
+
+ROUNDS = 500
+
+
+def keyring_with(algorithm: str, key) -> Keyring:
+    keyring = Keyring(path=None, default_secret=None)
+    if algorithm != "HS256":
+        key = jwk.construct(key, algorithm).to_pem().decode()
+    parsed = parse_key({"kid": algorithm, "alg": algorithm, "key": key})
+    keyring._keys = {parsed.kid: parsed}
+    keyring._signing = [parsed]
+    return keyring
+
+
+def ops_per_second(func) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return ROUNDS / (time.perf_counter() - started)
+
+
+def test_jwt_sign_verify_throughput():
+    keys = {
+        "HS256": "benchmark_secret",
+        "ES256": ec.generate_private_key(ec.SECP256R1()),
+        "EdDSA": Ed25519PrivateKey.generate(),
+    }
+    claims = {"username": "tester", "exp": int(time.time()) + 60}
+    print()
+    for algorithm, key in keys.items():
+        keyring = keyring_with(algorithm, key)
+        token = keyring.sign(claims)
+        sign = ops_per_second(lambda: keyring.sign(claims))
+        verify = ops_per_second(lambda: keyring.verify(token))
+        print(
+            f"{algorithm:>6}: sign {sign:8.0f} ops/s, "
+            f"verify {verify:8.0f} ops/s"
+        )
+        assert keyring.verify(token)["username"] == "tester"
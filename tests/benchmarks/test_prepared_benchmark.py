@@ -0,0 +1,60 @@
+import time
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.jwt_repo import GET_TOKEN
+from app.core.model.jwt_model import JwtModel
+from app.core.model.user_model import UserModel
+from app.core.user_repo import GET_USER
+
+ROUNDS = 2000
+# Dialect and compile options used by databases asyncpg backend.
+DIALECT = postgresql.dialect(paramstyle="pyformat")
+
+
+def per_query_us(func) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - started) / ROUNDS * 1e6
+
+
+def orm_user():
+    query = UserModel.objects.filter(username="tester").limit(2)
+    query.build_select_expression().compile(
+        dialect=DIALECT, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def orm_token():
+    query = JwtModel.objects.fields(["id", "token_digest"]).filter(
+        token_digest="0" * 64
+    )
+    query.build_select_expression().compile(
+        dialect=DIALECT, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def test_prepared_vs_orm_per_query_overhead():
+    """
+    Client side cost of single query before it reaches asyncpg.
+    """
+    results = {
+        "user by username": (
+            per_query_us(orm_user),
+            per_query_us(lambda: (GET_USER.sql, GET_USER.args(username="x"))),
+        ),
+        "blacklist probe": (
+            per_query_us(orm_token),
+            per_query_us(
+                lambda: (GET_TOKEN.sql, GET_TOKEN.args(token_digest="0"))
+            ),
+        ),
+    }
+    print()
+    for name, (orm, prepared) in results.items():
+        print(
+            f"{name}: ORM {orm:.1f} us/query, "
+            f"prepared {prepared:.2f} us/query"
+        )
+        assert prepared < orm
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import sqlalchemy
+
+from app.core.db import database, metadata
+from app.core.migrate import migrate
+from app.core.schema import verify_schema_version
+
+ROUNDS = 20
+
+
+def timed(func) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - started) / ROUNDS
+
+
+def test_startup_cost_without_import_time_ddl(sqlite_db):
+    path = sqlite_db
+    if os.path.exists(path):
+        os.remove(path)
+
+    async def connected(coroutine):
+        await database.connect()
+        try:
+            return await coroutine
+        finally:
+            await database.disconnect()
+
+    try:
+        asyncio.run(connected(migrate()))
+
+        def create_all():
+            # Previous import time schema creation (sync engine per worker).
+            engine = sqlalchemy.create_engine(str(database.url))
+            metadata.create_all(engine)
+            engine.dispose()
+
+        async def verify_many():
+            # Existing app connection reused - no extra connection stack.
+            started = time.perf_counter()
+            for _ in range(ROUNDS):
+                await verify_schema_version()
+            return (time.perf_counter() - started) / ROUNDS
+
+        before = timed(create_all)
+        after = asyncio.run(connected(verify_many()))
+    finally:
+        os.remove(path)
+    # Worker import must not touch database - unreachable one used here.
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        check=True,
+        env={**os.environ, "DATABASE_URL": "sqlite:////nonexistent/app.db"},
+    )
+    cold_import = time.perf_counter() - started
+    print(
+        f"\nSchema at startup: sync create_all {before * 1000:.2f} ms, "
+        f"async version check {after * 1000:.2f} ms; "
+        f"cold worker import {cold_import * 1000:.0f} ms"
+    )
@@ -1,7 +1,21 @@
+import os
+import tempfile
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+# App settings are read from env at import time - test values used if not set.
+# Tests recreate tables - app DATABASE_URL never used, SQLite file in
+# temporary directory unless TEST_DATABASE_URL given.
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL",
+    f"sqlite:///{tempfile.mkdtemp(prefix='app_tests_')}/test.db",
+)
+os.environ.setdefault("DB_SECRET", "test_db_secret")
+os.environ.setdefault("JWT_SECRET_KEY", "test_jwt_secret")
+os.environ.setdefault("ADMIN_PASSWORD", "test_admin_pass")
+
 
 @pytest.fixture
 def setup_app():
@@ -11,3 +25,16 @@ def setup_app():
 @pytest.fixture
 def setup_client(setup_app: FastAPI):
     yield TestClient(setup_app)
+
+
+@pytest.fixture(scope="session")
+def sqlite_db() -> str:
+    """
+    Path of SQLite test database. Tests dropping tables or removing the
+    database file skipped on any other database.
+    """
+    from app.core.db import database
+
+    if database.url.dialect != "sqlite":
+        pytest.skip("recreates database - SQLite test database only")
+    return database.url.database
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+import app.core.security.auth_context as auth_context
+from app.core.jwt_repo import JwtRepo
+from app.core.model.user_view import UserView
+from app.core.security.jwt_handler import create_access_token
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"user": 0, "blacklist": 0}
+    user = UserView(
+        id=1,
+        username="tester",
+        email="tester@localhost",
+        is_active=True,
+        is_admin=False,
+    )
+
+    async def get_view_by_username(username):
+        calls["user"] += 1
+        return user if username == user.username else None
+
+    async def get_from_database(token):
+        calls["blacklist"] += 1
+        return None
+
+    monkeypatch.setattr(
+        auth_context.UserRepo, "get_view_by_username", get_view_by_username
+    )
+    monkeypatch.setattr(JwtRepo, "get_from_database", get_from_database)
+    yield calls
+
+
+def test_if_no_token_skips_database(calls):
+    context = asyncio.run(auth_context.resolve_auth_context(token=None))
+    assert context.user is None
+    assert not context.is_authenticated
+    assert calls == {"user": 0, "blacklist": 0}
+
+
+def test_if_valid_token_resolved_with_single_lookups(calls):
+    token = create_access_token(data={"username": "tester"})
+    context = asyncio.run(auth_context.resolve_auth_context(token=token))
+    assert context.user.username == "tester"
+    assert context.claims["username"] == "tester"
+    assert context.is_authenticated
+    assert calls == {"user": 1, "blacklist": 1}
+
+
+def test_if_context_immutable(calls):
+    context = auth_context.AuthContext()
+    with pytest.raises(AttributeError):
+        context.token_blacklisted = True
@@ -0,0 +1,21 @@
+from app.core.security.bloom_filter import BloomFilter
+
+
+def test_if_added_items_always_found():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"token-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+
+def test_if_false_positive_rate_within_bound():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"token-{i}")
+    false_positives = sum(
+        f"other-{i}" in bloom for i in range(10000)
+    )
+    assert false_positives / 10000 < 0.02
+    assert bloom.false_positive_rate < 0.02
+    assert bloom.size_bytes < 2000
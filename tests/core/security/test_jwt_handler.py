@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from jose import jwt
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.security import jwt_handler
+
+
+def make_token(expires_in: timedelta) -> str:
+    return jwt.encode(
+        {"username": "tester", "exp": datetime.utcnow() + expires_in},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+
+
+def test_if_verified_claims_cached(monkeypatch):
+    jwt_handler._claims_cache.clear()
+    token = jwt_handler.create_access_token(data={"username": "tester"})
+    first = asyncio.run(jwt_handler.decode_access_token(f"Bearer {token}"))
+    # Signature not verified again on cache hit.
+    monkeypatch.setattr(jwt_handler.keyring, "verify", None)
+    second = asyncio.run(jwt_handler.decode_access_token(token))
+    assert first == second
+    assert first["username"] == "tester"
+    second["username"] = "changed"
+    assert asyncio.run(jwt_handler.decode_access_token(token)) == first
+    assert jwt_handler.claims_cache_stats()["hits"] >= 2
+
+
+def test_if_invalid_and_expired_tokens_not_cached():
+    jwt_handler._claims_cache.clear()
+    expired = make_token(expires_in=timedelta(seconds=-1))
+    assert asyncio.run(jwt_handler.decode_access_token(expired)) is None
+    assert asyncio.run(jwt_handler.decode_access_token("garbage")) is None
+    assert jwt_handler.claims_cache_stats()["size"] == 0
+
+
+def test_if_cached_claims_rejected_after_token_expiry(monkeypatch):
+    jwt_handler._claims_cache.clear()
+    token = make_token(expires_in=timedelta(minutes=1))
+    assert asyncio.run(jwt_handler.decode_access_token(token)) is not None
+    now = jwt_handler.time.time()
+    monkeypatch.setattr(jwt_handler.time, "time", lambda: now + 120)
+    assert asyncio.run(jwt_handler.decode_access_token(token)) is None
+    assert jwt_handler.claims_cache_stats()["size"] == 0
+
+
+def test_if_cookie_token_parsed_same_way_everywhere(monkeypatch):
+    token = make_token(expires_in=timedelta(minutes=5))
+    revoked, checked = [], []
+
+    async def revoke(token, expires_at):
+        revoked.append(token)
+
+    async def is_revoked(token):
+        checked.append(token)
+        return False
+
+    monkeypatch.setattr(jwt_handler.revocation_store, "revoke", revoke)
+    monkeypatch.setattr(jwt_handler.revocation_store, "is_revoked", is_revoked)
+    for cookie in (f"Bearer {token}", token):
+        request = Request(
+            {
+                "type": "http",
+                "headers": [
+                    (b"cookie", f'{settings.COOKIE_NAME}="{cookie}"'.encode())
+                ],
+            }
+        )
+        asyncio.run(jwt_handler.blacklist_token(request))
+        asyncio.run(jwt_handler.check_if_token_blacklisted(request))
+    assert revoked == [token, token]
+    assert checked == [token, token]
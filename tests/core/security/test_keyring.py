@@ -0,0 +1,104 @@
+import json
+import os
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from jose import JWTError, jwt
+
+from app.core.security.keyring import Keyring
+
+
+def private_pem(key) -> str:
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+def public_pem(key) -> str:
+    return key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+
+def write_keyring(path, entries) -> None:
+    with open(path, "w") as keyring_file:
+        json.dump({"keys": entries}, keyring_file)
+    # Make sure reload sees the change on coarse mtime filesystems.
+    mtime = time.time() + len(entries)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def keys():
+    return {
+        "ES256": ec.generate_private_key(ec.SECP256R1()),
+        "EdDSA": Ed25519PrivateKey.generate(),
+    }
+
+
+def claims() -> dict:
+    return {"username": "tester", "exp": int(time.time()) + 60}
+
+
+def test_if_token_verified_by_kid_with_public_keys_only(tmp_path, keys):
+    signer_path = tmp_path / "signer.json"
+    verifier_path = tmp_path / "verifier.json"
+    for algorithm, key in keys.items():
+        write_keyring(
+            signer_path,
+            [{"kid": algorithm, "alg": algorithm, "key": private_pem(key)}],
+        )
+        write_keyring(
+            verifier_path,
+            [{"kid": algorithm, "alg": algorithm, "key": public_pem(key)}],
+        )
+        signer = Keyring(path=str(signer_path), default_secret=None)
+        verifier = Keyring(path=str(verifier_path), default_secret=None)
+        token = signer.sign(claims())
+        assert jwt.get_unverified_header(token)["kid"] == algorithm
+        assert verifier.verify(token)["username"] == "tester"
+        assert verifier.active_key() is None
+        with pytest.raises(JWTError):
+            verifier.sign(claims())
+        with pytest.raises(JWTError):
+            verifier.verify(token[:-4] + "AAAA")
+
+
+def test_if_keys_rotated_by_not_before(tmp_path, keys):
+    path = tmp_path / "keyring.json"
+    now = time.time()
+    old = {"kid": "old", "alg": "HS256", "key": "old_secret", "not_before": 0}
+    new = {
+        "kid": "new",
+        "alg": "EdDSA",
+        "key": private_pem(keys["EdDSA"]),
+        "not_before": now + 3600,
+    }
+    write_keyring(path, [old, new])
+    keyring = Keyring(path=str(path), default_secret="default_secret")
+    assert keyring.active_key(now).kid == "old"
+    assert keyring.active_key(now + 3600).kid == "new"
+    old_token = keyring.sign(claims())
+    # Tokens issued before keyring (no kid) verified with default key.
+    legacy = jwt.encode(claims(), "default_secret", algorithm="HS256")
+    assert keyring.verify(legacy)["username"] == "tester"
+    # Old key retired - its tokens rejected after reload.
+    write_keyring(path, [new])
+    assert keyring.load() is True
+    assert keyring.load() is False
+    assert keyring.version == 2
+    with pytest.raises(JWTError):
+        keyring.verify(old_token)
+
+
+def test_if_unsupported_algorithm_rejected(tmp_path):
+    path = tmp_path / "keyring.json"
+    write_keyring(path, [{"kid": "none", "alg": "none", "key": ""}])
+    with pytest.raises(ValueError):
+        Keyring(path=str(path), default_secret=None)
@@ -0,0 +1,64 @@
+import asyncio
+import base64
+import hashlib
+
+from cryptography.fernet import Fernet
+
+from app.core.config import settings
+from app.core.security.password_hasher import (
+    PasswordHasher,
+    hash_password,
+    verify_password,
+)
+
+# Cheap parameters - tests check behaviour, not hash strength.
+N, R, P = 2**4, 8, 1
+
+
+def test_if_hash_salted_and_verified():
+    first = hash_password("secret", n=N, r=R, p=P)
+    second = hash_password("secret", n=N, r=R, p=P)
+    assert first != second
+    assert first.startswith(f"scrypt${N}${R}${P}$")
+    assert "secret" not in first
+    assert verify_password("secret", first)
+    assert not verify_password("Secret", first)
+
+
+def test_if_legacy_encrypted_password_verified_and_rehashed():
+    key = base64.urlsafe_b64encode(
+        hashlib.sha256(settings.DB_SECRET.encode()).digest()
+    )
+    legacy = Fernet(key).encrypt(b"secret").decode()
+    hasher = PasswordHasher(n=N, r=R, p=P, max_concurrency=1)
+    assert verify_password("secret", legacy)
+    assert not verify_password("other", legacy)
+    assert not verify_password("secret", "not encrypted")
+    assert hasher.needs_rehash(legacy)
+    assert hasher.needs_rehash(hash_password("secret", n=N * 2, r=R, p=P))
+    assert not hasher.needs_rehash(hash_password("secret", n=N, r=R, p=P))
+
+
+def test_if_hashing_bounded_and_off_event_loop():
+    hasher = PasswordHasher(n=N, r=R, p=P, max_concurrency=2)
+
+    async def hash_many():
+        hashes = await asyncio.gather(
+            *(hasher.hash(f"secret{i}") for i in range(8))
+        )
+        return await asyncio.gather(
+            *(hasher.verify(f"secret{i}", h) for i, h in enumerate(hashes))
+        )
+
+    try:
+        assert all(asyncio.run(hash_many()))
+        # Pool reused by next event loop (app restart, tests).
+        assert asyncio.run(hasher.verify("x", hash_password("x", N, R, P)))
+    finally:
+        hasher.shutdown()
+    metrics = hasher.metrics()
+    assert metrics["completed"] == 17
+    assert metrics["in_flight"] == 0
+    assert metrics["queued"] == 0
+    # 8 hashes at once, 2 computed while the rest waited.
+    assert metrics["max_queued"] == 6
@@ -0,0 +1,157 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy
+
+from app.core.db import database, metadata
+from app.core.jwt_repo import JwtRepo
+from app.core.model.jwt_model import JwtModel
+from app.core.redis_client import RespClient, read_reply
+from app.core.security.revocation_store import (
+    MemoryRevocationStore,
+    RedisRevocationStore,
+    SqlRevocationStore,
+    create_revocation_store,
+)
+
+
+class FakeRedisServer:
+    """
+    Local Redis protocol server supporting commands used by the store.
+    """
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.commands = []
+
+    async def handle(self, reader, writer):
+        while True:
+            try:
+                command = await read_reply(reader)
+            except ConnectionError:
+                break
+            name, *args = [part.decode() for part in command]
+            self.commands.append(name)
+            if name == "SET":
+                self.data[args[0]] = (args[1], int(args[3]))
+                writer.write(b"+OK\r\n")
+            elif name == "EXISTS":
+                writer.write(b":%d\r\n" % (args[0] in self.data))
+            else:
+                writer.write(b"-ERR unknown command\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def in_minutes(minutes: int) -> datetime:
+    return datetime.utcnow() + timedelta(minutes=minutes)
+
+
+def test_if_memory_store_revokes_until_expiry():
+    async def scenario():
+        store = MemoryRevocationStore()
+        await store.revoke(token="live", expires_at=in_minutes(5))
+        await store.revoke(token="expired", expires_at=in_minutes(-5))
+        assert await store.is_revoked(token="live")
+        assert not await store.is_revoked(token="other")
+        assert await store.purge_expired() == 1
+        assert not await store.is_revoked(token="expired")
+
+    asyncio.run(scenario())
+
+
+def test_if_redis_store_works_against_protocol_server():
+    server = FakeRedisServer()
+
+    async def scenario():
+        tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        store = RedisRevocationStore(
+            client=RespClient(url=f"redis://127.0.0.1:{port}/0"),
+            key_prefix="revoked:",
+        )
+        await store.revoke(token="live", expires_at=in_minutes(5))
+        await store.revoke(token="expired", expires_at=in_minutes(-5))
+        assert await store.is_revoked(token="live")
+        assert not await store.is_revoked(token="other")
+        await store.shutdown()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+
+    asyncio.run(scenario())
+    assert server.commands == ["SET", "EXISTS", "EXISTS"]
+    (ttl_ms,) = [ttl for _, ttl in server.data.values()]
+    assert 0 < ttl_ms <= 5 * 60 * 1000
+
+
+def test_if_sql_store_purges_in_batches(monkeypatch):
+    expired = [10]
+    batches = []
+
+    async def delete_expired(batch_size):
+        deleted = min(batch_size, expired[0])
+        expired[0] -= deleted
+        batches.append(deleted)
+        return deleted
+
+    store = SqlRevocationStore()
+
+    async def rebuild():
+        batches.append("rebuild")
+
+    monkeypatch.setattr(JwtRepo, "delete_expired", delete_expired)
+    monkeypatch.setattr(store.filter, "rebuild", rebuild)
+    reclaimed = asyncio.run(store.purge_expired(batch_size=4))
+    assert reclaimed == 10
+    assert batches == [4, 4, 2, "rebuild"]
+
+
+def test_if_sql_store_purges_batches_without_row_count(sqlite_db, monkeypatch):
+    engine = sqlalchemy.create_engine(str(database.url))
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    engine.dispose()
+    execute = database.execute
+
+    async def execute_without_count(query, *args, **kwargs):
+        # Postgres backend returns no row count for DELETE.
+        await execute(query, *args, **kwargs)
+        return None
+
+    async def scenario():
+        await database.connect()
+        try:
+            await database.execute_many(
+                JwtModel.Meta.table.insert(),
+                [
+                    {"token_digest": f"digest{i}", "expires_at": in_minutes(-1)}
+                    for i in range(10)
+                ]
+                + [{"token_digest": "valid", "expires_at": in_minutes(5)}],
+            )
+            monkeypatch.setattr(database, "execute", execute_without_count)
+            reclaimed = await store.purge_expired(batch_size=4)
+            left = await JwtModel.objects.count()
+        finally:
+            await database.disconnect()
+        return reclaimed, left
+
+    store = SqlRevocationStore()
+    rebuilds = []
+
+    async def rebuild():
+        rebuilds.append(True)
+
+    monkeypatch.setattr(store.filter, "rebuild", rebuild)
+    try:
+        assert asyncio.run(scenario()) == (10, 1)
+    finally:
+        os.remove(sqlite_db)
+    assert rebuilds == [True]
+
+
+def test_if_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        create_revocation_store("unknown")
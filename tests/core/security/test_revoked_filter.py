@@ -0,0 +1,66 @@
+import asyncio
+
+from app.core.jwt_repo import JwtRepo
+from app.core.security.revoked_filter import RevokedTokenFilter
+
+
+def test_if_concurrent_rebuilds_keep_added_digests(monkeypatch):
+    rows = [(1, "stored")]
+
+    async def scenario():
+        released = asyncio.Event()
+
+        async def get_digests(after_id):
+            # Rows read at call, returned once released.
+            read = list(rows)
+            await released.wait()
+            return read
+
+        monkeypatch.setattr(JwtRepo, "get_digests", get_digests)
+        revoked = RevokedTokenFilter(
+            capacity=100, error_rate=0.001, enabled=True, max_staleness=60
+        )
+
+        def revoke(digest):
+            # Same order as revocation store - database first.
+            rows.append((len(rows) + 1, digest))
+            revoked.add(digest)
+
+        first = asyncio.create_task(revoked.rebuild())
+        await asyncio.sleep(0)
+        revoke("added_in_first")
+        second = asyncio.create_task(revoked.rebuild())
+        await asyncio.sleep(0)
+        revoke("added_in_both")
+        released.set()
+        await asyncio.gather(first, second)
+        return revoked
+
+    revoked = asyncio.run(scenario())
+    assert revoked.ready
+    for digest in ("stored", "added_in_first", "added_in_both"):
+        assert revoked.might_contain(digest)
+    assert not revoked._added_in_rebuilds
+
+
+def test_if_stale_filter_answers_positive(monkeypatch):
+    now = [0.0]
+
+    async def get_digests(after_id):
+        return [(1, "stored")]
+
+    monkeypatch.setattr(JwtRepo, "get_digests", get_digests)
+    revoked = RevokedTokenFilter(
+        capacity=100,
+        error_rate=0.001,
+        enabled=True,
+        max_staleness=5,
+        timer=lambda: now[0],
+    )
+    asyncio.run(revoked.rebuild())
+    assert not revoked.might_contain("other")
+    # Sync not run (failing) - database checked for every token.
+    now[0] = 6.0
+    assert revoked.might_contain("other")
+    asyncio.run(revoked.sync())
+    assert not revoked.might_contain("other")
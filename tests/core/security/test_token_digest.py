@@ -0,0 +1,12 @@
+from app.core.config import settings
+from app.core.security.token_digest import token_digest
+
+
+def test_if_digest_deterministic_and_keyed_by_secret(monkeypatch):
+    digest = token_digest("header.payload.signature")
+    assert digest == token_digest("header.payload.signature")
+    assert len(digest) == 64 and int(digest, 16) >= 0
+    assert "payload" not in digest
+    assert token_digest("header.payload.other") != digest
+    monkeypatch.setattr(settings, "DB_SECRET", "other_secret")
+    assert token_digest("header.payload.signature") != digest
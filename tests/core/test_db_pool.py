@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+from databases import DatabaseURL
+
+from app.core.db_pool import InstrumentedPool
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self._con = self
+        self.closed = False
+
+    async def close(self, timeout=None) -> None:
+        self.closed = True
+
+
+class FakePool:
+    """
+    Single connection pool behaving like asyncpg one.
+    """
+
+    def __init__(self) -> None:
+        self.connection = FakeConnection()
+        self.free = asyncio.Queue()
+        self.free.put_nowait(self.connection)
+
+    async def acquire(self, timeout=None):
+        return await asyncio.wait_for(self.free.get(), timeout)
+
+    async def release(self, connection, timeout=None) -> None:
+        self.free.put_nowait(connection)
+
+    def get_size(self) -> int:
+        return 1
+
+    def get_idle_size(self) -> int:
+        return self.free.qsize()
+
+
+class FakeBackend:
+    def __init__(self) -> None:
+        self._pool = FakePool()
+
+
+class FakeDatabase:
+    def __init__(self, url: str = "postgresql://localhost/test") -> None:
+        self.url = DatabaseURL(url)
+        self._backend = FakeBackend()
+
+
+def test_if_not_installed_for_other_backends():
+    pool = InstrumentedPool(acquire_timeout=1, max_lifetime=0)
+    database = FakeDatabase(url="sqlite:///./test.db")
+    assert pool.install(database) is False
+    assert database._backend._pool is not pool
+
+
+def test_if_pool_starvation_measured():
+    async def starve():
+        pool = InstrumentedPool(acquire_timeout=0.05, max_lifetime=0)
+        database = FakeDatabase()
+        assert pool.install(database)
+        assert database._backend._pool is pool
+        connection = await database._backend._pool.acquire()
+        assert pool.metrics()["in_use"] == 1
+        assert pool.metrics()["idle"] == 0
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire()
+        await pool.release(connection)
+        return pool.metrics()
+
+    metrics = asyncio.run(starve())
+    assert metrics["timeouts"] == 1
+    assert metrics["in_use"] == 0
+    assert metrics["idle"] == 1
+    assert metrics["wait_seconds"]["count"] == 2
+    assert metrics["wait_seconds"]["sum"] >= 0.05
+
+
+def test_if_connection_retired_after_max_lifetime():
+    async def retire():
+        pool = InstrumentedPool(acquire_timeout=1, max_lifetime=60)
+        database = FakeDatabase()
+        pool.install(database)
+        connection = await pool.acquire()
+        await pool.track_connection(connection._con)
+        await pool.release(connection)
+        assert not connection.closed
+        pool._opened_at[connection._con] = time.monotonic() - 61
+        connection = await pool.acquire()
+        await pool.release(connection)
+        return connection, pool.metrics()
+
+    connection, metrics = asyncio.run(retire())
+    assert connection.closed
+    assert metrics["retired"] == 1
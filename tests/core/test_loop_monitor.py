@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+
+from app.core.loop_monitor import LoopMonitor
+
+
+def block(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def test_if_lag_recorded():
+    monitor = LoopMonitor(interval=0.01, block_threshold=1)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        block(0.05)
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+    asyncio.run(run())
+    snapshot = monitor.metrics()["lag_seconds"]
+    assert snapshot["count"] >= 3
+    assert snapshot["sum"] >= 0.03
+    assert monitor.blocked == 0
+
+
+def test_if_blocking_callback_logged_once_with_stack(caplog):
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.02)
+        block(0.2)
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+        asyncio.run(run())
+    assert monitor.blocked == 1
+    assert len(caplog.records) == 1
+    assert "in block" in caplog.records[0].getMessage()
+
+
+def test_if_disabled_monitor_not_started():
+    monitor = LoopMonitor(interval=0, block_threshold=0.05)
+
+    async def run():
+        monitor.start()
+        assert not monitor.running
+        await monitor.stop()
+
+    asyncio.run(run())
+
+
+def test_if_stop_does_not_wait_for_watchdog():
+    monitor = LoopMonitor(interval=0.01, block_threshold=10)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.02)
+        started = time.perf_counter()
+        await monitor.stop()
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 1
+    assert not monitor.running
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.core.metrics import Histogram, MetricsRegistry, QueryTimer
+
+
+def test_if_values_counted_in_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.snapshot() == {
+        "buckets": {"0.1": 2, "1.0": 3, "+Inf": 4},
+        "count": 4,
+        "sum": 5.65,
+    }
+
+
+def test_if_requests_rendered_by_route_template():
+    registry = MetricsRegistry(buckets=(0.1,))
+    registry.request_started("GET", "/user")
+    registry.request_finished("GET", "/user", 200, 0.05)
+    text = registry.render()
+    assert 'app_http_requests_total{method="GET",route="/user",status="200"} 1' in text
+    assert 'app_http_requests_in_flight{method="GET",route="/user"} 0' in text
+    assert (
+        'app_http_request_duration_seconds_bucket{method="GET",route="/user",le="0.1"} 1'
+        in text
+    )
+
+
+def test_if_collector_values_and_hit_ratio_rendered():
+    registry = MetricsRegistry()
+    registry.register_collector("cache", lambda: {"hits": 3, "misses": 1})
+    text = registry.render()
+    assert "app_cache_hits 3.0" in text
+    assert "app_cache_hit_ratio 0.75" in text
+
+
+def test_if_query_timed_as_decorator_and_context_manager():
+    registry = MetricsRegistry()
+
+    @QueryTimer("user.get", registry=registry)
+    async def get_user() -> str:
+        return "user"
+
+    assert asyncio.run(get_user()) == "user"
+    with QueryTimer("user.get", registry=registry):
+        pass
+    assert registry.query_seconds["user.get"].count == 2
@@ -0,0 +1,43 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry
+from app.core.metrics_middleware import UNMATCHED, MetricsMiddleware
+
+
+@pytest.fixture
+def registry(setup_app: FastAPI) -> MetricsRegistry:
+    registry = MetricsRegistry()
+
+    @setup_app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    setup_app.add_middleware(MetricsMiddleware, registry=registry)
+    yield registry
+
+
+def test_if_requests_counted_by_route_template(
+    registry: MetricsRegistry, setup_client: TestClient
+):
+    setup_client.get("/items/1")
+    setup_client.get("/items/2")
+    assert registry.requests[("GET", "/items/{item_id}", 200)] == 2
+    assert registry.request_seconds[("GET", "/items/{item_id}")].count == 2
+    assert registry.in_flight[("GET", "/items/{item_id}")] == 0
+
+
+def test_if_unknown_paths_share_single_label(
+    registry: MetricsRegistry, setup_client: TestClient
+):
+    setup_client.get("/missing/1")
+    setup_client.get("/missing/2")
+    assert registry.requests[("GET", UNMATCHED, 404)] == 2
+
+
+def test_if_method_mismatch_labeled_with_route(
+    registry: MetricsRegistry, setup_client: TestClient
+):
+    setup_client.post("/items/1")
+    assert registry.requests[("POST", "/items/{item_id}", 405)] == 1
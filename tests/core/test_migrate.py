@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import hashlib
+import os
+
+import pytest
+import sqlalchemy
+from cryptography.fernet import Fernet
+
+from app.core.config import settings
+from app.core.db import database, metadata
+from app.core.migrate import MIGRATIONS, migrate, table_exists
+from app.core.model.jwt_model import JwtModel
+from app.core.model.user_model import UserModel
+from app.core.schema import (
+    SCHEMA_VERSION,
+    SchemaVersionError,
+    get_schema_version,
+    verify_schema_version,
+)
+from app.core.security.password_hasher import verify_password
+from app.core.security.token_digest import token_digest
+
+# Schema of app versions before migrations (Fernet encrypted columns).
+LEGACY_SCHEMA = (
+    "CREATE TABLE users (id SERIAL PRIMARY KEY, "
+    "username VARCHAR(128) UNIQUE NOT NULL, email VARCHAR(40) UNIQUE NOT NULL, "
+    "password VARCHAR(100) NOT NULL, is_active BOOLEAN NOT NULL, "
+    "is_admin BOOLEAN NOT NULL)",
+    "CREATE TABLE blacklisted_jwt (id SERIAL PRIMARY KEY, "
+    "token VARCHAR(680) UNIQUE NOT NULL)",
+)
+
+
+@pytest.fixture
+def empty_db(sqlite_db):
+    path = sqlite_db
+    if os.path.exists(path):
+        os.remove(path)
+    yield path
+    os.remove(path)
+
+
+@pytest.fixture
+def legacy_postgres_db():
+    """
+    Postgres test database (TEST_DATABASE_URL) holding schema and rows of
+    app version before migrations. Migrations use Postgres only DDL.
+    """
+    if database.url.dialect != "postgresql":
+        pytest.skip("Postgres migrations - set TEST_DATABASE_URL to Postgres")
+    engine = sqlalchemy.create_engine(str(database.url))
+    metadata.drop_all(engine)
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(sqlalchemy.text(statement))
+    yield engine
+    metadata.drop_all(engine)
+    engine.dispose()
+
+
+def legacy_encrypt(value: str) -> str:
+    # Same key derivation as Ormar Fernet encrypted fields used before.
+    key = base64.urlsafe_b64encode(
+        hashlib.sha256(settings.DB_SECRET.encode()).digest()
+    )
+    return Fernet(key).encrypt(value.encode()).decode()
+
+
+def run(coroutine):
+    async def connected():
+        await database.connect()
+        try:
+            return await coroutine
+        finally:
+            await database.disconnect()
+
+    return asyncio.run(connected())
+
+
+def test_if_last_migration_matches_app_schema_version():
+    assert [version for version, _, _ in MIGRATIONS] == list(
+        range(1, SCHEMA_VERSION + 1)
+    )
+
+
+def test_if_new_database_created_and_stamped(empty_db):
+    with pytest.raises(SchemaVersionError):
+        run(verify_schema_version())
+    assert run(migrate()) == SCHEMA_VERSION
+    # Second run changes nothing.
+    assert run(migrate()) == SCHEMA_VERSION
+    run(verify_schema_version())
+    assert run(table_exists("users"))
+    assert run(table_exists("blacklisted_jwt"))
+    assert run(get_schema_version()) == SCHEMA_VERSION
+
+
+def test_if_legacy_database_upgraded(legacy_postgres_db):
+    with legacy_postgres_db.begin() as connection:
+        connection.execute(
+            sqlalchemy.text(
+                "INSERT INTO users (username, email, password, is_active, "
+                "is_admin) VALUES ('tester', 'tester@localhost', :password, "
+                "true, false)"
+            ),
+            {"password": legacy_encrypt("secret")},
+        )
+        # Fernet ciphertext differs every time - same token stored twice.
+        for token in ("first.token", "second.token", "first.token"):
+            connection.execute(
+                sqlalchemy.text("INSERT INTO blacklisted_jwt (token) VALUES (:token)"),
+                {"token": legacy_encrypt(token)},
+            )
+    assert run(migrate()) == SCHEMA_VERSION
+    run(verify_schema_version())
+    with legacy_postgres_db.begin() as connection:
+        tokens = connection.execute(
+            sqlalchemy.select(
+                [JwtModel.Meta.table.c.id, JwtModel.Meta.table.c.token_digest,
+                 JwtModel.Meta.table.c.expires_at]
+            ).order_by(JwtModel.Meta.table.c.id)
+        ).fetchall()
+        password = connection.execute(
+            sqlalchemy.select([UserModel.Meta.table.c.password])
+        ).scalar()
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            connection.execute(
+                JwtModel.Meta.table.insert().values(
+                    token_digest=token_digest("second.token")
+                )
+            )
+    # Duplicate removed, oldest row kept.
+    assert [(row.id, row.token_digest) for row in tokens] == [
+        (1, token_digest("first.token")),
+        (2, token_digest("second.token")),
+    ]
+    assert all(row.expires_at is not None for row in tokens)
+    assert verify_password("secret", password)
+    assert password.startswith("scrypt$")
+    # Nothing left to migrate.
+    assert run(migrate()) == SCHEMA_VERSION
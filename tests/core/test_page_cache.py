@@ -0,0 +1,116 @@
+import asyncio
+
+from starlette.requests import Request
+
+from app.core.page_cache import PageCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(headers=None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+        }
+    )
+
+
+def test_if_least_recently_used_evicted_over_size_limit():
+    cache = PageCache(max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    cache.get("a")
+    cache.set("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"aaaa"
+    assert cache.stats()["size_bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_if_page_bigger_than_cache_not_stored():
+    cache = PageCache(max_bytes=3)
+    page = cache.set("a", b"aaaa")
+    assert page.body == b"aaaa"
+    assert cache.get("a") is None
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_if_tagged_pages_invalidated_only():
+    cache = PageCache(max_bytes=100)
+    cache.set("users", b"users", tags=("users",))
+    cache.set("home", b"home")
+    cache.invalidate_tag("users")
+    assert cache.get("users") is None
+    assert cache.get("home") is not None
+
+
+def test_if_page_expired_after_ttl():
+    timer = FakeTimer()
+    cache = PageCache(max_bytes=100, timer=timer)
+    cache.set("a", b"a", ttl=5)
+    timer.now = 4
+    assert cache.get("a") is not None
+    timer.now = 5
+    assert cache.get("a") is None
+
+
+def test_if_page_rendered_once_and_304_returned_for_current_etag():
+    cache = PageCache(max_bytes=100)
+    renders = []
+
+    def render() -> str:
+        renders.append(1)
+        return "<p>page</p>"
+
+    response = asyncio.run(cache.respond(make_request(), "a", render))
+    etag = response.headers["etag"]
+    assert response.body == b"<p>page</p>"
+    not_modified = asyncio.run(
+        cache.respond(make_request({"if-none-match": etag}), "a", render)
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert len(renders) == 1
+    assert cache.stats()["not_modified"] == 1
+
+
+def test_if_page_not_cached_when_invalidated_while_rendering():
+    cache = PageCache(max_bytes=100)
+
+    async def render() -> str:
+        # User added while page data was read.
+        cache.invalidate_tag("users")
+        return "stale"
+
+    response = asyncio.run(
+        cache.respond(make_request(), "a", render, tags=("users",))
+    )
+    assert response.body == b"stale"
+    assert cache.get("a") is None
+
+
+def test_if_oversize_page_served_when_invalidated_while_rendering():
+    cache = PageCache(max_bytes=3)
+
+    async def render() -> str:
+        cache.invalidate_tag("users")
+        return "stale"
+
+    response = asyncio.run(
+        cache.respond(make_request(), "a", render, tags=("users",))
+    )
+    assert response.status_code == 200
+    assert response.body == b"stale"
+    assert cache.stats()["size_bytes"] == 0
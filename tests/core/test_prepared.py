@@ -0,0 +1,46 @@
+import asyncio
+
+import databases
+import sqlalchemy
+
+from app.core.jwt_repo import ADD_TOKEN, GET_TOKEN
+from app.core.model.user_model import UserModel
+from app.core.prepared import PreparedQuery
+from app.core.user_repo import GET_USER, UPDATE_PASSWORD
+
+
+def test_if_hot_queries_compiled_to_asyncpg_parameters():
+    assert GET_USER.sql.endswith("WHERE users.username = $1")
+    assert GET_USER.args(username="tester") == ("tester",)
+    assert UPDATE_PASSWORD.args(username="tester", password="hash") == (
+        "hash",
+        "tester",
+    )
+    assert "RETURNING" in UPDATE_PASSWORD.sql
+    assert ADD_TOKEN.sql.endswith("VALUES ($1, $2) RETURNING blacklisted_jwt.id")
+    assert GET_TOKEN.params == ("token_digest",)
+
+
+def test_if_literal_values_and_percent_signs_kept():
+    table = UserModel.Meta.table
+    query = PreparedQuery(
+        sqlalchemy.select([table.c.id])
+        .where(table.c.email.like("%@localhost"))
+        .where(table.c.username == sqlalchemy.bindparam("username"))
+        .where(sqlalchemy.literal_column("'100%'") != "")
+    )
+    assert "$1" in query.sql and "$2" in query.sql and "$3" in query.sql
+    assert "'100%'" in query.sql
+    assert query.args(username="tester") == ("%@localhost", "tester", "")
+
+
+def test_if_databases_connection_internals_still_present():
+    # PreparedQuery takes query lock and raw connection of databases
+    # connection - fails here first if databases upgrade changes them.
+    async def connection_internals():
+        connection = databases.Database("sqlite:///:memory:").connection()
+        return connection._query_lock, type(connection).raw_connection
+
+    query_lock, raw_connection = asyncio.run(connection_internals())
+    assert isinstance(query_lock, asyncio.Lock)
+    assert isinstance(raw_connection, property)
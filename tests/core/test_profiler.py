@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from app.core.profiler import (
+    Profile,
+    ProfilerBusyError,
+    SamplingProfiler,
+    StackSampler,
+)
+
+
+def spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_if_collapsed_stacks_sorted_by_count():
+    profile = Profile(
+        interval=0.01,
+        samples=Counter({("main", "a", "b"): 1, ("main", "a"): 3}),
+    )
+    assert profile.collapsed() == "main;a 3\nmain;a;b 1\n"
+
+
+def test_if_speedscope_profile_per_thread_with_shared_frames():
+    profile = Profile(
+        interval=0.01,
+        samples=Counter(
+            {("main", "a", "b"): 2, ("worker", "a"): 1}
+        ),
+    )
+    result = profile.speedscope(name="test")
+    assert result["shared"]["frames"] == [{"name": "a"}, {"name": "b"}]
+    main, worker = result["profiles"]
+    assert main["name"] == "main" and main["type"] == "sampled"
+    assert main["samples"] == [[0, 1]]
+    assert main["weights"] == [0.02]
+    assert worker["samples"] == [[0]]
+
+
+def test_if_sampler_sees_busy_thread():
+    sampler = StackSampler(interval=0.001)
+    thread = threading.Thread(target=spin, args=(0.2,), name="busy")
+    sampler.start()
+    thread.start()
+    thread.join()
+    profile = sampler.stop()
+    busy = [
+        stack for stack in profile.samples
+        if stack[0] == "busy" and stack[-1].startswith("spin (")
+    ]
+    assert busy
+    assert not any(stack[0] == "stack_sampler" for stack in profile.samples)
+    assert profile.duration >= 0.2
+
+
+def test_if_task_sampler_skips_other_tasks():
+    async def run() -> Profile:
+        async def other():
+            await asyncio.sleep(0)
+            spin(0.1)
+
+        async def profiled():
+            sampler = StackSampler(
+                interval=0.001, task=asyncio.current_task()
+            )
+            sampler.start()
+            await asyncio.create_task(other())
+            spin(0.1)
+            return sampler.stop()
+
+        return await profiled()
+
+    profile = asyncio.run(run())
+    labels = {label for stack in profile.samples for label in stack}
+    assert any(label.startswith("profiled (") for label in labels)
+    assert not any(label.startswith("other (") for label in labels)
+
+
+def test_if_second_worker_profile_refused():
+    profiler = SamplingProfiler(interval=0.001, max_seconds=0.1, keep_requests=2)
+
+    async def run():
+        first = asyncio.create_task(profiler.profile(seconds=1))
+        await asyncio.sleep(0)
+        with pytest.raises(ProfilerBusyError):
+            await profiler.profile(seconds=1)
+        return await first
+
+    profile = asyncio.run(run())
+    # Capped at max_seconds.
+    assert profile.duration < 0.5
+    assert not profiler._busy
+
+
+def test_if_oldest_request_profile_dropped():
+    profiler = SamplingProfiler(interval=0.001, max_seconds=1, keep_requests=2)
+    ids = [profiler.reserve_id() for _ in range(3)]
+    for profile_id in ids:
+        profiler.keep(profile_id, Profile(interval=0.001))
+    assert profiler.get(ids[0]) is None
+    assert profiler.get(ids[2]) is not None
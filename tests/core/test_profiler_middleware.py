@@ -0,0 +1,70 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.core.profiler_middleware as middleware
+from app.core.model.user_view import UserView
+from app.core.profiler import SamplingProfiler
+from app.core.security.auth_context import AuthContext
+
+
+def as_user(is_admin: bool) -> AuthContext:
+    return AuthContext(
+        token="token",
+        user=UserView(
+            id=1,
+            username="tester",
+            email="tester@localhost",
+            is_active=True,
+            is_admin=is_admin,
+        ),
+    )
+
+
+@pytest.fixture
+def auth() -> dict:
+    yield {"context": as_user(True)}
+
+
+@pytest.fixture
+def profiler(setup_app: FastAPI, auth: dict, monkeypatch) -> SamplingProfiler:
+    profiler = SamplingProfiler(interval=0.001, max_seconds=1, keep_requests=5)
+
+    async def resolve_auth_context(token):
+        return auth["context"]
+
+    monkeypatch.setattr(middleware, "resolve_auth_context", resolve_auth_context)
+
+    @setup_app.get("/work")
+    async def work():
+        return {"ok": True}
+
+    setup_app.add_middleware(
+        middleware.RequestProfilerMiddleware, profiler=profiler
+    )
+    yield profiler
+
+
+def test_if_admin_request_profiled(
+    profiler: SamplingProfiler, setup_client: TestClient
+):
+    response = setup_client.get("/work", headers={"x-profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers[middleware.PROFILE_ID_HEADER]
+    assert profiler.get(profile_id) is not None
+
+
+def test_if_request_without_header_not_profiled(
+    profiler: SamplingProfiler, setup_client: TestClient
+):
+    response = setup_client.get("/work")
+    assert middleware.PROFILE_ID_HEADER not in response.headers
+
+
+def test_if_non_admin_request_not_profiled(
+    profiler: SamplingProfiler, auth: dict, setup_client: TestClient
+):
+    auth["context"] = as_user(False)
+    response = setup_client.get("/work", headers={"x-profile": "1"})
+    assert response.status_code == 200
+    assert middleware.PROFILE_ID_HEADER not in response.headers
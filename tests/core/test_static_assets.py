@@ -0,0 +1,89 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.static_assets import IMMUTABLE, StaticAssets
+
+CSS = b"body { color: black; }\n" * 100
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "main.css").write_bytes(CSS)
+    (tmp_path / "big.js").write_bytes(b"x" * 8192)
+    (tmp_path / ".hidden").write_bytes(b"secret")
+    static = StaticAssets(directory=str(tmp_path), memory_max_bytes=4096)
+    static.load()
+    return static
+
+
+@pytest.fixture
+def client(setup_app: FastAPI, assets: StaticAssets):
+    setup_app.mount("/static", assets, name="static")
+    yield TestClient(setup_app)
+
+
+def test_if_fingerprinted_url_served_compressed_and_immutable(assets, client):
+    url = assets.url("css/main.css")
+    assert url.startswith("/static/css/main.") and url.endswith(".css")
+    assert url != "/static/css/main.css"
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == CSS
+    assert int(response.headers["content-length"]) == len(
+        assets.get("css/main.css").variants["gzip"]
+    )
+    assert gzip.decompress(assets.get("css/main.css").variants["gzip"]) == CSS
+
+
+def test_if_brotli_preferred_when_accepted(assets, client):
+    url = assets.url("css/main.css")
+    response = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert int(response.headers["content-length"]) == len(
+        assets.get("css/main.css").variants["br"]
+    )
+    assert brotli.decompress(assets.get("css/main.css").variants["br"]) == CSS
+    response = client.get(url, headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_if_not_modified_returned_for_matching_etag(assets, client):
+    url = assets.url("css/main.css")
+    response = client.get(url, headers={"Accept-Encoding": "identity"})
+    etag = response.headers["etag"]
+    assert "content-encoding" not in response.headers
+    response = client.get(
+        url, headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    # Other representation (gzip) has other strong ETag.
+    response = client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+
+def test_if_plain_and_big_files_revalidated_and_unknown_rejected(
+    assets, client
+):
+    response = client.get("/static/css/main.css")
+    assert response.headers["cache-control"] == "no-cache"
+    big = assets.get("big.js")
+    assert big.variants == {}
+    response = client.get(assets.url("big.js"))
+    assert response.content == b"x" * 8192
+    assert response.headers["etag"] == big.etag("identity")
+    assert client.get("/static/.hidden").status_code == 404
+    assert client.get("/static/../conftest.py").status_code == 404
+    assert client.post(assets.url("big.js")).status_code == 405
+    assert assets.url("missing.css") == "/static/missing.css"
@@ -0,0 +1,14 @@
+import os
+
+from app.core.templating import create_templates, precompile_templates
+
+
+def test_if_templates_precompiled_into_bytecode_cache(tmp_path):
+    cache_dir = str(tmp_path)
+    templates = create_templates(bytecode_cache_dir=cache_dir)
+    assert templates.env.auto_reload is False
+    count = precompile_templates(templates)
+    assert count == len(templates.env.list_templates()) > 0
+    assert len(templates.env.cache) == count
+    assert len(os.listdir(cache_dir)) == count
+    assert "asset_url" in templates.env.globals
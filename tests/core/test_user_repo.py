@@ -0,0 +1,175 @@
+import asyncio
+import os
+import sqlite3
+
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.sql import ClauseElement
+
+from app.core.db import database, metadata
+from app.core.security.password_hasher import hash_password, verify_password
+from app.core.user_repo import UserRepo
+
+# Query plans checked against realistic table size on request, e.g.
+# USER_REPO_TEST_USERS=1000000 (takes a while).
+USERS_COUNT = int(os.getenv("USER_REPO_TEST_USERS", "20000"))
+
+
+@pytest.fixture(scope="module")
+def users_db(sqlite_db):
+    """
+    SQLite test database (see conftest) with USERS_COUNT users.
+    """
+    path = sqlite_db
+    engine = sqlalchemy.create_engine(str(database.url))
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    engine.dispose()
+    # Same hash for all rows - hashing every password would take ages.
+    password = hash_password("password", n=2**4, r=8, p=1)
+    with sqlite3.connect(path) as connection:
+        connection.executemany(
+            "INSERT INTO users (username, email, password, is_active, is_admin) "
+            "VALUES (?, ?, ?, 1, ?)",
+            (
+                (f"user{i}", f"user{i}@localhost", password, i == 0)
+                for i in range(USERS_COUNT)
+            ),
+        )
+    yield path
+    os.remove(path)
+
+
+@pytest.fixture
+def recorded_queries(users_db, monkeypatch):
+    """
+    Run repository against test database, record all issued statements.
+    """
+    queries = []
+
+    def record(method):
+        async def recorded(query, *args, **kwargs):
+            queries.append(query)
+            return await method(query, *args, **kwargs)
+
+        return recorded
+
+    for name in ("execute", "fetch_one", "fetch_all", "fetch_val"):
+        monkeypatch.setattr(database, name, record(getattr(database, name)))
+    yield queries
+
+
+def query_plan(path: str, query: ClauseElement) -> str:
+    compiled = query.compile(dialect=sqlite.dialect())
+    params = [compiled.params[name] for name in compiled.positiontup]
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute(
+            f"EXPLAIN QUERY PLAN {compiled}", params
+        ).fetchall()
+    return " ".join(row[-1] for row in rows)
+
+
+def run(coroutine):
+    async def connected():
+        await database.connect()
+        try:
+            return await coroutine
+        finally:
+            await database.disconnect()
+
+    return asyncio.run(connected())
+
+
+def test_if_update_matches_exact_username_by_index(users_db, recorded_queries):
+    user = run(
+        UserRepo.update_user_password(
+            username="user12345", new_password="new_password"
+        )
+    )
+    assert user.username == "user12345"
+    assert verify_password("new_password", user.password)
+    assert recorded_queries
+    for query in recorded_queries:
+        plan = query_plan(users_db, query)
+        assert "USING INDEX sqlite_autoindex_users_1 (username=?)" in plan
+        assert "SCAN users" not in plan
+
+
+def test_if_delete_matches_exact_username_by_index(users_db, recorded_queries):
+    # Substring of existing usernames must not match anything.
+    assert run(UserRepo.delete_user(username="user1234")) is True
+    assert run(UserRepo.delete_user(username="user1234")) is None
+    assert run(UserRepo.delete_user(username="user0")) is False
+    assert run(UserRepo.get_by_username(username="user123")) is not None
+    for query in recorded_queries:
+        plan = query_plan(users_db, query)
+        assert "(username=?)" in plan
+        assert "SCAN users" not in plan
+
+
+def test_if_delete_result_independent_of_row_count(users_db, monkeypatch):
+    execute = database.execute
+
+    async def execute_without_count(query, *args, **kwargs):
+        # Postgres backend returns no row count for DELETE.
+        await execute(query, *args, **kwargs)
+        return None
+
+    async def delete_cached():
+        assert await UserRepo.get_view_by_username(username="user777")
+        monkeypatch.setattr(database, "execute", execute_without_count)
+        deleted = await UserRepo.delete_user(username="user777")
+        return deleted, await UserRepo.get_view_by_username(username="user777")
+
+    assert run(delete_cached()) == (True, None)
+
+
+def test_if_page_read_by_primary_key(users_db, recorded_queries):
+    first = run(UserRepo.iter_page(after=0, limit=3))
+    assert [user.username for user in first.users] == ["user0", "user1", "user2"]
+    second = run(UserRepo.iter_page(after=first.next_after, limit=3))
+    assert [user.id for user in second.users] == [4, 5, 6]
+    last = run(UserRepo.iter_page(after=USERS_COUNT - 2, limit=3))
+    assert last.next_after is None
+    for query in recorded_queries:
+        plan = query_plan(users_db, query)
+        assert "USING INTEGER PRIMARY KEY (rowid>?)" in plan
+        assert "password" not in str(query)
+
+
+def test_if_view_read_without_password(users_db, recorded_queries):
+    user = run(UserRepo.get_view_by_username(username="user42"))
+    assert user.email == "user42@localhost"
+    assert not hasattr(user, "password")
+    (query,) = recorded_queries
+    assert "password" not in str(query)
+    assert "(username=?)" in query_plan(users_db, query)
+
+
+def test_if_users_streamed_with_projection(users_db):
+    async def first_users():
+        users = []
+        stream = UserRepo.iter_all(columns=("id", "email"), batch_size=1)
+        try:
+            async for user in stream:
+                users.append(user)
+                if len(users) == 2:
+                    break
+        finally:
+            await stream.aclose()
+        return users
+
+    assert run(first_users()) == [
+        {"id": 1, "email": "user0@localhost"},
+        {"id": 2, "email": "user1@localhost"},
+    ]
+
+
+def test_if_existing_user_not_added(users_db):
+    user = run(
+        UserRepo.add_user(
+            username="user1", email="user1@localhost", password="password"
+        )
+    )
+    assert user is None
@@ -0,0 +1,29 @@
+from app.loadtest.histogram import LatencyHistogram
+
+
+def test_if_percentiles_within_relative_error():
+    histogram = LatencyHistogram(significant_bits=7)
+    for value in range(1, 10001):
+        histogram.record(value / 1e6)
+    assert histogram.count == 10000
+    for percentile, seconds in histogram.percentiles((50.0, 99.0, 100.0)):
+        expected = percentile / 100 * 10000 / 1e6
+        assert abs(seconds - expected) / expected < 1 / 64
+    assert histogram.percentile(100.0) == 0.01
+
+
+def test_if_merged_histogram_counts_both():
+    first = LatencyHistogram()
+    second = LatencyHistogram()
+    first.record(0.001)
+    second.record(0.003)
+    first.merge(second)
+    assert first.count == 2
+    assert first.min == 1000 and first.max == 3000
+    assert first.mean == 0.002
+
+
+def test_if_empty_histogram_reports_zero():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99.0) == 0.0
+    assert histogram.mean == 0.0
@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Form, Request, Response
+from fastapi.responses import RedirectResponse
+
+from app.loadtest.__main__ import parse_args
+from app.loadtest.runner import (
+    LoadTest,
+    LoadTestConfig,
+    format_report,
+    scheduled_offset,
+)
+
+
+@pytest.fixture
+def calls(setup_app: FastAPI):
+    calls = {"login": 0, "logout": 0, "authorized": 0}
+
+    @setup_app.post("/login")
+    async def login(username: str = Form(...), password: str = Form(...)):
+        calls["login"] += 1
+        response = RedirectResponse(url="/user", status_code=302)
+        response.set_cookie("access_token", f"Bearer {username}")
+        return response
+
+    @setup_app.get("/logout")
+    async def logout(request: Request):
+        calls["logout"] += 1
+        if request.cookies.get("access_token", "").startswith("Bearer "):
+            calls["authorized"] += 1
+        return RedirectResponse(url="/login", status_code=302)
+
+    yield calls
+
+
+def run(setup_app: FastAPI, **options) -> dict:
+    config = LoadTestConfig(target_rps=200, duration=0.5, ramp_up=0.1, **options)
+
+    async def load():
+        async with httpx.AsyncClient(
+            app=setup_app, base_url="http://loadtest"
+        ) as client:
+            return await LoadTest(config, client=client).run()
+
+    return asyncio.run(load())
+
+
+def test_if_schedule_ramps_up_to_target_rate():
+    assert scheduled_offset(0, target_rps=100, ramp_up=2) == 0
+    # 100 requests sent during 2 s ramp up, then 100 per second.
+    assert scheduled_offset(100, target_rps=100, ramp_up=2) == 2
+    assert scheduled_offset(200, target_rps=100, ramp_up=2) == 3
+
+
+def test_if_logout_storm_reuses_logged_in_sessions(setup_app: FastAPI, calls):
+    report = run(setup_app, scenario="logout-storm")
+    assert report["requests"] == calls["login"] + calls["logout"]
+    assert calls["logout"] > 0
+    assert calls["authorized"] == calls["logout"]
+    assert report["errors"] == 0
+    assert report["actions"]["logout"]["statuses"] == {"302": calls["logout"]}
+    assert "logout" in format_report(report)
+
+
+def test_if_unknown_scenario_rejected():
+    with pytest.raises(ValueError):
+        LoadTest(LoadTestConfig(scenario="unknown"))
+
+
+def test_if_cli_defaults_taken_from_config():
+    args = parse_args(["--rps", "10"])
+    assert args.rps == 10
+    assert args.scenario == LoadTestConfig.scenario